@@ -6,6 +6,7 @@
 (
     cd src
     pyside6-rcc what_resources.qrc -o what_resources_rc.py
+    pyside6-rcc --binary what_resources.qrc -o what_resources.rcc      # WRW 18-July-2025 - Loaded first, see what.py
 )
 
 time pyinstaller pyi.linux.onedir.spec \
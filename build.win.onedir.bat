@@ -4,6 +4,8 @@
 set start=%time%
 pushd src
 pyside6-rcc what_resources.qrc -o what_resources_rc.py
+:: #   WRW 18-July-2025 - Loaded first, see what.py
+pyside6-rcc --binary what_resources.qrc -o what_resources.rcc
 popd
 
 pyinstaller pyi.win.onedir.spec ^
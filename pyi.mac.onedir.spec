@@ -44,6 +44,7 @@ source_files = [
 #       Format: (source_file_path, target_directory_in_bundle)
 
 data_files = [
+    ( os.path.join( src_dir, "what_resources.rcc" ), "." ),     # WRW 18-July-2025 - Registered by what.py, what_resources_rc.py is the fallback
 ]
 data_files += collect_data_files("numpy")
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Audio.py - WRW 7-July-2025
+#   Tone output through a callback OutputStream in place of sd.play()/sd.wait().
+#   The callback copies each block it outputs into a ScopeRing when one is
+#   attached so the scope can show what is actually being played, live.
+
+#   The ring has one writer, the audio callback, and one reader, a timer in the
+#   GUI thread. No locks: the writer copies the block in and then advances a
+#   monotonic sample count, the reader takes the count and copies back from it.
+#   A reader that falls more than the ring size behind just sees newer samples.
+#   Nothing in the callback waits on the GUI.
+# -------------------------------------------------------------------------------
+
+import time
+import threading
+import numpy as np
+import sounddevice as sd
+
+# -------------------------------------------------------------------------------
+
+class ScopeRing():
+    def __init__( self, size, sample_rate ):
+        self.buf = np.zeros( size, dtype=np.float32 )
+        self.size = size
+        self.sample_rate = sample_rate
+        self.written = 0                    # Total samples ever written, only the writer changes it
+        self.clock = ( 0, 0.0 )             # ( sample index, time.monotonic() it reaches the DAC )
+
+    # ---------------------------------------------------------------
+    #   Writer side, called from the audio callback. Channels are summed into
+    #   the ring in place, no allocation. Single ear output has zeros in the other.
+
+    def write( self, block, dac_delay ):
+        n = min( len( block ), self.size )
+        block = block[ len( block ) - n: ]
+        start = self.written
+
+        pos = start % self.size
+        first = min( n, self.size - pos )
+        np.sum( block[ :first ], axis=1, out=self.buf[ pos:pos + first ] )
+        if n > first:
+            np.sum( block[ first: ], axis=1, out=self.buf[ :n - first ] )
+
+        self.clock = ( start, time.monotonic() + dac_delay )
+        self.written = start + n
+
+    # ---------------------------------------------------------------
+    #   Reader side. Returns ( end, samples ), the last n samples written before end.
+
+    def latest( self, n ):
+        end = self.written
+        n = min( n, self.size )
+        out = np.zeros( n, dtype=np.float32 )
+        avail = min( n, end )
+
+        pos = ( end - avail ) % self.size
+        first = min( avail, self.size - pos )
+        out[ n - avail : n - avail + first ] = self.buf[ pos:pos + first ]
+        out[ n - avail + first: ] = self.buf[ :avail - first ]
+        return end, out
+
+    #   Sample index now being heard, estimated from the last callback's DAC time.
+
+    def playhead( self ):
+        index, dac_time = self.clock
+        pos = index + int( ( time.monotonic() - dac_time ) * self.sample_rate )
+        return min( max( pos, 0 ), self.written )
+
+# -------------------------------------------------------------------------------
+
+class TonePlayer():
+    def __init__( self ):
+        self.ring = None                    # ScopeRing, set only while the live scope is showing
+        self.audio = None
+        self.pos = 0
+
+    # ---------------------------------------------------------------
+    #   Play audio, mono or frames x channels, and return when done.
+    #   pump, if given, is called every few ms while waiting, e.g. to let the live scope's timer run.
+
+    def play( self, audio, fs, pump=None ):
+        self.audio = audio.reshape( len( audio ), -1 ).astype( np.float32, copy=False )
+        self.pos = 0
+        done = threading.Event()
+
+        stream = sd.OutputStream( samplerate=fs, channels=self.audio.shape[1], dtype='float32',
+                                  callback=self.callback, finished_callback=done.set )
+        with stream:
+            if pump:
+                while not done.wait( .005 ):
+                    pump()
+            else:
+                done.wait()
+
+    # ---------------------------------------------------------------
+
+    def callback( self, outdata, frames, stream_time, status ):
+        chunk = self.audio[ self.pos : self.pos + frames ]
+        n = len( chunk )
+        outdata[ :n ] = chunk
+        outdata[ n: ] = 0
+        self.pos += n
+
+        ring = self.ring
+        if ring is not None:
+            ring.write( outdata, stream_time.outputBufferDacTime - stream_time.currentTime )
+
+        if n < frames:
+            raise sd.CallbackStop
+
+# -------------------------------------------------------------------------------
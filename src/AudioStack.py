@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   AudioStack.py - WRW 19-July-2025
+#   numpy, sounddevice and the modules built on them, Player.py and Audio.py,
+#   were imported before the main window showed. sounddevice also initializes
+#   PortAudio on import, which enumerates every audio device and is slow on some
+#   systems. None of it is needed until the first tone.
+
+#   start() imports them on a background thread once the window is up. The
+#   first Play, or hover prefetch, calls MainWindow.audio_ready(), which waits on
+#   the future if the load hasn't finished and then builds the player on the GUI
+#   thread. Python's import lock makes a later import of any of these on another
+#   thread wait for the one in progress rather than repeat it.
+# -------------------------------------------------------------------------------
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Startup import startup
+
+# -------------------------------------------------------------------------------
+#   Runs on the loader thread. Returns seconds taken, exceptions go to the future.
+
+def load_audio():
+    start = time.perf_counter()
+    import numpy
+    import sounddevice
+    import Player
+    import Audio
+    startup.mark( "audio ready" )
+    return time.perf_counter() - start
+
+# -------------------------------------------------------------------------------
+
+class AudioStack():
+    def __init__( self ):
+        self.future = None
+        self.seconds = None             # Load time, once loaded
+        self.waited = None              # Seconds the first wait() blocked the GUI, 0 if it didn't
+
+    def start( self ):
+        if self.future is None:
+            executor = ThreadPoolExecutor( max_workers=1, thread_name_prefix='audio-load' )
+            self.future = executor.submit( load_audio )
+            executor.shutdown( wait=False )             # Thread exits after the one job
+        return self.future
+
+    def done( self ):
+        return self.future is not None and self.future.done()
+
+    def loaded( self ):
+        return self.done() and self.future.exception() is None
+
+    #   Block until loaded, starting the load if not already started.
+    #   Raises what the load raised, e.g. OSError when PortAudio can't be found.
+
+    def wait( self ):
+        start = time.perf_counter()
+        self.seconds = self.start().result()
+        if self.waited is None:
+            self.waited = time.perf_counter() - start
+        return self.seconds
+
+# -------------------------------------------------------------------------------
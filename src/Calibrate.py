@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Calibrate.py - WRW 26-July-2025
+#   Loopback level and latency calibration. Results are uncalibrated, a dB on
+#   the graph is relative to full scale through whatever the sound card and
+#   headphones do at that frequency. This measures what the output does: the
+#   output is looped back to an input, with a cable or a reference microphone
+#   at the headphone, and the whole test grid is played and recorded at once
+#   with sd.playrec().
+
+#   Stimulus, one buffer, one stream:
+#       lead silence        noise floor at the input
+#       log chirp           sharp cross-correlation peak for the latency
+#       tone bursts         one per frequency, raised-cosine ramps, short gaps
+#       tail silence        room for the round trip
+
+#   Latency is the lag of the cross-correlation peak of recording and stimulus,
+#   by FFT. Levels are the RMS of the steady part of each burst, all bursts at
+#   once from one index array, recording over stimulus. The 125 Hz - 16 kHz grid
+#   at 4 points per octave takes about four seconds.
+
+#   response_db     recording / stimulus level at each frequency
+#   correction_db   gain to add at each frequency for the level 1 kHz gets
+#   snr_db          burst over the lead silence, low means the loop isn't connected
+
+#   The table, Const.Calibration_File in Const.Confdir, keeps the latest result
+#   per device and ear. Nothing applies the correction to the tones yet.
+
+#   SoftwareLoopback stands in for sd.playrec() with a known delay, frequency
+#   response and noise, for trying this without a loopback cable.
+#   what_calibrate.py is the command line.
+# -------------------------------------------------------------------------------
+
+import json
+import math
+import datetime
+
+import numpy as np
+
+from Session import write_file
+
+# -------------------------------------------------------------------------------
+
+CALIBRATION_FORMAT = 'what-calibration'
+CALIBRATION_VERSION = 1
+
+FS = 44100                  # As Player
+LEVEL_DB = -20              # Stimulus level, dBFS
+TONE_S = .10
+GAP_S = .02
+RAMP_S = .005
+LEAD_S = .20
+CHIRP_S = .10
+CHIRP_FREQS = ( 100, 18000 )
+MAX_LATENCY_S = .50         # Tail silence, longest round trip measured
+REFERENCE_FREQ = 1000       # correction_db is 0 here
+
+MIN_CORRELATION = .3        # Below this the recording isn't the stimulus
+MIN_SNR_DB = 10
+
+# -------------------------------------------------------------------------------
+#   The test frequencies as MainWindow.set_parameters() makes them, in order.
+
+def grid_freqs( start_freq, end_freq, points_per_octave ):
+    points_total = math.ceil( math.log2( end_freq / start_freq ) * points_per_octave )
+    log_start = math.log2( start_freq )
+    log_step = ( math.log2( end_freq ) - log_start ) / max( 1, points_total )
+    return [ float( round( 2 ** ( log_start + i * log_step ))) for i in range( points_total + 1 ) ]
+
+#   n samples of 1 with raised-cosine ramps of ramp_n at each end.
+
+def burst_window( n, ramp_n ):
+    ramp = .5 - .5 * np.cos( np.pi * np.arange( ramp_n ) / ramp_n )
+    window = np.ones( n )
+    window[ :ramp_n ] = ramp
+    window[ n - ramp_n: ] = ramp[ ::-1 ]
+    return window
+
+# -------------------------------------------------------------------------------
+#   Returns stimulus, mono float32, and layout, the sample positions measure() needs.
+
+def make_stimulus( freqs, fs=FS, level_db=LEVEL_DB, tone_s=TONE_S, gap_s=GAP_S ):
+    freqs = np.asarray( freqs, dtype=float )
+    amp = 10 ** ( level_db / 20 )
+
+    lead_n = int( LEAD_S * fs )
+    tone_n = int( tone_s * fs )
+    gap_n = int( gap_s * fs )
+    ramp_n = int( RAMP_S * fs )
+    tail_n = int( MAX_LATENCY_S * fs )
+
+    chirp_n = int( CHIRP_S * fs )
+    f0, f1 = CHIRP_FREQS
+    t = np.arange( chirp_n ) / fs
+    k = math.log( f1 / f0 )
+    chirp = np.sin( 2 * np.pi * f0 * CHIRP_S / k * ( np.exp( t / CHIRP_S * k ) - 1 )) * burst_window( chirp_n, ramp_n )
+
+    #   All bursts at once, one row per frequency, each followed by its gap.
+
+    t = np.arange( tone_n ) / fs
+    bursts = np.zeros( ( len( freqs ), tone_n + gap_n ))
+    bursts[ :, :tone_n ] = np.sin( 2 * np.pi * freqs[ :, None ] * t ) * burst_window( tone_n, ramp_n )
+
+    stimulus = np.concatenate( [ np.zeros( lead_n ), chirp, np.zeros( gap_n ), bursts.ravel(), np.zeros( tail_n ) ] ) * amp
+
+    first = lead_n + chirp_n + gap_n
+    layout = {
+        'fs':       fs,
+        'lead':     lead_n,
+        'starts':   first + np.arange( len( freqs )) * ( tone_n + gap_n ),
+        'tone':     tone_n,
+        'ramp':     ramp_n,
+        'tail':     tail_n,
+    }
+    return stimulus.astype( np.float32 ), layout
+
+# -------------------------------------------------------------------------------
+#   Lag of reference in recording, 0 to max_lag samples, and the normalized
+#   correlation there, 1 for a perfect copy. Either polarity.
+
+def find_latency( recording, reference, max_lag ):
+    n = len( recording ) + len( reference )
+    nfft = 1 << ( n - 1 ).bit_length()
+    xc = np.fft.irfft( np.fft.rfft( recording, nfft ) * np.conj( np.fft.rfft( reference, nfft )), nfft )
+
+    lag = int( np.argmax( np.abs( xc[ :max_lag + 1 ] )))
+    segment = recording[ lag : lag + len( reference ) ]
+    norm = np.linalg.norm( reference[ :len( segment ) ] ) * np.linalg.norm( segment )
+    return lag, float( abs( xc[ lag ] ) / norm ) if norm else 0.0
+
+def rms_db( x, axis=None ):
+    rms = np.sqrt( np.mean( np.square( x, dtype=np.float64 ), axis=axis ))
+    return 20 * np.log10( np.maximum( rms, 1e-12 ))
+
+# -------------------------------------------------------------------------------
+#   recording is mono, the same length as stimulus or longer.
+
+def measure( recording, stimulus, layout, freqs ):
+    fs = layout[ 'fs' ]
+    recording = np.asarray( recording, dtype=np.float64 ).ravel()
+    stimulus = np.asarray( stimulus, dtype=np.float64 )
+    if len( recording ) < len( stimulus ):
+        recording = np.pad( recording, ( 0, len( stimulus ) - len( recording )))
+
+    signal_end = len( stimulus ) - layout[ 'tail' ]
+    lag, correlation = find_latency( recording, stimulus[ :signal_end ], layout[ 'tail' ] )
+
+    #   Steady part of each burst, ramps and a little more left out.
+
+    skip = layout[ 'ramp' ] * 2
+    index = layout[ 'starts' ][ :, None ] + skip + np.arange( layout[ 'tone' ] - 2 * skip )
+
+    recorded_db = rms_db( recording[ index + lag ], axis=1 )
+    played_db = rms_db( stimulus[ index ], axis=1 )
+    noise_db = rms_db( recording[ lag : lag + layout[ 'lead' ] - layout[ 'ramp' ] ] )
+
+    response_db = np.round( recorded_db - played_db, 2 )
+    freqs = np.asarray( freqs, dtype=float )
+    ref = int( np.argmin( np.abs( np.log2( freqs / REFERENCE_FREQ ))))
+
+    return {
+        'fs':               fs,
+        'latency_s':        lag / fs,
+        'latency_samples':  lag,
+        'correlation':      correlation,
+        'noise_db':         float( noise_db ),
+        'reference_freq':   float( freqs[ ref ] ),
+        'freqs':            freqs.tolist(),
+        'response_db':      response_db.tolist(),
+        'correction_db':    np.round( response_db[ ref ] - response_db, 2 ).tolist(),
+        'snr_db':           np.round( recorded_db - noise_db, 1 ).tolist(),
+    }
+
+#   Problems with a result, [] if it looks usable.
+
+def check( result ):
+    problems = []
+    if result[ 'correlation' ] < MIN_CORRELATION:
+        problems.append( f"recording doesn't match the stimulus (correlation {result['correlation']:.2f}), is the loopback connected?" )
+    low = [ f"{freq:g}" for freq, snr in zip( result[ 'freqs' ], result[ 'snr_db' ] ) if snr < MIN_SNR_DB ]
+    if low:
+        problems.append( f"signal under {MIN_SNR_DB} dB above noise at {', '.join( low )} Hz" )
+    if result[ 'latency_samples' ] >= result[ 'fs' ] * MAX_LATENCY_S:
+        problems.append( f"latency at the {MAX_LATENCY_S:g} s limit" )
+    return problems
+
+# -------------------------------------------------------------------------------
+#   Play and record the grid. playrec( data, samplerate, channels, ... ) is
+#   sd.playrec() or a SoftwareLoopback. ear 'B' plays mono, 'L' and 'R' one
+#   channel of two, as MainWindow.play_tone(). input_channel counts from 1.
+
+def calibrate( freqs, playrec=None, device=None, ear='B', input_channel=1, fs=FS, level_db=LEVEL_DB ):
+    if playrec is None:
+        import sounddevice as sd
+        playrec = sd.playrec
+
+    stimulus, layout = make_stimulus( freqs, fs, level_db )
+
+    out = stimulus
+    if ear == 'L':
+        out = np.column_stack( ( stimulus, np.zeros_like( stimulus )))
+    elif ear == 'R':
+        out = np.column_stack( ( np.zeros_like( stimulus ), stimulus ))
+
+    recording = playrec( out, samplerate=fs, input_mapping=[ input_channel ], device=device, blocking=True )
+
+    result = measure( recording[ :, 0 ], stimulus, layout, freqs )
+    result[ 'ear' ] = ear
+    result[ 'level_db' ] = level_db
+    result[ 'timestamp' ] = datetime.datetime.now().isoformat( timespec='seconds' )
+    return result
+
+#   'output -> input' for the table, device as for sd.playrec(): None, a number,
+#   a name, or a pair for output and input.
+
+def device_name( device=None ):
+    import sounddevice as sd
+    if isinstance( device, ( list, tuple )):
+        out_dev, in_dev = device
+    else:
+        out_dev = in_dev = device
+    out_name = sd.query_devices( out_dev, 'output' )[ 'name' ]
+    in_name = sd.query_devices( in_dev, 'input' )[ 'name' ]
+    return f"{out_name} -> {in_name}"
+
+# -------------------------------------------------------------------------------
+#   Correction table, { devices: { name: { ear: result, ... }, ... } }
+
+def load_table( path ):
+    try:
+        with open( path, encoding='utf-8' ) as fp:
+            table = json.load( fp )
+    except FileNotFoundError:
+        table = None
+    except ( OSError, ValueError ) as e:
+        raise ValueError( f"{path}: not a calibration file: {e}" ) from None
+
+    if table is None:
+        return { 'format': CALIBRATION_FORMAT, 'version': CALIBRATION_VERSION, 'devices': {} }
+
+    if not isinstance( table, dict ) or table.get( 'format' ) != CALIBRATION_FORMAT:
+        raise ValueError( f"{path}: not a calibration file" )
+    if table.get( 'version', 0 ) > CALIBRATION_VERSION:
+        raise ValueError( f"{path}: calibration version {table['version']} is newer than this program" )
+    return table
+
+def save_result( path, device, result ):
+    table = load_table( path )
+    table[ 'devices' ].setdefault( device, {} )[ result[ 'ear' ]] = result
+    write_file( path, json.dumps( table, indent=1 ).encode( 'utf-8' ))
+    return table
+
+#   correction_db at freq, interpolated on the octave scale, the end values held
+#   outside the calibrated range. None if the device or ear isn't in the table.
+
+def correction_at( table, device, ear, freq ):
+    result = table[ 'devices' ].get( device, {} ).get( ear )
+    if result is None:
+        return None
+    return float( np.interp( math.log2( freq ), np.log2( result[ 'freqs' ] ), result[ 'correction_db' ] ))
+
+# -------------------------------------------------------------------------------
+#   Stand-in for sd.playrec(): delays the output, mixed to mono, filters it by
+#   response, [ ( freq, dB ), ... ] interpolated on the octave scale, and adds
+#   noise. Default is a mild roll-off at both ends, as a cheap microphone.
+
+class SoftwareLoopback():
+    name = "Software loopback"
+
+    def __init__( self, latency_s=.0123, response=( ( 125, -3 ), ( 1000, 0 ), ( 8000, -2 ), ( 16000, -8 ) ), noise_db=-80, seed=0 ):
+        self.latency_s = latency_s
+        self.response = response
+        self.noise_db = noise_db
+        self.rng = np.random.default_rng( seed )
+
+    def gain_db( self, freqs ):
+        points, gains = zip( *self.response )
+        return np.interp( np.log2( np.maximum( freqs, 1 )), np.log2( points ), gains )
+
+    def __call__( self, data, samplerate, channels=None, input_mapping=None, blocking=True, **_ ):
+        data = np.asarray( data, dtype=np.float64 )
+        mono = data.reshape( len( data ), -1 ).sum( axis=1 )
+
+        spectrum = np.fft.rfft( mono )
+        spectrum *= 10 ** ( self.gain_db( np.fft.rfftfreq( len( mono ), 1 / samplerate )) / 20 )
+        looped = np.fft.irfft( spectrum, len( mono ))
+
+        delay = int( round( self.latency_s * samplerate ))
+        looped = np.concatenate( [ np.zeros( delay ), looped ] )[ :len( mono ) ]
+        looped += self.rng.normal( 0, 10 ** ( self.noise_db / 20 ), len( looped ))
+
+        n = len( input_mapping ) if input_mapping else channels or 1
+        return np.repeat( looped[ :, None ], n, axis=1 ).astype( np.float32 )
+
+# -------------------------------------------------------------------------------
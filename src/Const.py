@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Const.py - WRW 13-July-2025 - Moved out of what.py.
+#   Consolidate most constants here in one spot. Imported by what.py before
+#   do_dialog_splash() and by what_render.py, keep it light: QtCore only.
+# -------------------------------------------------------------------------------
+
+import sys
+
+from PySide6.QtCore import QStandardPaths, QCoreApplication
+
+import what_version
+from Store import changed as store_changed
+
+# -------------------------------------------------------------------------------
+
+class Const():
+    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+        Frozen = True
+        Package_Type = 'PyInstaller'                                                    
+
+    else:
+        Frozen = False
+        Package_Type = 'Development'
+
+    # ---------------------------------------------
+
+    if sys.platform.startswith("win"):
+        Platform = 'Windows'
+    elif sys.platform.startswith("darwin"):
+        Platform = 'macOS'                          # This is an internal designation used only within birdland.
+    elif sys.platform.startswith("linux"):
+        Platform = 'Linux'
+    else:
+        Platform = 'Unknown'
+
+    # ---------------------------------------------
+
+    What_Program_Name = "What"      # desktop filename comes from this
+    What_Short_Title = 'What?'
+    What_Full_Title = "What? (Bill's Hearing Test)"
+    What_Desktop =      f"{What_Program_Name}.desktop"
+
+    QCoreApplication.setApplicationName( What_Program_Name )      # Must do this early as used in QStandardPaths below
+    stdApplication = QStandardPaths.writableLocation(QStandardPaths.ApplicationsLocation)
+    stdConfig = QStandardPaths.standardLocations(QStandardPaths.AppConfigLocation)[0]
+    Confdir = stdConfig
+
+    Quick_Start = ":quick-start.html"
+    What_Splash_Image = ':Images/ear-horn-640.png'
+    License = ':License.txt'
+
+    What_Icon_ICO = ":/Images/ear-64.ico"
+    What_Icon_PNG = ":/Images/ear-64.png"
+
+    Icon_File_ICO = 'ear-64.ico'
+    Icon_File_PNG = 'ear-64.png'
+
+    pointDiameter = 4
+    markerDiameter = 30
+    markerPen = 2
+    graphBG = '#e0e0ff'             # for dark: graphBG = '#26313d'
+
+    Settings_Config_File = 'what.settings.conf'
+    Results_DB_File = 'what.results.sqlite'
+    Calibration_File = 'what.calibration.json'     # WRW 26-July-2025 - what_calibrate.py, see Calibrate.py
+    Copyright = f"Copyright \xa9 2025 Bill Wetzel"
+    plot_width_in = 10
+    plot_height_in = 7.5
+    export_engine = 'native'        # 'native' (QPainter) or 'matplotlib'
+    export_format = 'png'           # 'png', 'pdf' or 'svg', native engine. matplotlib takes any it knows.
+    results_npz = False             # Also save results as .what.npz beside .what.json
+    warmup_delay_ms = 1000          # Idle time after splash closes before warm-up starts
+    Version = f"{what_version.__version__} Build {what_version.__build__}"
+
+    test_gain_points_per_db = 1
+    test_points_per_octave = 4
+    start_freq = 125
+    end_freq = 16000
+
+    graphPointsPerOctave = 5
+    graphPointsPer10dB  = 5
+
+    graph_backend = 'qpainter'      # 'qpainter' or 'opengl', falls back to 'qpainter' without GL
+    scope_engine = 'native'         # 'native' or 'matplotlib'
+    scope_live_seconds = 2.0        # Live scope ring size, Length slider selects a fraction of it
+    scope_live_fps = 30             # Live scope poll rate while showing
+    scope_history_size = 20         # Stimuli kept for browsing in the scope
+    scope_history_mb = 64           #   and the most memory they may hold
+    hover_dwell_ms = 150            # Dwell over a grid cell before pre-rendering its tone
+    tone_cache_size = 8
+
+    loss_db_min = 0
+    loss_db_max = 80
+    gain_db_min = -80
+    gain_db_max = 0
+    reference_level = -80      # For hearing-loss conversion
+
+    def set( self, name, value ):
+        setattr( self, name, value )
+        store_changed()             # WRW 24-July-2025 - Store snapshots hold a copy of Const
+
+# -------------------------------------------------------------------------------
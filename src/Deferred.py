@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Deferred.py - WRW 20-July-2025
+#   Startup work that the window doesn't need in order to show: the .desktop
+#   file, the audio stack, restoring the scope. do_main_continue_b() queues it
+#   with add() and finish_splash() calls start() once the window has painted.
+
+#   Runs on the GUI thread, one task per pass of the event loop, so input and
+#   repaints get in between tasks. Thread work is WarmUp's job, see Warmup.py.
+#   timings is { name: seconds } for tasks that ran, for the startup report.
+# -------------------------------------------------------------------------------
+
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+# -------------------------------------------------------------------------------
+
+class DeferredTasks( QObject ):
+    finished = Signal()
+
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.tasks = []             # [ ( name, function ), ... ] in order
+        self.timings = {}
+        self.started = False
+
+    def add( self, name, fn ):
+        self.tasks.append( ( name, fn ))
+        if self.started and len( self.tasks ) == 1:
+            QTimer.singleShot( 0, self.run_next )
+
+    def start( self ):
+        if not self.started:
+            self.started = True
+            QTimer.singleShot( 0, self.run_next )
+
+    def run_next( self ):
+        if not self.tasks:
+            return
+
+        name, fn = self.tasks.pop( 0 )
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            print( f"ERROR-DEV: deferred startup task '{name}' failed: {e}" )
+        self.timings[ name ] = time.perf_counter() - start
+
+        if self.tasks:
+            QTimer.singleShot( 0, self.run_next )
+        else:
+            self.finished.emit()
+
+# -------------------------------------------------------------------------------
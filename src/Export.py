@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Export.py - WRW 10-July-2025
+#   Write the audiogram to a file. The 'native' engine paints it with QPainter
+#   onto a QImage (png, jpg), QPdfWriter (pdf) or QSvgGenerator (svg) and needs
+#   nothing beyond Qt. The 'matplotlib' engine is the original do_plot() and
+#   is imported only when selected, it took several seconds per save on Windows.
+
+#   Both draw the same grid as the graph widget, from Graph.grid_lines(), at
+#   Const.plot_width_in x plot_height_in and 100 dpi, as do_plot() did.
+
+#   WRW 11-July-2025 - ExportQueue runs exports on a worker thread so Save doesn't
+#   hold up the GUI. Neither engine touches widgets: QPainter on QImage, QPdfWriter
+#   and QSvgGenerator is fine off the GUI thread, matplotlib uses a bare Figure, no pyplot.
+
+#   WRW 24-July-2025 - The functions below take store, a Store.snapshot(), and read
+#   Const from it. ExportQueue takes the snapshot on submit, on the GUI thread.
+#   Without one they read the live Store, as what_render.py does.
+# -------------------------------------------------------------------------------
+
+import os
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import Qt, QPointF, QRectF, QSize, QSizeF, QRect, QMarginsF, QObject, Signal, QBuffer
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtGui import QPainter, QPen, QColor, QImage, QFont, QPdfWriter, QPageSize, QPolygonF
+
+from Store import Store
+from Graph import grid_lines
+
+# -------------------------------------------------------------------------------
+
+DPI = 100
+
+def pt( points ):                       # Points to device units at DPI
+    return points * DPI / 72
+
+#   Marker, face and edge colors by ear, as in do_plot().
+
+MARKERS = {
+    'B': ( 'o', '#000000', '#000000' ),
+    'L': ( 'x', None,      '#0000ff' ),
+    'R': ( 'o', None,      '#ff0000' ),
+}
+
+# -------------------------------------------------------------------------------
+#   One worker so overlapping saves queue up and run in order. Arguments are
+#   snapshotted on submit, the caller is free to change its points right after.
+#   Signals are emitted from the worker, Qt delivers them to slots on the GUI thread.
+
+class ExportQueue( QObject ):
+    started = Signal( str )             # ofile
+    finished = Signal( str )            # ofile
+    failed = Signal( str, str )         # ofile, error message
+
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.executor = ThreadPoolExecutor( max_workers=1, thread_name_prefix='export' )
+        self.queued = 0                 # Submitted and not yet started, GUI thread only
+        self.pending = 0                #   and not yet done
+        self.started.connect( self.job_started )           # Connected first so counts are current in later slots
+        self.finished.connect( self.job_done )
+        self.failed.connect( self.job_done )
+
+    def submit( self, data, title, ofile, smode, start_freq, end_freq, engine=None, trend=None ):
+        s = Store().snapshot()
+        data = tuple( ( freq, loss ) for freq, loss in data )
+        engine = engine or s.Const.export_engine
+        self.queued += 1
+        self.pending += 1
+        self.executor.submit( self.run, data, title, ofile, smode, start_freq, end_freq, engine, trend, s )
+
+    def busy( self ):
+        return self.pending > 0
+
+    #   Blocks until every save queued so far is done, then delivers their started,
+    #   finished and failed signals now rather than from the event loop. At exit
+    #   the loop may not run again, a failure would never be reported.
+
+    def wait( self ):
+        self.executor.submit( lambda: None ).result()          # One worker, runs after those queued
+        QCoreApplication.sendPostedEvents( None, QEvent.MetaCall )
+
+    #   Waits for queued saves so files aren't left half written at exit.
+
+    def shutdown( self ):
+        self.executor.shutdown( wait=True )
+
+    # ---------------------------------------------------------------
+
+    def run( self, data, title, ofile, smode, start_freq, end_freq, engine, trend, store ):
+        self.started.emit( ofile )
+        try:
+            export_audiogram( data, title, ofile, smode, start_freq, end_freq, engine, trend, store )
+        except Exception as e:
+            self.failed.emit( ofile, str( e ) or type( e ).__name__ )
+        else:
+            self.finished.emit( ofile )
+
+    def job_started( self, ofile ):
+        self.queued -= 1
+
+    def job_done( self, ofile, *_ ):
+        self.pending -= 1
+
+# -------------------------------------------------------------------------------
+#   data is [ ( freq, loss_db ), ... ] sorted by frequency, smode 'B', 'L' or 'R'.
+#   ofile extension selects the format for the native engine.
+#   WRW 16-July-2025 - trend, a Trend.Trend for one person, is drawn under the data if given.
+
+def export_audiogram( data, title, ofile, smode, start_freq, end_freq, engine=None, trend=None, store=None ):
+    s = store or Store()
+    engine = engine or s.Const.export_engine
+
+    if engine == 'matplotlib':
+        render_matplotlib( data, title, ofile, smode, start_freq, end_freq, trend, s )
+        return
+
+    width = int( s.Const.plot_width_in * DPI )
+    height = int( s.Const.plot_height_in * DPI )
+    ext = os.path.splitext( ofile )[1].lower()
+
+    if ext == '.pdf':
+        writer = QPdfWriter( ofile )
+        writer.setResolution( DPI )
+        writer.setPageSize( QPageSize( QSizeF( s.Const.plot_width_in, s.Const.plot_height_in ), QPageSize.Inch ))
+        writer.setPageMargins( QMarginsF( 0, 0, 0, 0 ))
+        writer.setTitle( title )
+        painter = QPainter()
+        if not painter.begin( writer ):
+            raise OSError( f"Can't write {ofile}" )
+        paint_audiogram( painter, width, height, data, title, smode, start_freq, end_freq, trend, s )
+        painter.end()
+
+    elif ext == '.svg':
+        from PySide6.QtSvg import QSvgGenerator
+        generator = QSvgGenerator()
+        generator.setFileName( ofile )
+        generator.setSize( QSize( width, height ))
+        generator.setViewBox( QRect( 0, 0, width, height ))
+        generator.setResolution( DPI )
+        generator.setTitle( title )
+        painter = QPainter()
+        if not painter.begin( generator ):
+            raise OSError( f"Can't write {ofile}" )
+        paint_audiogram( painter, width, height, data, title, smode, start_freq, end_freq, trend, s )
+        painter.end()
+
+    else:
+        image = render_image( data, title, smode, start_freq, end_freq, trend, s )
+        if not image.save( ofile ):
+            raise OSError( f"Can't write {ofile}" )
+
+def render_image( data, title, smode, start_freq, end_freq, trend=None, store=None ):
+    s = store or Store()
+    width = int( s.Const.plot_width_in * DPI )
+    height = int( s.Const.plot_height_in * DPI )
+
+    image = QImage( width, height, QImage.Format_ARGB32 )
+    image.setDotsPerMeterX( round( DPI / .0254 ))
+    image.setDotsPerMeterY( round( DPI / .0254 ))
+    image.fill( Qt.white )
+    painter = QPainter( image )
+    paint_audiogram( painter, width, height, data, title, smode, start_freq, end_freq, trend, s )
+    painter.end()
+    return image
+
+# -------------------------------------------------------------------------------
+#   WRW 12-July-2025 - Render a dummy audiogram in memory so the first real save
+#       doesn't pay for loading fonts, the png plugin or matplotlib. Run by WarmUp.
+
+def prerender( engine=None, store=None ):
+    s = store or Store()
+    engine = engine or s.Const.export_engine
+    data = ( ( 250, 10 ), ( 1000, 20 ), ( 4000, 30 ) )
+
+    if engine == 'matplotlib':
+        render_matplotlib( data, "Warm-up", io.BytesIO(), 'B', 125, 16000, store=s )
+    else:
+        image = render_image( data, "Warm-up", 'B', 125, 16000, store=s )
+        buf = QBuffer()
+        buf.open( QBuffer.WriteOnly )
+        image.save( buf, 'PNG' )
+
+# -------------------------------------------------------------------------------
+#   Layout follows the matplotlib version: title above, labels outside the axes,
+#   dashed major and dotted minor grid, loss increasing downward, info box at
+#   lower center. Sizes are in points, converted with pt().
+
+def paint_audiogram( painter, width, height, data, title, smode, start_freq, end_freq, trend=None, store=None ):
+    s = store or Store()
+    loss_min, loss_max = s.Const.loss_db_min, s.Const.loss_db_max
+    major_freqs, minor_freqs, major_losses, minor_losses = grid_lines( start_freq, end_freq, s )
+
+    painter.setRenderHint( QPainter.Antialiasing )
+    painter.fillRect( QRectF( 0, 0, width, height ), Qt.white )
+
+    def font( points ):
+        f = QFont( painter.font() )
+        f.setPixelSize( round( pt( points )))
+        return f
+
+    axes = QRectF( pt( 44 ), pt( 26 ), width - pt( 44 ) - pt( 24 ), height - pt( 26 ) - pt( 40 ))
+
+    log_min = math.log10( start_freq )
+    log_max = math.log10( end_freq )
+
+    def x_px( freq ):
+        return axes.left() + ( math.log10( freq ) - log_min ) / ( log_max - log_min ) * axes.width()
+
+    def y_px( loss ):
+        return axes.top() + ( loss - loss_min ) / ( loss_max - loss_min ) * axes.height()
+
+    # -----------------------------
+    #   Grid
+
+    def grid_pen( color, pattern ):
+        pen = QPen( QColor( color ), pt( 1 ))
+        pen.setDashPattern( pattern )           # In pen widths, matplotlib's dashed and dotted
+        pen.setCapStyle( Qt.FlatCap )
+        return pen
+
+    painter.setPen( grid_pen( '#a0a0a0', [ 1, 1.65 ] ))
+    for freq in minor_freqs:
+        painter.drawLine( QPointF( x_px( freq ), axes.top() ), QPointF( x_px( freq ), axes.bottom() ))
+    for loss in minor_losses:
+        painter.drawLine( QPointF( axes.left(), y_px( loss )), QPointF( axes.right(), y_px( loss )))
+
+    painter.setPen( grid_pen( '#808080', [ 3.7, 1.6 ] ))
+    for freq in major_freqs:
+        painter.drawLine( QPointF( x_px( freq ), axes.top() ), QPointF( x_px( freq ), axes.bottom() ))
+    for loss in major_losses:
+        painter.drawLine( QPointF( axes.left(), y_px( loss )), QPointF( axes.right(), y_px( loss )))
+
+    # -----------------------------
+    #   Ticks and tick labels
+
+    painter.setPen( QPen( Qt.black, pt( .8 )))
+    painter.setFont( font( 8 ))
+    metrics = painter.fontMetrics()
+
+    for freq in minor_freqs:
+        painter.drawLine( QPointF( x_px( freq ), axes.bottom() ), QPointF( x_px( freq ), axes.bottom() + pt( 2 )))
+    for loss in minor_losses:
+        painter.drawLine( QPointF( axes.left() - pt( 2 ), y_px( loss )), QPointF( axes.left(), y_px( loss )))
+
+    for freq in major_freqs:
+        x = x_px( freq )
+        painter.drawLine( QPointF( x, axes.bottom() ), QPointF( x, axes.bottom() + pt( 4 )))
+        txt = f"{int(freq):,}"
+        painter.drawText( QPointF( x - metrics.horizontalAdvance( txt ) / 2, axes.bottom() + pt( 7.5 ) + metrics.ascent() ), txt )
+
+    for loss in major_losses:
+        y = y_px( loss )
+        painter.drawLine( QPointF( axes.left() - pt( 4 ), y ), QPointF( axes.left(), y ))
+        txt = f"{int(loss)}"
+        painter.drawText( QPointF( axes.left() - pt( 7.5 ) - metrics.horizontalAdvance( txt ), y + metrics.ascent() / 2 - 1 ), txt )
+
+    # -----------------------------
+    #   Axis labels and title
+
+    painter.setFont( font( 10 ))
+    metrics = painter.fontMetrics()
+
+    txt = "Frequency (Hz)"
+    painter.drawText( QPointF( axes.center().x() - metrics.horizontalAdvance( txt ) / 2, height - pt( 8 )), txt )
+
+    txt = "Hearing Loss (dB) (Required gain for normal hearing)"
+    painter.save()
+    painter.translate( pt( 8 ) + metrics.ascent(), axes.center().y() + metrics.horizontalAdvance( txt ) / 2 )
+    painter.rotate( -90 )
+    painter.drawText( QPointF( 0, 0 ), txt )
+    painter.restore()
+
+    painter.setFont( font( 12 ))
+    metrics = painter.fontMetrics()
+    painter.drawText( QPointF( axes.center().x() - metrics.horizontalAdvance( title ) / 2, axes.top() - pt( 6 )), title )
+
+    # -----------------------------
+    #   Data, clipped to the axes
+
+    painter.save()
+    painter.setClipRect( axes )
+
+    if trend is not None:
+        from Trend import paint_trend           # WRW 19-July-2025 - Trend brings in numpy, only when drawing one
+        paint_trend( painter, trend, x_px, y_px, pt( 1 ))
+
+    if data:
+        points = [ QPointF( x_px( freq ), y_px( loss )) for freq, loss in data ]
+        painter.setPen( QPen( Qt.black, pt( .75 )))
+        painter.drawPolyline( QPolygonF( points ))
+
+        marker, face, edge = MARKERS[ smode ]
+        r = pt( 7 ) / 2
+        painter.setPen( QPen( QColor( edge ), pt( 1.4 )))
+        painter.setBrush( QColor( face ) if face else Qt.NoBrush )
+        for p in points:
+            if marker == 'o':
+                painter.drawEllipse( p, r, r )
+            else:
+                painter.drawLine( p + QPointF( -r, -r ), p + QPointF( r, r ))
+                painter.drawLine( p + QPointF( -r, r ), p + QPointF( r, -r ))
+
+    painter.restore()
+
+    # -----------------------------
+    #   Frame, then a little advertisement
+
+    painter.setPen( QPen( Qt.black, pt( .8 )))
+    painter.setBrush( Qt.NoBrush )
+    painter.drawRect( axes )
+
+    painter.setFont( font( 10 ))
+    metrics = painter.fontMetrics()
+    lines = [ s.Const.What_Full_Title, "https://what.wrwetzel.com" ]
+    pad = pt( 4 )
+    box_w = max( metrics.horizontalAdvance( line ) for line in lines ) + 2 * pad
+    box_h = len( lines ) * metrics.height() + 2 * pad
+    box = QRectF( axes.center().x() - box_w / 2, axes.bottom() - pt( 5 ) - box_h, box_w, box_h )
+
+    painter.setPen( QPen( Qt.black, pt( .8 )))
+    painter.setBrush( Qt.white )
+    painter.drawRect( box )
+    for i, line in enumerate( lines ):
+        painter.drawText( QPointF( box.left() + pad, box.top() + pad + i * metrics.height() + metrics.ascent() ), line )
+
+# -------------------------------------------------------------------------------
+#   WRW 23-June-2025 - Defer import of matplotlib until needed
+#   lock in 'Agg' backend so matplotlib doesn't look further. Did not resolve long import
+#   time but chat recommends keeping it.
+#   Standard audiogram:
+#       Frequencies tested: 125 Hz, 250 Hz, 500 Hz, 1000 Hz, 2000 Hz, 3000Hz, 4000 Hz, and 8000 Hz.
+#       Loss -10 to 120
+#       Right ear - Red 'o'
+#       Left ear - Blue 'x'
+#   This uses the symbols but not the loss range nor frequencies.
+#   WRW 10-July-2025 - Moved here from MainWindow.do_plot(), now the 'matplotlib' engine.
+
+def render_matplotlib( data, title, ofile, smode, start_freq, end_freq, trend=None, store=None ):
+
+    s = store or Store()
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure                            # WRW 11-July-2025 - Not pyplot, runs on export thread
+    from matplotlib.ticker import FixedLocator, FuncFormatter       # WRW 25-June-2025
+    from matplotlib.offsetbox import AnchoredText
+
+    major_freqs, minor_freqs, major_losses, minor_losses = grid_lines( start_freq, end_freq, s )
+
+    # -----------------------------
+    #   Unzip data into two arrays.
+    freqs, gains = zip(*data)   # with '*' unzips (( f1, g1 ), ( f2, g2 ), ... ) into (f1, f2, ...), (g1, g2, ...)
+
+    # -----------------------------
+    #   Create figure and set title
+
+    fig = Figure(figsize=( s.Const.plot_width_in, s.Const.plot_height_in ), dpi=DPI)
+    ax = fig.add_subplot(1, 1, 1)
+    ax.set_title( title )
+
+    # -----------------------------
+    #   WRW 16-July-2025 - History trend under the data, as paint_trend() draws it.
+
+    if trend is not None:
+        from Trend import TREND_COLOR
+        ax.fill_between( trend.grid, trend.fit_lo, trend.fit_hi, color=TREND_COLOR, alpha=.25, linewidth=0 )
+        ax.plot( trend.grid, trend.fit, color=TREND_COLOR, linestyle='dashed', linewidth=1.5 )
+        worse = trend.worsening()
+        better = trend.significant & ( trend.slope < 0 )
+        ax.plot( trend.grid[ worse ], trend.fit[ worse ], 'o', color=TREND_COLOR, markersize=6 )
+        ax.plot( trend.grid[ better ], trend.fit[ better ], 'o', markeredgecolor=TREND_COLOR, markerfacecolor='none', markersize=6 )
+
+    # -----------------------------
+    #   Plot - Define marker characteristics
+
+    marker, facecolor, edgecolor = MARKERS[ smode ]
+
+    ax.plot(freqs, gains,
+        marker=marker,
+        markersize=7,
+        markeredgewidth=1.4,
+        linestyle='-',
+        color='#000000',
+        linewidth=.75,
+        markerfacecolor=facecolor or 'none',
+        markeredgecolor=edgecolor
+    )
+
+    # -----------------------------
+    #   Axes labels and tick params
+
+    ax.set_xlabel("Frequency (Hz)")
+    ax.set_ylabel("Hearing Loss (dB) (Required gain for normal hearing)")
+    ax.tick_params(axis='both', which='major', length=4, width=1, labelsize=8)
+
+    # -----------------------------
+    #   Y-axis: 0 at top
+
+    ax.set_ylim( s.Const.loss_db_max, s.Const.loss_db_min )
+    ax.set_yticks( major_losses )
+    ax.set_yticks( minor_losses, minor=True )
+
+    ax.yaxis.set_major_formatter( FuncFormatter(lambda x, _: f"{int(x)}"))
+
+    # -----------------------------
+    #   X-axis:
+
+    #   Set tick positions (major & minor)
+    ax.set_xlim( start_freq, end_freq )
+    ax.set_xscale("log")
+
+    ax.xaxis.set_major_locator( FixedLocator( major_freqs ))
+    ax.xaxis.set_minor_locator( FixedLocator( minor_freqs ))
+
+    #   Set tick labels (major only)
+    def format_tick(x, _):
+        return f"{int(x):,}" if x in major_freqs else ""
+
+    ax.xaxis.set_major_formatter(FuncFormatter(format_tick))
+    ax.xaxis.set_minor_formatter(FuncFormatter(lambda x, _: ""))  # Hide minor labels
+
+    # -----------------------------
+    #   Grid
+    #   linestyle: '-', '--', '-.', ':', 'None', ' ', '', 'solid', 'dashed', 'dashdot', 'dotted''
+
+    ax.grid(True, which='major', linewidth=1, color='#808080', linestyle='dashed')
+    ax.grid(True, which='minor', linewidth=1, color='#a0a0a0', linestyle='dotted')
+
+    # -----------------------------
+    #   Add a little advertisement
+
+    txt = f"""{s.Const.What_Full_Title}\nhttps://what.wrwetzel.com"""
+    info_box = AnchoredText( txt, loc='lower center')
+    ax.add_artist(info_box)
+
+    # -----------------------------
+    #   Write graph to file
+
+    fig.tight_layout()
+    fig.savefig(ofile)
+
+# -------------------------------------------------------------------------------
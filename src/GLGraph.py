@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------------
+#   GLGraph.py - WRW 3-July-2025
+#   OpenGL backend for the audiogram graph. Same API as GraphWidget, see GraphBase.
+
+#   Grid lines are built once in normalized graph coordinates, u = log-frequency
+#   fraction, v = loss fraction, and uploaded to a vertex buffer. Resizing only
+#   changes the uniforms. Points and marker live in a second buffer that is
+#   re-uploaded only when they change. Each frame is a fixed handful of draw calls
+#   however many points are on the graph. Axis labels are drawn with QPainter.
+
+#   GLSL 1.20 / ES 2.0 style shaders, Qt supplies precision qualifiers as needed.
+#   Should the shaders fail to build we paint with the QPainter code instead.
+# -------------------------------------------------------------------------------------
+
+import sys
+import math
+import numpy as np
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPainter, QColor, QVector2D
+from PySide6.QtOpenGL import QOpenGLBuffer, QOpenGLShader, QOpenGLShaderProgram, QOpenGLVertexArrayObject
+from PySide6.QtOpenGLWidgets import QOpenGLWidget
+
+from Store import Store
+from Graph import GraphBase, GraphWidget
+
+# -------------------------------------------------------------------------------------
+#   The few GL enums needed, to avoid a dependency on PyOpenGL.
+
+GL_POINTS = 0x0000
+GL_LINES = 0x0001
+GL_FLOAT = 0x1406
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_PROGRAM_POINT_SIZE = 0x8642
+GL_POINT_SPRITE = 0x8861
+
+FLOAT_SIZE = 4
+
+# -------------------------------------------------------------------------------------
+#   Lines: a_dash is ( axis, period, on ). axis 0 dashes along x, 1 along y. period 0 is solid.
+
+LINE_VS = """attribute highp vec2 a_pos;
+attribute lowp vec4 a_color;
+attribute highp vec3 a_dash;
+uniform highp vec2 u_view;
+uniform highp vec2 u_margin;
+uniform highp float u_scale;
+varying lowp vec4 v_color;
+varying highp vec3 v_dash;
+void main() {
+    highp vec2 px = u_margin + a_pos * ( u_view - 2.0 * u_margin );
+    gl_Position = vec4( 2.0 * px.x / u_view.x - 1.0, 1.0 - 2.0 * px.y / u_view.y, 0.0, 1.0 );
+    v_color = a_color;
+    v_dash = vec3( a_dash.x, a_dash.yz * u_scale );
+}
+"""
+
+LINE_FS = """varying lowp vec4 v_color;
+varying highp vec3 v_dash;
+void main() {
+    if( v_dash.y > 0.0 ) {
+        highp float along = v_dash.x > 0.5 ? gl_FragCoord.y : gl_FragCoord.x;
+        if( mod( along, v_dash.y ) >= v_dash.z )
+            discard;
+    }
+    gl_FragColor = v_color;
+}
+"""
+
+#   Points: a_size is ( sprite, inner, outer ) in pixels. Filled dot has inner 0, marker ring doesn't.
+
+POINT_VS = """attribute highp vec2 a_pos;
+attribute lowp vec4 a_color;
+attribute highp vec3 a_size;
+uniform highp vec2 u_view;
+uniform highp vec2 u_margin;
+uniform highp float u_scale;
+varying lowp vec4 v_color;
+varying highp vec3 v_size;
+void main() {
+    highp vec2 px = u_margin + a_pos * ( u_view - 2.0 * u_margin );
+    gl_Position = vec4( 2.0 * px.x / u_view.x - 1.0, 1.0 - 2.0 * px.y / u_view.y, 0.0, 1.0 );
+    gl_PointSize = a_size.x * u_scale;
+    v_color = a_color;
+    v_size = a_size;
+}
+"""
+
+POINT_FS = """varying lowp vec4 v_color;
+varying highp vec3 v_size;
+void main() {
+    highp float r = length( gl_PointCoord - vec2( 0.5 ) ) * v_size.x;
+    if( r < v_size.y || r > v_size.z )
+        discard;
+    gl_FragColor = v_color;
+}
+"""
+
+# -------------------------------------------------------------------------------------
+
+def rgba( color ):
+    c = QColor( color )
+    return ( c.redF(), c.greenF(), c.blueF(), c.alphaF() )
+
+# -------------------------------------------------------------------------------------
+
+class GLGraphWidget( GraphBase, QOpenGLWidget ):
+
+    def __init__(self, loss_db_min, loss_db_max, parent=None ):
+        super().__init__( loss_db_min, loss_db_max, parent )
+        self.gl_ok = False
+        self.grid_dirty = True
+        self.overlay_dirty = True
+        self.grid_count = 0             # Vertices of dashed and dotted grid lines
+        self.axis_count = 0             # Vertices of the two axes, follow the grid lines
+        self.overlay_count = 0
+
+        fmt = self.format()
+        fmt.setSamples( 4 )             # Smooth edges on the points and marker
+        self.setFormat( fmt )
+
+    def grid_changed( self ):
+        self.grid_dirty = True
+        self.update()
+
+    def overlay_changed( self ):
+        self.overlay_dirty = True
+        self.update()
+
+    # --------------------------------------------------
+
+    def initializeGL( self ):
+        self.f = self.context().functions()
+
+        #   gl_PointCoord needs GLSL 1.20 on desktop GL, ES 2.0 has it without a #version.
+
+        version = '' if self.context().isOpenGLES() else '#version 120\n'
+        self.line_prog = self.make_program( version + LINE_VS, version + LINE_FS )
+        self.point_prog = self.make_program( version + POINT_VS, version + POINT_FS )
+        self.gl_ok = self.line_prog is not None and self.point_prog is not None
+        if not self.gl_ok:
+            print( "NOTE: OpenGL shaders failed, graph falling back to QPainter", file=sys.stderr )
+            return
+
+        self.grid = self.make_buffer( self.line_prog, ( ('a_pos', 2), ('a_color', 4), ('a_dash', 3) ))
+        self.overlay = self.make_buffer( self.point_prog, ( ('a_pos', 2), ('a_color', 4), ('a_size', 3) ))
+        self.grid_dirty = True
+        self.overlay_dirty = True
+
+        self.context().aboutToBeDestroyed.connect( self.cleanupGL )
+
+    def cleanupGL( self ):
+        self.makeCurrent()
+        for vao, buf, layout in ( self.grid, self.overlay ):
+            buf.destroy()
+            vao.destroy()
+        self.doneCurrent()
+        self.gl_ok = False
+
+    def make_program( self, vs, fs ):
+        prog = QOpenGLShaderProgram( self )
+        if not ( prog.addShaderFromSourceCode( QOpenGLShader.Vertex, vs ) and
+                 prog.addShaderFromSourceCode( QOpenGLShader.Fragment, fs ) and
+                 prog.link() ):
+            print( f"ERROR-DEV: shader build failed: {prog.log()}", file=sys.stderr )
+            return None
+        return prog
+
+    #   VAO is optional on compatibility contexts, create() just fails there and
+    #       the attribute pointers are set again on each draw.
+
+    def make_buffer( self, prog, layout ):
+        vao = QOpenGLVertexArrayObject( self )
+        vao.create()
+        vao.bind()
+
+        buf = QOpenGLBuffer( QOpenGLBuffer.VertexBuffer )
+        buf.create()
+        buf.setUsagePattern( QOpenGLBuffer.StaticDraw )
+        buf.bind()
+        self.set_attributes( prog, layout )
+
+        vao.release()
+        buf.release()
+        return vao, buf, layout
+
+    def set_attributes( self, prog, layout ):
+        prog.bind()
+        stride = sum( size for name, size in layout ) * FLOAT_SIZE
+        offset = 0
+        for name, size in layout:
+            loc = prog.attributeLocation( name )
+            prog.enableAttributeArray( loc )
+            prog.setAttributeBuffer( loc, GL_FLOAT, offset, size, stride )
+            offset += size * FLOAT_SIZE
+        prog.release()
+
+    def upload( self, buf, vertices ):
+        data = np.ascontiguousarray( vertices, dtype=np.float32 ).tobytes()
+        buf.bind()
+        buf.allocate( data, len( data ))
+        buf.release()
+
+    # --------------------------------------------------
+    #   Normalized coordinates used by both buffers.
+
+    def freq_u( self, freq ):
+        log_min = math.log10( self.start_freq )
+        log_max = math.log10( self.end_freq )
+        return ( np.log10( freq ) - log_min ) / ( log_max - log_min )
+
+    def loss_v( self, loss ):
+        return ( np.asarray( loss, dtype=float ) - self.loss_db_min ) / ( self.loss_db_max - self.loss_db_min )
+
+    # --------------------------------------------------
+    #   Line segments as rows of ( u, v, r, g, b, a, axis, period, on ), two rows per segment.
+    #   Qt DashLine is 4 on 2 off, DotLine 1 on 1 off, both in pen widths.
+
+    def build_grid( self ):
+        dash = ( 6.0, 4.0 )
+        dot = ( 2.0, 1.0 )
+        grid_color = rgba( '#707070' )
+        sub_grid_color = rgba( '#909090' )
+
+        def hlines( v, color, pattern ):
+            n = len( v )
+            rows = np.empty( ( n, 2, 9 ), dtype=np.float32 )
+            rows[:, 0, 0] = 0.0
+            rows[:, 1, 0] = 1.0
+            rows[:, :, 1] = np.asarray( v )[:, None]
+            rows[:, :, 2:6] = color
+            rows[:, :, 6] = 0.0
+            rows[:, :, 7:9] = pattern
+            return rows.reshape( -1, 9 )
+
+        def vlines( u, color, pattern ):
+            n = len( u )
+            rows = np.empty( ( n, 2, 9 ), dtype=np.float32 )
+            rows[:, :, 0] = np.asarray( u )[:, None]
+            rows[:, 0, 1] = 0.0
+            rows[:, 1, 1] = 1.0
+            rows[:, :, 2:6] = color
+            rows[:, :, 6] = 1.0
+            rows[:, :, 7:9] = pattern
+            return rows.reshape( -1, 9 )
+
+        grid = np.concatenate( [
+            vlines( self.freq_u( self.minor_freqs ), sub_grid_color, dot ),
+            hlines( self.loss_v( self.minor_losses ), sub_grid_color, dot ),
+            vlines( self.freq_u( self.major_freqs ), grid_color, dash ),
+            hlines( self.loss_v( self.major_losses ), grid_color, dash ),
+        ])
+
+        axes = np.concatenate( [
+            vlines( [0.0], rgba( '#000000' ), ( 0.0, 0.0 )),        # Y axis
+            hlines( [1.0], rgba( '#000000' ), ( 0.0, 0.0 )),        # X axis
+        ])
+
+        self.upload( self.grid[1], np.concatenate( [ grid, axes ] ))
+        self.grid_count = len( grid )
+        self.axis_count = len( axes )
+        self.grid_dirty = False
+
+    # --------------------------------------------------
+    #   Points and marker as rows of ( u, v, r, g, b, a, sprite, inner, outer ).
+    #   GraphWidget draws points as a circle of diameter dia with a pen dia wide, a dot 2*dia across.
+
+    def build_overlay( self ):
+        s = Store()
+        rows = []
+
+        dia = s.Const.pointDiameter
+        for x_val, y_val, accept in self.points:
+            color = rgba( '#0000ff' if accept else '#ff0000' )
+            rows.append( ( self.freq_u( x_val ), self.loss_v( y_val ), *color, 2 * dia + 2, 0.0, dia ))
+
+        if self.marker:
+            x_val, y_val, color = self.marker
+            dia = s.Const.markerDiameter
+            pen = s.Const.markerPen
+            rows.append( ( self.freq_u( x_val ), self.loss_v( y_val ), *rgba( color ),
+                           dia + pen + 2, ( dia - pen ) / 2, ( dia + pen ) / 2 ))
+
+        if rows:
+            self.upload( self.overlay[1], np.array( rows, dtype=np.float32 ))
+        self.overlay_count = len( rows )
+        self.overlay_dirty = False
+
+    # --------------------------------------------------
+
+    def set_uniforms( self, prog ):
+        prog.setUniformValue( b"u_view", QVector2D( self.width(), self.height() ))
+        prog.setUniformValue( b"u_margin", QVector2D( self.margin_x, self.margin_y ))
+        prog.setUniformValue1f( b"u_scale", self.devicePixelRatioF() )
+
+    def draw( self, prog, buffer, mode, first, count ):
+        vao, buf, layout = buffer
+        prog.bind()
+        self.set_uniforms( prog )
+        if vao.isCreated():
+            vao.bind()
+            self.f.glDrawArrays( mode, first, count )
+            vao.release()
+        else:
+            buf.bind()
+            self.set_attributes( prog, layout )
+            prog.bind()
+            self.f.glDrawArrays( mode, first, count )
+            buf.release()
+        prog.release()
+
+    # --------------------------------------------------
+
+    def paintGL( self ):
+        if not self.gl_ok:
+            GraphWidget.paintEvent( self, None )        # Same drawing code, QPainter works on this widget too.
+            return
+
+        s = Store()
+        self.graph_width = self.width() - 2 * self.margin_x
+        graph_height = self.height() - 2 * self.margin_y
+
+        painter = QPainter( self )
+        painter.beginNativePainting()
+
+        if self.grid_dirty:
+            self.build_grid()
+        if self.overlay_dirty:
+            self.build_overlay()
+
+        f = self.f
+        f.glClearColor( *rgba( s.Const.graphBG ))
+        f.glClear( GL_COLOR_BUFFER_BIT )
+        self.set_state()
+
+        f.glLineWidth( 1.0 )
+        self.draw( self.line_prog, self.grid, GL_LINES, 0, self.grid_count )
+        f.glLineWidth( 2.0 )
+        self.draw( self.line_prog, self.grid, GL_LINES, self.grid_count, self.axis_count )
+        f.glLineWidth( 1.0 )
+
+        painter.endNativePainting()
+
+        #   Same order as GraphWidget.paintEvent(), the trend goes under the points.
+
+        self.paint_labels( painter, graph_height )
+        self.paint_trend( painter, graph_height )
+
+        if self.overlay_count:
+            painter.beginNativePainting()
+            self.set_state()                        # QPainter leaves its own state behind
+            self.draw( self.point_prog, self.overlay, GL_POINTS, 0, self.overlay_count )
+            painter.endNativePainting()
+
+        painter.end()
+
+    def set_state( self ):
+        f = self.f
+        f.glEnable( GL_BLEND )
+        f.glBlendFunc( GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA )
+        f.glEnable( GL_PROGRAM_POINT_SIZE )
+        f.glEnable( GL_POINT_SPRITE )               # Needed for gl_PointCoord on compatibility contexts
+
+# -------------------------------------------------------------------------------------
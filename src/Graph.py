@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------------
+#   Graph.py - WRW 3-July-2025 - Moved GraphWidget out of what.py.
+#   GraphBase holds everything except painting so the QPainter widget here and
+#   the OpenGL widget in GLGraph.py present the same API to MainWindow:
+#       add_point(), remove_point(), set_marker(), pointClicked, pointHovered, ...
+#   Use make_graph_widget() to get one or the other.
+# -------------------------------------------------------------------------------------
+
+import os
+import math
+
+from PySide6.QtCore import Qt, Signal, QRect, QTimer
+from PySide6.QtGui import QPainter, QPen, QColor, QOpenGLContext, QOffscreenSurface
+from PySide6.QtWidgets import QWidget
+
+from Store import Store
+
+# -------------------------------------------------------------------------------------
+#   WRW 10-July-2025 - Grid computation at module level, the exporter in Export.py
+#       draws the same grid.
+#   WRW 19-July-2025 - Plain lists, no numpy, so the window can show before numpy
+#       is imported. np.arange() was a few ulps off at the octaves so setdiff1d()
+#       left the major lines in the minor list too, here they match and drop out.
+
+def arange( start, stop, step ):
+    return [ start + i * step for i in range( max( 0, math.ceil( (stop - start) / step ))) ]
+
+def octave_grid_lines( start=125, stop=16000, divisions_per_octave=5 ):
+    n_start = math.log2(start)
+    n_stop = math.log2(stop)
+    steps = arange(n_start, n_stop + 1e-6, 1 / divisions_per_octave)
+    return [ 2 ** step for step in steps ]
+
+def loss_grid_lines( start=0, stop=80, divisions_per_10dB = 1):
+    steps = arange(start, stop + 1e-6, 10 /  divisions_per_10dB )
+    return [ int( step ) for step in steps ]
+
+#   Returns major_freqs, minor_freqs, major_losses, minor_losses
+#   WRW 24-July-2025 - store, a Store.snapshot(), when called from the export thread.
+
+def grid_lines( start_freq, end_freq, store=None ):
+    s = store or Store()
+
+    major_losses = loss_grid_lines( s.Const.loss_db_min, s.Const.loss_db_max, 1 )
+    minor_losses = loss_grid_lines( s.Const.loss_db_min, s.Const.loss_db_max, 5 )
+    minor_losses = sorted( set( minor_losses ) - set( major_losses ))   # Remove major from minor
+
+    #   Generate the frequencies for the graph, not the test frequencies.
+
+    major_freqs = octave_grid_lines( start_freq, end_freq, 1 )
+    minor_freqs = octave_grid_lines( start_freq, end_freq, s.Const.graphPointsPerOctave )
+    minor_freqs = sorted( set( minor_freqs ) - set( major_freqs ))      # Remove major from minor
+
+    return major_freqs, minor_freqs, major_losses, minor_losses
+
+# -------------------------------------------------------------------------------------
+#   Coordinates: 0, 0 is upper left.
+
+class GraphBase():
+    pointClicked = Signal(float, float)  # freq, gain_db
+    pointHovered = Signal(float, float)  # freq, gain_db - after mouse dwells over a grid cell
+    hoverCancelled = Signal()            # Mouse moved to another grid cell or left the graph
+
+    def __init__(self, loss_db_min, loss_db_max, parent=None ):
+        super().__init__(parent)
+        s = Store()
+        self.points = []
+        self.margin_x = 40              # Margin in the X-direction on the Y-axis
+        self.margin_y = 30              # Margin in the Y-direction on the X-axis
+        self.loss_db_min = loss_db_min
+        self.loss_db_max = loss_db_max
+        self.marker = None              # WRW 16-June-2025 - Show marker where tone is being played.
+        self.trend = None               # WRW 16-July-2025 - History trend from Trend.py, drawn under the points
+
+        #   WRW 2-July-2025 - Track the mouse so the tone under the cursor can be rendered
+        #       before the click arrives.
+
+        self.hover_point = None
+        self.hover_timer = QTimer( self )
+        self.hover_timer.setSingleShot( True )
+        self.hover_timer.setInterval( s.Const.hover_dwell_ms )
+        self.hover_timer.timeout.connect( self.hover_dwelled )
+        self.setMouseTracking( True )
+
+    #   WRW 3-July-2025 - Grid now computed here instead of on every paintEvent().
+
+    def set_parameters( self, start_freq, end_freq ):   # WRW 19-June-2025 - separate from __init__()
+        self.start_freq = start_freq
+        self.end_freq = end_freq
+        self.update_grid()
+        self.grid_changed()
+
+    def add_point( self, x, y, accept ):
+        self.points.append((x, y, accept ))
+        self.overlay_changed()
+
+    def remove_point( self, xr, yr ):
+        self.points = [ (x, y, z ) for x, y, z in self.points if x != xr or y != yr ]
+        self.overlay_changed()
+
+    def get_accepted_points( self ):
+        return [ (x, y) for x, y, z in self.points if z ]
+
+    def clear_points( self ):
+        self.points = []
+        self.overlay_changed()
+
+    def set_marker( self, x, y, color ):
+        self.marker = (x, y, color )
+        self.overlay_changed()
+
+    def clear_marker( self ):
+        self.marker = None
+        self.overlay_changed()
+
+    def set_trend( self, trend ):
+        self.trend = trend
+        self.overlay_changed()
+
+    def clear_trend( self ):
+        self.set_trend( None )
+
+    #   Backends override these to invalidate cached geometry.
+
+    def grid_changed( self ):
+        self.update()
+
+    def overlay_changed( self ):
+        self.update()
+
+    # --------------------------------------------------
+
+    def update_grid( self ):
+        self.major_freqs, self.minor_freqs, self.major_losses, self.minor_losses = grid_lines( self.start_freq, self.end_freq )
+
+    # --------------------------------------------------
+    #   Axis labels, shared by both backends. Drawn in the margins so order relative
+    #   to the grid lines does not matter.
+
+    def paint_labels( self, painter, graph_height ):
+        s = Store()
+        height = self.height()
+
+        painter.setPen(Qt.black)
+
+        for loss in self.major_losses:
+            y_px = self.margin_y + ( loss - s.Const.loss_db_min) / (s.Const.loss_db_max - s.Const.loss_db_min) * graph_height
+            painter.drawText( 15, y_px +2 , f"{loss:.0f}")      # +2 to center text relative to line
+
+        metrics = painter.fontMetrics()
+
+        for freq in self.major_freqs:
+            x_pixel = self.map_freq(freq, self.graph_width)
+            txt = f"{int(freq):,}"
+            text_width = metrics.horizontalAdvance(txt)
+            painter.drawText( x_pixel - text_width//2, height-self.margin_y+20, txt )   # // integer div to avoid blurry text on some platforms
+
+    # --------------------------------------------------
+    #   Convert linear frequency to point on graph in log scale.
+
+    def map_freq(self, freq, graph_width ):
+        log_min = math.log10(self.start_freq)
+        log_max = math.log10(self.end_freq)
+        log_freq = math.log10(freq)
+        return (log_freq - log_min) / (log_max - log_min) * graph_width + self.margin_x
+
+    def map_loss( self, loss, graph_height ):
+        return self.margin_y + ( loss - self.loss_db_min ) / ( self.loss_db_max - self.loss_db_min ) * graph_height
+
+    #   Both backends draw the trend with QPainter, it changes rarely.
+
+    def paint_trend( self, painter, graph_height ):
+        if self.trend is not None:
+            from Trend import paint_trend       # WRW 19-July-2025 - numpy, only once there is a trend
+            painter.save()
+            painter.setClipRect( self.margin_x, self.margin_y, self.graph_width, graph_height )
+            paint_trend( painter, self.trend, lambda f: self.map_freq( f, self.graph_width ), lambda l: self.map_loss( l, graph_height ))
+            painter.restore()
+
+    # --------------------------------------------------------
+
+    def mousePressEvent(self, event):
+        self.setFocus()
+        if event.button() == Qt.LeftButton:
+            x = round( event.position().x())
+            y = round( event.position().y())
+            self.handle_click(x, y)
+
+    def handle_click(self, x_px, y_px):
+        # self.last_click = (x_px, y_px)        # Keep for debugging int() roundoff problems
+        # self.update()
+
+        point = self.pixel_to_point( x_px, y_px )
+        if point:
+            self.pointClicked.emit( *point )
+
+    # --------------------------------------------------------
+    #   WRW 2-July-2025 - Hover. Restart the dwell timer each time the mouse
+    #       enters a new grid cell, cancel any work for the old cell.
+
+    def mouseMoveEvent(self, event):
+        x = round( event.position().x())
+        y = round( event.position().y())
+        point = self.pixel_to_point( x, y )
+
+        if point != self.hover_point:
+            self.hover_point = point
+            self.hover_timer.stop()
+            self.hoverCancelled.emit()
+            if point:
+                self.hover_timer.start()
+
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.hover_point = None
+        self.hover_timer.stop()
+        self.hoverCancelled.emit()
+        super().leaveEvent(event)
+
+    def hover_dwelled( self ):
+        if self.hover_point:
+            self.pointHovered.emit( *self.hover_point )
+
+    # --------------------------------------------------------
+    #   Convert pixel position to quantized (freq, loss_db), None if outside plot area.
+
+    def pixel_to_point(self, x_px, y_px):
+        s = Store()
+
+        width = self.width() - 2 * self.margin_x
+        height = self.height() - 2 * self.margin_y
+
+        # Ensure click is inside plot area
+        if not (self.margin_x <= x_px <= self.width() - self.margin_x and
+                self.margin_y <= y_px <= self.height() - self.margin_y):
+            return None
+
+        # Convert X (log scale)
+        x_ratio = (x_px - self.margin_x) / width    # Per-unit position of click in graph, 0 -> 1
+        freq = self.start_freq * (self.end_freq / self.start_freq) ** x_ratio
+
+        # ---------------------------------------------------------------------
+        #   WRW 24-June-2025 - Quantize clicks for reproducibility
+        #   Quantizing points not related to generated points or genrated points options.
+        #   Quantize to graph grid
+
+        f0 = self.start_freq
+        n = round( math.log2( freq / f0 ) * s.Const.graphPointsPerOctave )
+        freq = f0 * 2 ** ( n/s.Const.graphPointsPerOctave )
+
+        # Convert Y (audiogram: 0 dB at top)
+        y_ratio = (y_px - self.margin_y) / height
+        hearing_loss = self.loss_db_min + (self.loss_db_max - self.loss_db_min) * y_ratio
+        loss_db = -hearing_loss
+
+        qpp10db = s.Const.graphPointsPer10dB  # Quantize to qpp10db points per 10 dB
+        loss_db = round( loss_db * (qpp10db/10) ) / ( qpp10db/10 )
+
+        return ( freq, loss_db )
+
+# -------------------------------------------------------------------------------------
+#   GraphWidget - The graph showing the audiogram, software QPainter backend.
+
+class GraphWidget( GraphBase, QWidget ):
+
+    def paintEvent(self, event):
+        s = Store()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        width = self.width()
+        height = self.height()
+
+        self.graph_width = width - 2 * self.margin_x
+        graph_height = height - 2 * self.margin_y
+
+        # --------------------------------------------------
+        # Draw background
+
+        painter.fillRect(self.rect(), QColor(s.Const.graphBG))
+
+        # --------------------------------------------------
+        # Set pen for grid lines
+
+        sub_grid_pen = QPen(QColor( '#909090' ), 1, Qt.DotLine)
+        grid_pen = QPen(QColor( '#707070' ), 1, Qt.DashLine)
+
+        # --------------------------------------------------
+        # Horizontal grid lines for Y axis
+
+        painter.setPen(grid_pen)
+
+        for loss in self.major_losses:
+            y_px = self.margin_y + ( loss - s.Const.loss_db_min) / (s.Const.loss_db_max - s.Const.loss_db_min) * graph_height
+            painter.drawLine(self.margin_x, y_px, width - self.margin_x, y_px)
+
+        # ---------------------------------------------------------------
+        #   WRW 24-June-2025 - Add lighter intermediate grid lines
+
+        painter.setPen(sub_grid_pen)
+
+        for loss in self.minor_losses:
+            y_px = self.margin_y + ( loss - s.Const.loss_db_min) / (s.Const.loss_db_max - s.Const.loss_db_min) * graph_height
+            painter.drawLine(self.margin_x, y_px, width - self.margin_x, y_px)
+
+        # ---------------------------------------------------------------
+        #   WRW 24-June-2025 - Draw lighter intermediate grid lines first
+        #       Major lines will overlay.
+
+        painter.setPen(sub_grid_pen)
+
+        for freq in self.minor_freqs:
+            x_pixel = self.map_freq(freq, self.graph_width)
+            painter.drawLine(x_pixel, self.margin_y, x_pixel, height - self.margin_y)
+
+        # --------------------------------------------------
+        #   Draw vertical grid lines
+
+        painter.setPen(grid_pen)
+
+        for freq in self.major_freqs:
+            x_pixel = self.map_freq(freq, self.graph_width)
+            painter.drawLine(x_pixel, self.margin_y, x_pixel, height - self.margin_y)
+
+        # --------------------------------------------------
+        #   Label the X and Y axes
+
+        self.paint_labels( painter, graph_height )
+
+        # --------------------------------------------------
+        # Draw axes - The solid boundary lines on X and Y axex.
+
+        axis_pen = QPen(Qt.black, 2)
+        painter.setPen(axis_pen)
+        painter.drawLine(self.margin_x, self.margin_y, self.margin_x, height - self.margin_y)  # Y axis
+        painter.drawLine(self.margin_x, height - self.margin_y, width - self.margin_x, height - self.margin_y)  # X axis
+
+        self.paint_trend( painter, graph_height )
+
+        # --------------------------------------------------
+        # Draw points
+
+        for x_val, y_val, accept in self.points:
+            dia = s.Const.pointDiameter
+            if accept:
+                color = '#0000ff'
+            else:
+                color = '#ff0000'
+
+            painter.setPen(QPen(QColor(color), dia ))
+            x_px = self.map_freq(x_val, self.graph_width)
+            y_px = self.margin_y + (y_val - self.loss_db_min) / (self.loss_db_max - self.loss_db_min) * graph_height
+            # painter.drawPoint( x_px - dia/2, y_px - dia/2)
+            rect = QRect( x_px-dia/2, y_px-dia/2, dia, dia)
+            painter.drawEllipse(rect)
+
+        # --------------------------------------------------
+        #   Draw marker, if any.
+
+        if self.marker:
+            x_val = self.marker[0]
+            y_val = self.marker[1]
+            color = self.marker[2]
+            dia = s.Const.markerDiameter
+            pen = QPen( QColor(color), s.Const.markerPen )
+            painter.setPen( pen )
+            painter.setBrush(Qt.transparent )
+            x_px = self.map_freq(x_val, self.graph_width)
+            y_px = self.margin_y + (y_val - self.loss_db_min) / (self.loss_db_max - self.loss_db_min) * graph_height
+            rect = QRect( x_px-dia/2, y_px-dia/2, dia, dia)
+            painter.drawEllipse(rect)
+
+        # if hasattr(self, "last_click"):             # Keep for debugging int() roundoff problems
+        #     x, y = self.last_click
+        #     painter.setPen(QPen(Qt.red, 1))
+        #     painter.drawLine(x - 5, y, x + 5, y)
+        #     painter.drawLine(x, y - 5, x, y + 5)
+
+# -------------------------------------------------------------------------------------
+#   WRW 3-July-2025 - Check once whether an OpenGL context can be created at all.
+#       Machines without GL, remote sessions and the offscreen platform fail here.
+
+_gl_ok = None
+
+def gl_available():
+    global _gl_ok
+
+    if _gl_ok is None:
+        context = QOpenGLContext()
+        surface = QOffscreenSurface()
+        surface.create()
+        _gl_ok = context.create() and surface.isValid() and context.makeCurrent( surface )
+        if _gl_ok:
+            context.doneCurrent()
+
+    return _gl_ok
+
+# -------------------------------------------------------------------------------------
+#   Return the OpenGL graph if asked for in Const.graph_backend or by WHAT_GRAPH_BACKEND
+#       and GL works here, otherwise the QPainter graph.
+
+def make_graph_widget( loss_db_min, loss_db_max, parent=None ):
+    s = Store()
+    backend = os.environ.get( 'WHAT_GRAPH_BACKEND', s.Const.graph_backend )
+
+    if backend == 'opengl' and gl_available():
+        from GLGraph import GLGraphWidget
+        return GLGraphWidget( loss_db_min, loss_db_max, parent )
+
+    return GraphWidget( loss_db_min, loss_db_max, parent )
+
+# -------------------------------------------------------------------------------------
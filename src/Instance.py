@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Instance.py - WRW 22-July-2025
+#   One What? per user. A second launch, e.g. another double-click on the
+#   desktop entry, hands its arguments to the running instance over a
+#   QLocalSocket and exits, before the splash, the rest of Qt or PortAudio.
+#   The running instance raises its window. what.py --new-instance skips all this.
+
+#   The server name is What_Program_Name and the user name, so users on one
+#   machine don't find each other's instance. On Unix it is a socket file in
+#   the temp directory, left behind if What? crashes. A launch that finds
+#   nobody listening removes it before listening itself.
+
+#   Two launches close together, a double double-click, can both pass the early
+#   check in what.py. So listen() asks again, and only when nobody answers does
+#   it listen or remove the name. On Unix listening takes the name over from a
+#   live instance, it must not be tried first.
+
+#   Message: one line of JSON { "args": [ ... ], "cwd": ... } from the new
+#   launch, answered with one line "ok" once received.
+
+#   Only QtCore and QtNetwork, imported by what.py before anything else of Qt.
+# -------------------------------------------------------------------------------
+
+import os
+import re
+import sys
+import json
+import getpass
+
+from PySide6.QtCore import QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# -------------------------------------------------------------------------------
+
+CONNECT_TIMEOUT_MS = 200        # Local, answers at once if anyone is listening
+REPLY_TIMEOUT_MS = 2000         # Running instance busy, e.g. playing a tone
+
+def server_name( program ):
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = str( os.getpid() )       # Nobody to find, each launch is its own instance
+    return re.sub( r'[^A-Za-z0-9_.-]', '_', f"{program}-{user}" )
+
+# -------------------------------------------------------------------------------
+#   New launch side. True if a running instance took the arguments, exit then.
+
+def forward_to_running( program, args ):
+    socket = QLocalSocket()
+    socket.connectToServer( server_name( program ))
+    if not socket.waitForConnected( CONNECT_TIMEOUT_MS ):
+        return False
+
+    if sys.platform == 'win32':         # Let the running instance take the foreground from us
+        import ctypes
+        ctypes.windll.user32.AllowSetForegroundWindow( -1 )      # ASFW_ANY
+
+    message = json.dumps( { 'args': list( args ), 'cwd': os.getcwd() } ) + '\n'
+    socket.write( message.encode( 'utf-8' ))
+    socket.waitForBytesWritten( REPLY_TIMEOUT_MS )
+    written = socket.bytesToWrite() == 0
+
+    #   Someone accepted the connection, so an instance is running. One still
+    #   starting up may not answer in time, it reads the message once it does.
+
+    ok = False
+    while socket.waitForReadyRead( REPLY_TIMEOUT_MS ):
+        if socket.canReadLine():
+            ok = bytes( socket.readLine().data() ).strip() == b'ok'
+            break
+
+    socket.disconnectFromServer()
+    return ok or written
+
+# -------------------------------------------------------------------------------
+#   Running instance side. Call listen() once the QApplication exists.
+#   Messages that arrive before set_handler() are held and delivered then,
+#   so a second launch during the splash screen isn't lost.
+
+class InstanceServer( QObject ):
+    def __init__( self, program, parent=None ):
+        super().__init__( parent )
+        self.program = program
+        self.name = server_name( program )
+        self.server = QLocalServer( self )
+        self.server.setSocketOptions( QLocalServer.UserAccessOption )
+        self.server.newConnection.connect( self.new_connection )
+        self.handler = None             # handler( args, cwd )
+        self.pending = []
+
+    #   False if a running instance answered and took args, exit then. True
+    #   otherwise, also when listening failed, this launch then runs on its own.
+
+    def listen( self, args ):
+        if forward_to_running( self.program, args ):
+            return False
+
+        if self.server.listen( self.name ):
+            return True
+        QLocalServer.removeServer( self.name )      # Nobody answered, left by a crash
+        if self.server.listen( self.name ):
+            return True
+        print( f"ERROR: Can't listen for other launches on '{self.name}': {self.server.errorString()}", file=sys.stderr )
+        return True
+
+    def close( self ):
+        self.server.close()
+
+    def set_handler( self, handler ):
+        self.handler = handler
+        pending, self.pending = self.pending, []
+        for args, cwd in pending:
+            handler( args, cwd )
+
+    # ---------------------------------------------------------------
+
+    def new_connection( self ):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect( lambda socket=socket: self.read_message( socket ))
+            socket.disconnected.connect( socket.deleteLater )
+
+    def read_message( self, socket ):
+        if not socket.canReadLine():
+            return
+        try:
+            message = json.loads( bytes( socket.readLine().data() ).decode( 'utf-8' ))
+            args = [ str( arg ) for arg in message.get( 'args', [] ) ]
+            cwd = str( message.get( 'cwd', '' ))
+        except ( ValueError, AttributeError ) as e:
+            print( f"ERROR: Bad message from another launch: {e}", file=sys.stderr )
+            socket.disconnectFromServer()
+            return
+
+        socket.write( b'ok\n' )
+        socket.flush()
+        socket.disconnectFromServer()
+
+        if self.handler:
+            self.handler( args, cwd )
+        else:
+            self.pending.append( ( args, cwd ))
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Results.py - WRW 15-July-2025
+#   Local SQLite database of saved results for history over many sessions,
+#   in Const.Confdir. One row per patient (the User name), one per saved
+#   session and ear, one per accepted threshold. Filled by do_save(), or from
+#   old .what.json files with import_sessions().
+
+#   Queries return { column: ndarray }, long form ordered by date then frequency,
+#   ready for history plots and Trend.py.
+# -------------------------------------------------------------------------------
+
+import json
+import sqlite3
+import datetime
+
+from Session import load_session
+
+# -------------------------------------------------------------------------------
+#   date is seconds since the epoch of the session timestamp, for numeric range
+#   queries and plotting. timestamp keeps the ISO text as saved.
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS patients (
+        id          INTEGER PRIMARY KEY,
+        name        TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS sessions (
+        id          INTEGER PRIMARY KEY,
+        patient_id  INTEGER NOT NULL REFERENCES patients( id ),
+        ear         TEXT NOT NULL CHECK( ear IN ( 'B', 'L', 'R' )),
+        date        REAL NOT NULL,
+        timestamp   TEXT NOT NULL,
+        software    TEXT,
+        start_freq  REAL,
+        end_freq    REAL,
+        parameters  TEXT,
+        file        TEXT UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS thresholds (
+        session_id  INTEGER NOT NULL REFERENCES sessions( id ) ON DELETE CASCADE,
+        freq        REAL NOT NULL,
+        loss_db     REAL NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS sessions_patient_ear_date ON sessions( patient_id, ear, date );
+    CREATE INDEX IF NOT EXISTS thresholds_freq ON thresholds( freq );
+    CREATE INDEX IF NOT EXISTS thresholds_session ON thresholds( session_id );
+"""
+
+SCHEMA_VERSION = 1
+
+#   Column name: dtype for the arrays returned by thresholds()
+
+COLUMNS = {
+    'patient':  'i8',
+    'session':  'i8',
+    'date':     'f8',
+    'ear':      'U1',
+    'freq':     'f8',
+    'loss_db':  'f8',
+}
+
+# -------------------------------------------------------------------------------
+
+class ResultsDB():
+    def __init__( self, path ):
+        self.path = str( path )
+        self.conn = sqlite3.connect( self.path )
+        self.conn.execute( "PRAGMA foreign_keys = ON" )
+        self.conn.execute( "PRAGMA journal_mode = WAL" )        # Readers don't block the save
+        self.conn.execute( "PRAGMA synchronous = NORMAL" )      # Safe with WAL, one sync per checkpoint
+
+        version = self.conn.execute( "PRAGMA user_version" ).fetchone()[0]
+        if version > SCHEMA_VERSION:
+            self.conn.close()
+            raise sqlite3.DatabaseError( f"{self.path}: results database version {version} is newer than this program" )
+
+        with self.conn:
+            self.conn.executescript( SCHEMA )
+            self.conn.execute( f"PRAGMA user_version = {SCHEMA_VERSION}" )
+
+    def close( self ):
+        self.conn.close()
+
+    # -------------------------------------------------------------------
+    #   session is the dict from Session.make_session() or load_session().
+    #   Patient, session and thresholds go in one transaction. Returns the session id.
+    #   WRW 27-July-2025 - The file name has the time to the second, two saves in one
+    #       second write the same file. Its row is replaced to match what is now in it.
+
+    def add_session( self, session, file=None ):
+        with self.conn:
+            if file is not None:
+                self.conn.execute( "DELETE FROM sessions WHERE file = ?", ( file, ))    # Thresholds go by cascade
+            return self.insert_session( session, file )
+
+    #   Many files in one transaction, files already present are skipped.
+    #   Returns ( added, [ ( path, error ), ... ] ).
+
+    def import_sessions( self, paths ):
+        added = 0
+        errors = []
+        with self.conn:
+            for path in paths:
+                path = str( path )
+                if self.conn.execute( "SELECT 1 FROM sessions WHERE file = ?", ( path, )).fetchone():
+                    continue
+                try:
+                    self.insert_session( load_session( path ), path )
+                    added += 1
+                except ( OSError, ValueError ) as e:
+                    errors.append( ( path, str( e )))
+        return added, errors
+
+    def insert_session( self, session, file ):
+        when = session[ 'timestamp' ]
+        if not isinstance( when, datetime.datetime ):
+            when = datetime.datetime.fromisoformat( when )
+
+        self.conn.execute( "INSERT OR IGNORE INTO patients( name ) VALUES ( ? )", ( session[ 'user' ], ))
+        patient_id = self.conn.execute( "SELECT id FROM patients WHERE name = ?", ( session[ 'user' ], )).fetchone()[0]
+
+        cursor = self.conn.execute(
+            """INSERT INTO sessions( patient_id, ear, date, timestamp, software, start_freq, end_freq, parameters, file )
+               VALUES ( ?, ?, ?, ?, ?, ?, ?, ?, ? )""",
+            ( patient_id, session[ 'ear' ], when.timestamp(), when.isoformat( timespec='seconds' ),
+              session.get( 'software' ), session[ 'start_freq' ], session[ 'end_freq' ],
+              json.dumps( session.get( 'parameters', {} )), file ))
+
+        session_id = cursor.lastrowid
+        self.conn.executemany( "INSERT INTO thresholds( session_id, freq, loss_db ) VALUES ( ?, ?, ? )",
+                               [ ( session_id, float( freq ), float( loss )) for freq, loss in session[ 'thresholds' ] ] )
+        return session_id
+
+    # -------------------------------------------------------------------
+
+    def patients( self ):
+        return { id: name for id, name in self.conn.execute( "SELECT id, name FROM patients ORDER BY name" ) }
+
+    def patient_id( self, name ):
+        row = self.conn.execute( "SELECT id FROM patients WHERE name = ?", ( name, )).fetchone()
+        return row[0] if row else None
+
+    #   Accepted thresholds as { column: ndarray }, see COLUMNS. All arguments optional,
+    #   user is a name or list of names, dates are datetimes or epoch seconds.
+    #   Only sessions with at least one threshold appear.
+
+    def thresholds( self, user=None, ear=None, freq=None, since=None, until=None ):
+        where = []
+        args = []
+
+        if user is not None:
+            names = [ user ] if isinstance( user, str ) else list( user )
+            where.append( f"p.name IN ( {', '.join( '?' * len( names ))} )" )
+            args.extend( names )
+        if ear is not None:
+            where.append( "s.ear = ?" )
+            args.append( ear )
+        if freq is not None:
+            where.append( "t.freq = ?" )
+            args.append( float( freq ))
+        if since is not None:
+            where.append( "s.date >= ?" )
+            args.append( since.timestamp() if isinstance( since, datetime.datetime ) else since )
+        if until is not None:
+            where.append( "s.date < ?" )
+            args.append( until.timestamp() if isinstance( until, datetime.datetime ) else until )
+
+        sql = f"""SELECT s.patient_id, s.id, s.date, s.ear, t.freq, t.loss_db
+                  FROM thresholds t
+                  JOIN sessions s ON s.id = t.session_id
+                  JOIN patients p ON p.id = s.patient_id
+                  {'WHERE ' + ' AND '.join( where ) if where else ''}
+                  ORDER BY s.patient_id, s.date, s.id, t.freq"""
+
+        return self.to_columns( self.conn.execute( sql, args ).fetchall() )
+
+    #   One row per session: { 'patient', 'session', 'date', 'ear' } as ndarrays.
+
+    def sessions( self, user=None, ear=None ):
+        where = []
+        args = []
+        if user is not None:
+            where.append( "p.name = ?" )
+            args.append( user )
+        if ear is not None:
+            where.append( "s.ear = ?" )
+            args.append( ear )
+
+        sql = f"""SELECT s.patient_id, s.id, s.date, s.ear
+                  FROM sessions s JOIN patients p ON p.id = s.patient_id
+                  {'WHERE ' + ' AND '.join( where ) if where else ''}
+                  ORDER BY s.patient_id, s.date, s.id"""
+
+        return self.to_columns( self.conn.execute( sql, args ).fetchall(), ( 'patient', 'session', 'date', 'ear' ))
+
+    # -------------------------------------------------------------------
+    #   Rows of tuples to columns through one structured array, no per-value Python work.
+
+    def to_columns( self, rows, names=tuple( COLUMNS )):
+        import numpy as np
+        dtype = [ ( name, COLUMNS[ name ] ) for name in names ]
+        table = np.array( rows, dtype=dtype )
+        return { name: np.ascontiguousarray( table[ name ] ) for name in names }
+
+# -------------------------------------------------------------------------------
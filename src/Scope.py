@@ -5,16 +5,22 @@
 
 import sys
 import numpy as np
+from collections import deque
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPainter # , QTransform, QFontMetrics, QColor, QFont
 from PySide6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QFrame,
-    QSlider, QLabel, QDoubleSpinBox, QPushButton, QSizePolicy
+    QSlider, QLabel, QDoubleSpinBox, QPushButton, QSizePolicy, QCheckBox,
+    QComboBox, QStackedWidget
 )
 
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from Store import Store
+from Waveform import WaveformView
+from Spectrum import SpectrumView, SpectrogramView, spectrum, spectrogram, distortion, format_distortion
+from Audio import ScopeRing
+
+#   WRW 5-July-2025 - matplotlib now imported only for the 'matplotlib' engine, see make_mpl_canvas().
 
 # -------------------------------------------------------------------------------
 
@@ -39,11 +45,14 @@ class VerticalLabel(QLabel):
 
 # -------------------------------------------------------------------------
 
+#   WRW 5-July-2025 - engine: 'native' draws with Waveform.WaveformView, 'matplotlib' with a Figure.
+
 class ScopeDialog(QDialog):
-    def __init__(self, on_closed =None ):
+    def __init__(self, on_closed =None, engine='native' ):
         super().__init__()
         self.setWindowTitle("Waveform Viewer")
         self.on_closed = on_closed              # WRW 28-June-2025 - Added
+        self.engine = engine
         self.signal = np.zeros(44100)           # Placeholder for signal data
         self.siglen = len( self.signal )
         self.start = 0
@@ -51,6 +60,46 @@ class ScopeDialog(QDialog):
         self.sample_rate = 44100
         self.scale = 1.0
 
+        #   WRW 6-July-2025 - Slider changes only set state and start this timer. A zero
+        #       interval fires once the pending events are handled so a burst of valueChanged
+        #       from any of the three sliders gives one redraw.
+
+        self.plot_timer = QTimer( self )
+        self.plot_timer.setSingleShot( True )
+        self.plot_timer.setInterval( 0 )
+        self.plot_timer.timeout.connect( self.update_plot )
+
+        #   WRW 7-July-2025 - Live mode. TonePlayer copies what it outputs into self.ring,
+        #       live_timer polls it while the dialog is showing. Hidden or not live: no
+        #       ring is handed out and the timer is stopped.
+
+        s = Store()
+        self.live = False
+        self.ring = None
+        self.live_seconds = s.Const.scope_live_seconds
+        self.last_poll = None
+        self.live_timer = QTimer( self )
+        self.live_timer.setInterval( int( 1000 / s.Const.scope_live_fps ))
+        self.live_timer.timeout.connect( self.poll_live )
+
+        #   WRW 8-July-2025 - Spectrum and spectrogram of the Offset/Length selection. The
+        #       spectrogram covers the whole signal and is computed once per signal, the
+        #       spectrum once per selection. Only the view showing is computed.
+
+        self.mode = 'Waveform'
+        self.spectrum_key = None
+        self.stft_signal = None
+
+        #   WRW 9-July-2025 - Last stimuli played, newest first, as ( signal, ( freq, gain_db, ear )).
+        #       Signals are read-only views of the played buffers, not copies. Bounded by
+        #       count and by bytes so memory doesn't grow over a session.
+
+        self.history = deque()
+        self.history_bytes = 0
+        self.history_count = 0
+        self.history_size = s.Const.scope_history_size
+        self.history_max_bytes = s.Const.scope_history_mb * 1024 * 1024
+
         # ------------------------------------------------------------
         # Layout setup
 
@@ -79,17 +128,24 @@ class ScopeDialog(QDialog):
         plot_layout.addWidget(self.scale_slider)
 
         # Plotting
-        self.figure = Figure()
-        self.figure.subplots_adjust(left=0.1, right=0.98, top=0.95, bottom=0.2)
+        if self.engine == 'matplotlib':
+            self.view = self.make_mpl_canvas()
+        else:
+            self.view = WaveformView()
 
-        # self.figure.tight_layout()
-        # self.figure = Figure(constrained_layout=True)
-        self.canvas = FigureCanvas(self.figure)
-        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        self.ax = self.figure.add_subplot(111)
-        # self.ax.margins(x=0, y=0)  # Remove auto-margins
+        self.spectrum_view = SpectrumView()
+        self.spectrogram_view = SpectrogramView()
+
+        self.stack = QStackedWidget()
+        self.stack.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.modes = { 'Waveform': self.view, 'Spectrum': self.spectrum_view, 'Spectrogram': self.spectrogram_view }
+        for widget in self.modes.values():
+            self.stack.addWidget( widget )
 
-        plot_layout.addWidget(self.canvas)
+        plot_layout.addWidget(self.stack)
+
+        self.readout = QLabel()
+        self.readout.setVisible( False )
 
         # -------------------------------------------
 
@@ -125,11 +181,27 @@ class ScopeDialog(QDialog):
         vline.setStyleSheet("background-color: #a0a0a0;")  # Line color
         controls.addWidget(vline)
 
+        self.history_combo = QComboBox()
+        self.history_combo.setMinimumContentsLength( 24 )
+        self.history_combo.setPlaceholderText( "History" )
+        self.history_combo.activated.connect( self.show_history )
+        controls.addWidget( self.history_combo )
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems( list( self.modes ))
+        self.mode_combo.currentTextChanged.connect( self.set_mode )
+        controls.addWidget( self.mode_combo )
+
+        self.live_check = QCheckBox( "Live" )
+        self.live_check.toggled.connect( self.set_live )
+        controls.addWidget( self.live_check )
+
         close = QPushButton( "Close" )
         controls.addWidget( close )
         close.clicked.connect( self.close )
 
         layout.addLayout(plot_layout)
+        layout.addWidget(self.readout)
         layout.addLayout(controls)
 
         # layout.setAlignment(Qt.AlignLeft)
@@ -138,28 +210,166 @@ class ScopeDialog(QDialog):
 
     # ------------------------------------------------------------------------
 
+    def make_mpl_canvas(self):
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.figure = Figure()
+        self.figure.subplots_adjust(left=0.1, right=0.98, top=0.95, bottom=0.2)
+
+        # self.figure.tight_layout()
+        # self.figure = Figure(constrained_layout=True)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.ax = self.figure.add_subplot(111)
+        # self.ax.margins(x=0, y=0)  # Remove auto-margins
+
+        #   WRW 6-July-2025 - Axes built once. The line is animated so a full draw leaves it out
+        #       of the background copied in mpl_drawn(). When the limits haven't changed
+        #       update_mpl_plot() just restores that background and blits the line over it.
+
+        self.ax.set_xlabel("Time (sec)" )
+        self.ax.set_ylabel("Amplitude")
+        self.ax.grid(True)
+        self.line, = self.ax.plot( [], [], linewidth=1.0, animated=True )
+        self.playhead_line = self.ax.axvline( 0, color='#d00000', linewidth=2, animated=True, visible=False )
+
+        self.background = None
+        self.limits = None
+        self.canvas.mpl_connect( 'draw_event', self.mpl_drawn )     # Also follows resize
+        return self.canvas
+
+    def mpl_drawn(self, event):
+        self.background = self.canvas.copy_from_bbox( self.ax.bbox )
+        self.ax.draw_artist( self.line )
+        self.ax.draw_artist( self.playhead_line )
+
+    # ------------------------------------------------------------------------
+
     def set_scale(self, value):
         self.scale = .1**((value*10)/20)
-        self.update_plot()
+        self.plot_timer.start()
 
     def set_start(self, value):
         self.start = value
-        self.update_plot()
+        self.plot_timer.start()
 
     def set_length( self, value):
         self.length = value
-        self.update_plot()
+        self.plot_timer.start()
+
+    def set_mode( self, mode ):
+        self.mode = mode
+        self.stack.setCurrentWidget( self.modes[ mode ] )
+        self.readout.setVisible( mode != 'Waveform' )
+        self.spectrum_key = None
+        self.last_poll = None
+        self.plot_timer.start()
+
+    # ------------------------------------------------------------------------
+    #   WRW 7-July-2025 - Live mode. The Length slider sets the window as a fraction of
+    #       the ring, Offset doesn't apply. The matplotlib engine shows time within the
+    #       window so its limits stay fixed and each poll is a blit.
+
+    def set_live( self, live ):
+        self.live = live
+        self.slider.setEnabled( not live )
+        self.history_combo.setEnabled( not live )
+        if live and self.ring is None:
+            self.ring = ScopeRing( int( self.live_seconds * self.sample_rate ), self.sample_rate )
+        self.last_poll = None
+
+        if live and self.isVisible():
+            self.live_timer.start()
+        else:
+            self.live_timer.stop()
+            self.show_signal( self.signal )         # Back to the last whole stimulus
+
+    def live_ring( self ):
+        return self.ring if self.live and self.isVisible() else None
+
+    def showEvent( self, event ):
+        if self.live:
+            self.live_timer.start()
+        super().showEvent( event )
+
+    def hideEvent( self, event ):
+        self.live_timer.stop()
+        super().hideEvent( event )
+
+    def poll_live( self ):
+        n = int( max( .001 * self.sample_rate, self.ring.size * self.length / 1000 ))
+        playhead = self.ring.playhead()
+        poll = ( self.ring.written, playhead, n, self.scale )
+        if poll == self.last_poll:
+            return                                  # Nothing new, no repaint
+        self.last_poll = poll
+
+        end, window = self.ring.latest( n )
+        playhead -= end - n
+
+        if self.mode != 'Waveform':
+            self.spectrum_key = self.stft_signal = None         # New window every poll
+            self.update_spectral( window, 0, n, ( end - n ) / self.sample_rate )
+
+        elif self.engine == 'matplotlib':
+            self.update_mpl_plot( 0, n, window, playhead )
+        else:
+            self.view.set_signal( window, self.sample_rate, ( end - n ) / self.sample_rate, playhead )
+            self.view.set_view( 0, n, self.scale * 1.2 )
+
+    # ------------------------------------------------------------------------
+
+    #   WRW 9-July-2025 - meta is ( freq, gain_db, ear ), signal goes into history when given.
+    #       Live mode draws from the ring, stimulus only recorded.
 
-    def update_signal(self, signal):
+    def update_signal(self, signal, meta=None):
+        if meta is not None:
+            signal = self.add_history( signal, meta )
+        if not self.live:
+            self.show_signal( signal )
+
+    def show_signal(self, signal):
         self.signal = signal
         self.siglen = len( signal )
+        if self.engine != 'matplotlib':
+            self.view.set_signal( signal, self.sample_rate )
+        self.spectrum_key = None
+        self.stft_signal = None
         self.update_plot()
 
     # -----------------------------------------------------
 
+    def add_history( self, signal, meta ):
+        view = signal.view()
+        view.flags.writeable = False
+
+        self.history_count += 1
+        self.history.appendleft( ( view, meta, self.history_count ))
+        self.history_bytes += view.nbytes
+
+        while len( self.history ) > 1 and ( len( self.history ) > self.history_size or self.history_bytes > self.history_max_bytes ):
+            old = self.history.pop()
+            self.history_bytes -= old[0].nbytes
+
+        self.history_combo.clear()
+        for _, ( freq, gain_db, ear ), count in self.history:
+            self.history_combo.addItem( f"#{count}: {int(freq)} Hz, {gain_db:.1f} dB, {ear}" )
+        self.history_combo.setCurrentIndex( 0 )
+        return view
+
+    def show_history( self, index ):
+        if 0 <= index < len( self.history ):
+            self.show_signal( self.history[ index ][0] )
+
+    # -----------------------------------------------------
+
     def update_plot(self):
 
-        self.ax.clear()
+        self.plot_timer.stop()              # Direct call, e.g. from update_signal(), covers any pending one
+        if self.live:
+            self.last_poll = None           # Slider moved, next poll redraws
+            return
 
         length = self.siglen * self.length/1000
         length = max( .001 * self.sample_rate, length )          # Show min of .001 second of signal
@@ -171,18 +381,56 @@ class ScopeDialog(QDialog):
 
         end = start + length
         end = min( end, self.siglen )
-        time_axis = np.arange( start, end ) / self.sample_rate
-
-        segment = self.signal[start:end]            
 
-        self.ax.plot(time_axis, segment, linewidth=1.0 )
-        self.ax.set_xlabel("Time (sec)" )
-        self.ax.set_ylabel("Amplitude")
+        if self.mode != 'Waveform':
+            self.update_spectral( self.signal, start, end )
+        elif self.engine == 'matplotlib':
+            self.update_mpl_plot( start, end )
+        else:
+            self.view.set_view( start, end, self.scale * 1.2 )
 
-        self.ax.set_ylim( -self.scale * 1.2, self.scale * 1.2)
+    # -----------------------------------------------------
+    #   Spectrum of signal[ start:end ], redone only when the selection changes.
+    #   Live mode passes a new window each poll, t0 is its start time.
+
+    def update_spectral( self, signal, start, end, t0=0.0 ):
+        key = ( id( signal ), start, end )
+        if key != self.spectrum_key:
+            self.spectrum_key = key
+            freqs, mag = spectrum( signal[ start:end ], self.sample_rate )
+            self.readout.setText( format_distortion( distortion( freqs, mag )))
+            if self.mode == 'Spectrum':
+                self.spectrum_view.set_spectrum( freqs, mag, self.sample_rate )
+
+        if self.mode == 'Spectrogram':
+            if self.stft_signal is not signal:
+                self.stft_signal = signal
+                self.spectrogram_view.set_frames( spectrogram( signal, self.sample_rate ), self.sample_rate, t0 )
+            self.spectrogram_view.set_view( start, end )
+
+    def update_mpl_plot(self, start, end, signal=None, playhead=None):
 
-        self.ax.grid(True)
-        self.canvas.draw()
+        time_axis = np.arange( start, end ) / self.sample_rate
+        segment = ( self.signal if signal is None else signal )[start:end]
+        self.line.set_data( time_axis, segment )
+        self.playhead_line.set_visible( playhead is not None )
+        if playhead is not None:
+            self.playhead_line.set_xdata( [ playhead / self.sample_rate ] * 2 )
+
+        limits = ( time_axis[0], time_axis[-1] if end - start > 1 else time_axis[0] + 1 / self.sample_rate,
+                   -self.scale * 1.2, self.scale * 1.2 )
+
+        if limits != self.limits or self.background is None:
+            self.limits = limits
+            self.ax.set_xlim( limits[0], limits[1] )
+            self.ax.set_ylim( limits[2], limits[3] )
+            self.canvas.draw()              # Ticks changed, new background via mpl_drawn()
+
+        else:
+            self.canvas.restore_region( self.background )
+            self.ax.draw_artist( self.line )
+            self.ax.draw_artist( self.playhead_line )
+            self.canvas.blit( self.ax.bbox )
 
     def closeEvent(self, event):                    # Override closeEvent()
         if self.on_closed:
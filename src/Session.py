@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Session.py - WRW 13-July-2025
+#   Saved session files, *.what.json, and the audiogram title and file name
+#   shared by do_save() and what_render.py.
+
+#   Format, version 2:
+#       format:         'what-session'
+#       version:        2
+#       software:       program version that wrote it
+#       user:           name as entered
+#       ear:            'B', 'L' or 'R'
+#       timestamp:      ISO 8601 local time of the save
+#       start_freq, end_freq:   graph range in Hz
+#       thresholds:     [ [ freq, loss_db ], ... ] accepted, sorted by frequency
+#       parameters:     { name: value } test parameters, see MainWindow.get_parameters()
+#       presentations:  { column: [ ... ] } every tone played, in order, see PresentationLog
+
+#   Version 1 had no software, parameters or presentations.
+
+#   WRW 14-July-2025 - Optional .what.npz beside the .what.json with the
+#       presentations as numpy columns and the rest of the session as JSON
+#       text in 'session'. Uncompressed and no pickle so np.load() is quick and safe.
+# -------------------------------------------------------------------------------
+
+import io
+import os
+import json
+import math
+import time
+import datetime
+
+# -------------------------------------------------------------------------------
+
+SESSION_FORMAT = 'what-session'
+SESSION_VERSION = 2
+SESSION_SUFFIX = '.what.json'
+NPZ_SUFFIX = '.what.npz'
+
+EAR_NAMES = { 'B': "Both ears", 'L': "Left ear", 'R': "Right ear" }
+
+# -------------------------------------------------------------------------------
+
+def audiogram_title( user, smode, when ):
+    title_timestamp = when.strftime('%a, %d-%b-%Y, %H:%M:%S')
+    return f"Audiogram for: {user}, {EAR_NAMES[ smode ]}, {title_timestamp}"
+
+def audiogram_filename( user, smode, when, ext ):
+    file_timestamp = when.strftime('%d-%b-%Y_%H-%M-%S')
+    return f"Audiogram-{user}-{smode}-{file_timestamp}.{ext}"
+
+# -------------------------------------------------------------------------------
+#   Every tone presentation of a test, kept as columns so saving is a dump of lists.
+#   The response starts as RESPONSE_NONE and is set by Accept or Reject on the
+#   latest presentation of that tone. Back withdraws it to RESPONSE_NONE again.
+
+RESPONSE_NONE = -1
+RESPONSE_REJECT = 0
+RESPONSE_ACCEPT = 1
+
+class PresentationLog():
+    COLUMNS = ( 'freq', 'gain_db', 'response', 'time', 'ear' )
+
+    def __init__( self ):
+        self.freq = []
+        self.gain_db = []
+        self.response = []
+        self.time = []              # Seconds since the epoch
+        self.ear = []
+
+    def __len__( self ):
+        return len( self.freq )
+
+    def add( self, freq, gain_db, ear ):
+        self.freq.append( float( freq ))
+        self.gain_db.append( float( gain_db ))
+        self.response.append( RESPONSE_NONE )
+        self.time.append( round( time.time(), 3 ))
+        self.ear.append( ear )
+
+    #   gain_db may come back from a loss, compare loosely.
+
+    def respond( self, freq, gain_db, response ):
+        for i in range( len( self.freq ) -1, -1, -1 ):
+            if self.freq[ i ] == freq and math.isclose( self.gain_db[ i ], gain_db, abs_tol=1e-6 ):
+                self.response[ i ] = response
+                return True
+        return False
+
+    def columns( self ):
+        return { name: list( getattr( self, name )) for name in self.COLUMNS }
+
+# -------------------------------------------------------------------------------
+
+def make_session( user, smode, when, software, parameters, thresholds, presentations ):
+    return {
+        'format':       SESSION_FORMAT,
+        'version':      SESSION_VERSION,
+        'software':     software,
+        'user':         user,
+        'ear':          smode,
+        'timestamp':    when.isoformat( timespec='seconds' ),
+        'start_freq':   parameters[ 'start_freq' ],
+        'end_freq':     parameters[ 'end_freq' ],
+        'thresholds':   [ [ freq, loss ] for freq, loss in thresholds ],
+        'parameters':   dict( parameters ),
+        'presentations': presentations.columns(),
+    }
+
+#   The whole file is built in memory and written with one write() to a
+#   temporary name, then renamed over the target.
+
+def write_file( path, data ):
+    tmp = f"{path}.part"
+    with open( tmp, 'wb' ) as fp:
+        fp.write( data )
+    os.replace( tmp, path )
+
+def column_arrays( columns ):
+    import numpy as np
+    return {
+        'freq':         np.array( columns[ 'freq' ], dtype=np.float64 ),
+        'gain_db':      np.array( columns[ 'gain_db' ], dtype=np.float64 ),
+        'response':     np.array( columns[ 'response' ], dtype=np.int8 ),
+        'time':         np.array( columns[ 'time' ], dtype=np.float64 ),
+        'ear':          np.array( columns[ 'ear' ], dtype='U1' ),
+    }
+
+def npz_bytes( session ):
+    import numpy as np
+
+    rest = { key: value for key, value in session.items() if key not in ( 'presentations', 'thresholds' ) }
+
+    buf = io.BytesIO()
+    np.savez( buf, **column_arrays( session[ 'presentations' ] ),
+        thresholds =    np.array( session[ 'thresholds' ], dtype=np.float64 ).reshape( -1, 2 ),
+        session =       np.array( json.dumps( rest )),
+    )
+    return buf.getvalue()
+
+#   path ends with SESSION_SUFFIX, the .npz goes beside it. Raises OSError.
+
+def save_session( path, session, npz=False ):
+    write_file( path, json.dumps( session, separators=( ',', ':' )).encode( 'utf-8' ))
+    if npz:
+        write_file( path[ : -len( SESSION_SUFFIX ) ] + NPZ_SUFFIX, npz_bytes( session ))
+
+# -------------------------------------------------------------------------------
+#   Returns the session dict with timestamp as a datetime and thresholds as
+#   ( freq, loss_db ) tuples. Raises ValueError for anything not a session file.
+
+def load_session( path ):
+    with open( path, 'rb' ) as fp:
+        session = json.load( fp )
+
+    if not isinstance( session, dict ) or session.get( 'format' ) != SESSION_FORMAT:
+        raise ValueError( f"{path}: not a {SESSION_FORMAT} file" )
+
+    if session.get( 'version', 0 ) > SESSION_VERSION:
+        raise ValueError( f"{path}: session version {session['version']} is newer than this program" )
+
+    missing = [ key for key in ( 'user', 'ear', 'timestamp', 'start_freq', 'end_freq', 'thresholds' ) if key not in session ]
+    if missing:
+        raise ValueError( f"{path}: bad session file, missing {', '.join( missing )}" )
+
+    if session[ 'ear' ] not in EAR_NAMES:
+        raise ValueError( f"{path}: bad session file, ear '{session['ear']}'" )
+
+    try:
+        session[ 'timestamp' ] = datetime.datetime.fromisoformat( session[ 'timestamp' ] )
+        session[ 'thresholds' ] = [ ( freq, loss ) for freq, loss in session[ 'thresholds' ] ]
+    except ( TypeError, ValueError ) as e:
+        raise ValueError( f"{path}: bad session file, {e}" )
+
+    return session
+
+# -------------------------------------------------------------------------------
+#   Presentations as { column: ndarray } from a .what.json or .what.npz.
+#   Empty columns for a version 1 session.
+
+def load_presentations( path ):
+    import numpy as np
+
+    if str( path ).endswith( NPZ_SUFFIX ):
+        with np.load( path ) as npz:
+            return { name: npz[ name ] for name in PresentationLog.COLUMNS }
+
+    return column_arrays( load_session( path ).get( 'presentations' ) or PresentationLog().columns() )
+
+# -------------------------------------------------------------------------------
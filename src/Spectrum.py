@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Spectrum.py - WRW 8-July-2025
+#   Spectrum and spectrogram views for the scope, to check that the envelope
+#   ramps from set_envelope( adsr=... ) don't splatter energy into neighboring
+#   frequencies. Both views draw the Offset/Length selection of the stimulus.
+
+#   Hann windows are cached by length. The spectrogram of the whole signal is
+#   computed once, frames taken as strided views with sliding_window_view(), and
+#   the slider selection only slices frames out of it. The spectrum is redone
+#   for each new selection, one rfft.
+# -------------------------------------------------------------------------------
+
+import math
+import functools
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from PySide6.QtCore import Qt, QPointF, QRectF
+from PySide6.QtGui import QPainter, QPen, QColor, QImage, QPolygonF
+from PySide6.QtWidgets import QWidget, QSizePolicy
+
+from Waveform import nice_ticks
+
+# -------------------------------------------------------------------------------
+
+FLOOR_DB = -140.0                       # Keeps log10 finite for silence
+NFFT = 1024                             # Spectrogram frame, 43 Hz bins at 44.1 kHz
+HOP = 256
+HARMONICS = 10                          # Highest harmonic counted in THD
+LOBE = 3                                # Bins each side of a peak counted as the peak, Hann main lobe is +-2
+HANN_ENBW = 1.5                         # Equivalent noise bandwidth in bins, power summed over a lobe is this much high
+
+@functools.lru_cache( maxsize=16 )
+def hann( n ):
+    w = np.hanning( n ).astype( np.float32 )
+    w.flags.writeable = False
+    return w
+
+def to_db( mag ):
+    return 20 * np.log10( np.maximum( mag, 10 ** ( FLOOR_DB / 20 )))
+
+# -------------------------------------------------------------------------------
+#   Magnitude spectrum scaled so a full scale sine reads 0 dB.
+
+def spectrum( segment, fs ):
+    n = len( segment )
+    w = hann( n )
+    mag = np.abs( np.fft.rfft( segment * w )) / ( w.sum() / 2 )
+    return np.fft.rfftfreq( n, 1 / fs ), mag
+
+#   Frames x bins in dB. Frame i starts at sample i * hop.
+
+def spectrogram( signal, fs, nfft=NFFT, hop=HOP ):
+    if len( signal ) < nfft:
+        return np.zeros( ( 0, nfft // 2 + 1 ), dtype=np.float32 )
+    w = hann( nfft )
+    frames = sliding_window_view( np.asarray( signal, dtype=np.float32 ), nfft )[ ::hop ]
+    mag = np.abs( np.fft.rfft( frames * w, axis=1 )) / ( w.sum() / 2 )
+    return to_db( mag ).astype( np.float32 )
+
+# -------------------------------------------------------------------------------
+#   Fundamental, THD and splatter from a magnitude spectrum.
+#   Splatter is the power that is neither the fundamental nor its harmonics,
+#   relative to the fundamental. It is what the envelope ramps add.
+#   Returns None for silence.
+
+def distortion( freqs, mag ):
+    power = mag.astype( np.float64 ) ** 2
+    if len( power ) < 2 * LOBE + 2 or power[ 1: ].max() <= 0:
+        return None
+
+    def band( center ):
+        lo = max( center - LOBE, 0 )
+        return lo, min( center + LOBE + 1, len( power ))
+
+    peak = int( np.argmax( power[ 1: ] )) + 1               # Skip DC
+    lo, hi = band( peak )
+    fund = power[ lo:hi ].sum()
+    f0 = ( power[ lo:hi ] * freqs[ lo:hi ] ).sum() / fund   # Power weighted, finer than a bin
+
+    covered = np.zeros( len( power ), dtype=bool )
+    covered[ lo:hi ] = True
+    harm = 0.0
+    bin_hz = freqs[1] - freqs[0]
+    for k in range( 2, HARMONICS + 1 ):
+        center = int( round( k * f0 / bin_hz ))
+        if center >= len( power ):
+            break
+        lo, hi = band( center )
+        harm += power[ lo:hi ][ ~covered[ lo:hi ]].sum()
+        covered[ lo:hi ] = True
+
+    splatter = power[ 1: ][ ~covered[ 1: ]].sum()
+    return {
+        'freq':     f0,
+        'level_db': 10 * math.log10( fund / HANN_ENBW ),
+        'thd':      math.sqrt( harm / fund ),
+        'splatter_db': 10 * math.log10( max( splatter / fund, 1e-30 )),
+    }
+
+def format_distortion( d ):
+    if d is None:
+        return "No signal"
+    thd_db = 20 * math.log10( max( d['thd'], 1e-15 ))
+    return ( f"{d['freq']:.0f} Hz at {d['level_db']:.1f} dBFS, "
+             f"THD {d['thd']*100:.3f}% ({thd_db:.0f} dB), splatter {d['splatter_db']:.0f} dB" )
+
+# -------------------------------------------------------------------------------
+#   Shared frame, log-frequency axis and labels for both views.
+
+class SpectralAxes( QWidget ):
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.setSizePolicy( QSizePolicy.Expanding, QSizePolicy.Preferred )
+        self.setMinimumHeight( 150 )
+        self.sample_rate = 44100
+        self.fmin = 20.0
+
+        self.margin_left = 60
+        self.margin_right = 10
+        self.margin_top = 10
+        self.margin_bottom = 40
+
+    def plot_rect( self ):
+        return QRectF( self.margin_left, self.margin_top,
+                       self.width() - self.margin_left - self.margin_right,
+                       self.height() - self.margin_top - self.margin_bottom )
+
+    #   Position 0..1 along a log-frequency axis and back.
+
+    def freq_pos( self, f ):
+        fmax = self.sample_rate / 2
+        return ( np.log10( np.maximum( f, self.fmin )) - math.log10( self.fmin )) / math.log10( fmax / self.fmin )
+
+    def pos_freq( self, pos ):
+        fmax = self.sample_rate / 2
+        return self.fmin * ( fmax / self.fmin ) ** pos
+
+    def freq_ticks( self ):
+        fmax = self.sample_rate / 2
+        ticks = [ m * 10 ** e for e in range( 1, 6 ) for m in ( 1, 2, 5 ) ]
+        return [ f for f in ticks if self.fmin <= f <= fmax ]
+
+    @staticmethod
+    def freq_label( f ):
+        return f"{f/1000:g}k" if f >= 1000 else f"{f:g}"
+
+    def draw_label( self, painter, txt, rect, vertical=False ):
+        metrics = painter.fontMetrics()
+        if vertical:
+            painter.save()
+            painter.translate( metrics.height(), rect.top() + ( rect.height() + metrics.horizontalAdvance( txt )) / 2 )
+            painter.rotate( -90 )
+            painter.drawText( 0, 0, txt )
+            painter.restore()
+        else:
+            painter.drawText( QPointF( rect.left() + ( rect.width() - metrics.horizontalAdvance( txt )) / 2,
+                                       rect.bottom() + 2 * metrics.height() + 2 ), txt )
+
+# -------------------------------------------------------------------------------
+
+class SpectrumView( SpectralAxes ):
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.freqs = None
+        self.mag_db = None
+        self.db_min = -120.0
+        self.db_max = 0.0
+
+    def set_spectrum( self, freqs, mag, sample_rate ):
+        self.freqs = freqs
+        self.mag_db = to_db( mag )
+        self.sample_rate = sample_rate
+        self.update()
+
+    def paintEvent( self, event ):
+        painter = QPainter( self )
+        painter.fillRect( self.rect(), Qt.white )
+        r = self.plot_rect()
+        if r.width() < 2 or r.height() < 2:
+            return
+
+        def x_px( f ):
+            return r.left() + self.freq_pos( f ) * r.width()
+
+        def y_px( db ):
+            return r.top() + ( self.db_max - db ) / ( self.db_max - self.db_min ) * r.height()
+
+        metrics = painter.fontMetrics()
+        dbticks = nice_ticks( self.db_min, self.db_max, max( 2, int( r.height() ) // 40 ))
+
+        painter.setPen( QPen( QColor( '#d0d0d0' ), 1 ))
+        for f in self.freq_ticks():
+            painter.drawLine( QPointF( x_px( f ), r.top() ), QPointF( x_px( f ), r.bottom() ))
+        for db in dbticks:
+            painter.drawLine( QPointF( r.left(), y_px( db )), QPointF( r.right(), y_px( db )))
+
+        painter.setPen( Qt.black )
+        for f in self.freq_ticks():
+            txt = self.freq_label( f )
+            painter.drawText( QPointF( x_px( f ) - metrics.horizontalAdvance( txt ) / 2, r.bottom() + metrics.height() ), txt )
+        for db in dbticks:
+            txt = f"{db:g}"
+            painter.drawText( QPointF( r.left() - 6 - metrics.horizontalAdvance( txt ), y_px( db ) + metrics.ascent() / 2 - 1 ), txt )
+
+        self.draw_label( painter, "Frequency (Hz)", r )
+        self.draw_label( painter, "Level (dBFS)", r, vertical=True )
+        painter.drawRect( r )
+
+        if self.freqs is None or len( self.freqs ) < 2:
+            return
+
+        #   Max per pixel column, many bins share a column at the top of a log axis.
+
+        painter.setClipRect( r )
+        painter.setRenderHint( QPainter.Antialiasing )
+        painter.setPen( QPen( QColor( '#1f77b4' ), 1 ))
+
+        cols = int( r.width() )
+        col = np.clip(( self.freq_pos( self.freqs[1:] ) * cols ).astype( np.intp ), 0, cols - 1 )
+        edges = np.flatnonzero( np.diff( col, prepend=-1 ))
+        peak = np.maximum.reduceat( self.mag_db[1:], edges )
+        xs = r.left() + ( col[ edges ] + .5 )
+        ys = y_px( peak )
+        painter.drawPolyline( QPolygonF( [ QPointF( x, y ) for x, y in zip( xs, ys ) ] ))
+
+# -------------------------------------------------------------------------------
+#   Time across, log frequency up. Colors from a small viridis-like palette.
+
+PALETTE_ANCHORS = np.array( [
+    [ 0x44, 0x01, 0x54 ], [ 0x3b, 0x52, 0x8b ], [ 0x21, 0x90, 0x8d ],
+    [ 0x5d, 0xc8, 0x63 ], [ 0xfd, 0xe7, 0x25 ] ], dtype=np.float64 )
+
+def make_palette( size=256 ):
+    x = np.linspace( 0, len( PALETTE_ANCHORS ) - 1, size )
+    rgb = [ np.interp( x, np.arange( len( PALETTE_ANCHORS )), PALETTE_ANCHORS[ :, c ] ) for c in range( 3 ) ]
+    r, g, b = ( c.astype( np.uint32 ) for c in rgb )
+    return 0xff000000 | ( r << 16 ) | ( g << 8 ) | b
+
+class SpectrogramView( SpectralAxes ):
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.frames = None              # frames x bins, dB
+        self.first = 0                  # Frames shown, [ first, last )
+        self.last = 0
+        self.t0 = 0.0                   # Seconds at the start of frame 0
+        self.db_min = -120.0
+        self.db_max = 0.0
+        self.palette = make_palette()
+        self.image = None
+
+    def set_frames( self, frames, sample_rate, t0=0.0 ):
+        self.frames = frames
+        self.sample_rate = sample_rate
+        self.t0 = t0
+        self.first, self.last = 0, len( frames )
+        self.image = None
+        self.update()
+
+    #   Slider moved: select frames overlapping samples [ start, end ).
+
+    def set_view( self, start, end ):
+        if self.frames is None:
+            return
+        first = min( max( 0, ( start - NFFT // 2 ) // HOP ), len( self.frames ))
+        last = min( max( first + 1, -( -( end - NFFT // 2 ) // HOP )), len( self.frames ))
+        if ( first, last ) != ( self.first, self.last ):
+            self.first, self.last = first, last
+            self.image = None
+            self.update()
+
+    #   One image pixel row per plot pixel row, mapped onto bins through the log axis.
+
+    def build_image( self, width, height ):
+        frames = self.frames[ self.first:self.last ]
+        nbins = frames.shape[1]
+
+        cols = np.minimum(( np.arange( width ) * len( frames ) ) // width, len( frames ) - 1 )
+        freqs = self.pos_freq( ( height - 1 - np.arange( height ) + .5 ) / height )
+        rows = np.minimum( np.round( freqs / ( self.sample_rate / 2 ) * ( nbins - 1 )).astype( np.intp ), nbins - 1 )
+
+        level = ( frames[ np.ix_( cols, rows ) ].T - self.db_min ) / ( self.db_max - self.db_min )
+        index = np.clip( level * ( len( self.palette ) - 1 ), 0, len( self.palette ) - 1 ).astype( np.intp )
+        self.pixels = np.ascontiguousarray( self.palette[ index ] )        # QImage doesn't copy, keep it alive
+        self.image = QImage( self.pixels.data, width, height, width * 4, QImage.Format_RGB32 )
+
+    def paintEvent( self, event ):
+        painter = QPainter( self )
+        painter.fillRect( self.rect(), Qt.white )
+        r = self.plot_rect()
+        if r.width() < 2 or r.height() < 2:
+            return
+
+        metrics = painter.fontMetrics()
+        have_frames = self.frames is not None and self.last > self.first
+
+        if have_frames:
+            width, height = int( r.width() ), int( r.height() )
+            if self.image is None or self.image.width() != width or self.image.height() != height:
+                self.build_image( width, height )
+            painter.drawImage( r.topLeft(), self.image )
+
+        painter.setPen( Qt.black )
+        for f in self.freq_ticks():
+            y = r.bottom() - self.freq_pos( f ) * r.height()
+            txt = self.freq_label( f )
+            painter.drawLine( QPointF( r.left() - 4, y ), QPointF( r.left(), y ))
+            painter.drawText( QPointF( r.left() - 6 - metrics.horizontalAdvance( txt ), y + metrics.ascent() / 2 - 1 ), txt )
+
+        if have_frames:
+            t0 = self.t0 + ( self.first * HOP + NFFT / 2 ) / self.sample_rate
+            t1 = self.t0 + ( ( self.last - 1 ) * HOP + NFFT / 2 ) / self.sample_rate
+            if t1 > t0:
+                for t in nice_ticks( t0, t1, max( 2, int( r.width() ) // 100 )):
+                    x = r.left() + ( t - t0 ) / ( t1 - t0 ) * r.width()
+                    txt = f"{t:.4g}"
+                    painter.drawLine( QPointF( x, r.bottom() ), QPointF( x, r.bottom() + 4 ))
+                    painter.drawText( QPointF( x - metrics.horizontalAdvance( txt ) / 2, r.bottom() + metrics.height() ), txt )
+
+        self.draw_label( painter, "Time (sec)", r )
+        self.draw_label( painter, "Frequency (Hz)", r, vertical=True )
+        painter.drawRect( r )
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Startup.py - WRW 17-July-2025
+#   Startup timing. Imported first thing in what.py, standard library only, so
+#   the clock starts as early as we can start it. Time before that, interpreter
+#   start and, in a PyInstaller build, unpacking, is taken from the OS where it
+#   can be (Linux), see process_age().
+
+#   do_splash_progress() starts a new phase for each message, what.py adds a
+#   few more around the splash screen and marks window.show() and finish_splash().
+
+#   WHAT_STARTUP_REPORT=1           Write what.startup.json to the config directory
+#   WHAT_STARTUP_REPORT=path.json   Write it there instead
+#   WHAT_STARTUP_IMPORTS=1          Also time every module import, self and
+#                                   cumulative, like python -X importtime
+
+#   A summary is shown in Help->About either way.
+# -------------------------------------------------------------------------------
+
+import os
+import sys
+import json
+import time
+import platform
+import datetime
+import importlib.abc
+
+# -------------------------------------------------------------------------------
+
+REPORT_ENV = 'WHAT_STARTUP_REPORT'
+IMPORTS_ENV = 'WHAT_STARTUP_IMPORTS'
+REPORT_FILE = 'what.startup.json'
+
+def env_flag( name ):
+    return os.environ.get( name, '' ).strip().lower() not in ( '', '0', 'no', 'false' )
+
+#   Seconds the process ran before this module was imported, None if the OS won't say.
+
+def process_age():
+    try:
+        with open( '/proc/self/stat' ) as fp:
+            fields = fp.read().rsplit( ')', 1 )[1].split()
+        with open( '/proc/uptime' ) as fp:
+            uptime = float( fp.read().split()[0] )
+        return max( 0.0, uptime - int( fields[19] ) / os.sysconf( 'SC_CLK_TCK' ))     # Field 22, starttime
+    except ( OSError, ValueError, IndexError, AttributeError ):
+        return None
+
+# -------------------------------------------------------------------------------
+#   Meta path finder that times exec_module() of every module imported after it
+#   is installed. Finds nothing itself, it asks the other finders and wraps the
+#   loader of the spec they return. The module gets its own loader back once loaded.
+
+class TimedLoader():
+    def __init__( self, loader, timer ):
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__( self, name ):
+        return getattr( self.loader, name )
+
+    def create_module( self, spec ):
+        return self.loader.create_module( spec )
+
+    def exec_module( self, module ):
+        stack = self.timer.stack
+        stack.append( 0.0 )
+        start = time.perf_counter()
+        try:
+            self.loader.exec_module( module )
+        finally:
+            total = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += total
+            self.timer.times.append( ( module.__name__, total - children, total ))
+
+            module.__loader__ = self.loader
+            if getattr( module, '__spec__', None ) is not None:
+                module.__spec__.loader = self.loader
+
+class ImportTimer( importlib.abc.MetaPathFinder ):
+    def __init__( self ):
+        self.times = []             # [ ( module, self_seconds, cumulative_seconds ), ... ] in completion order
+        self.stack = []
+
+    def install( self ):
+        sys.meta_path.insert( 0, self )
+
+    def uninstall( self ):
+        if self in sys.meta_path:
+            sys.meta_path.remove( self )
+
+    def find_spec( self, name, path, target=None ):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr( finder, 'find_spec' ):
+                continue
+            spec = finder.find_spec( name, path, target )
+            if spec is not None:
+                if spec.loader is not None and hasattr( spec.loader, 'exec_module' ):
+                    spec.loader = TimedLoader( spec.loader, self )
+                return spec
+        return None
+
+# -------------------------------------------------------------------------------
+#   Times are seconds from import of this module.
+
+class StartupProfile():
+    def __init__( self ):
+        self.t0 = time.perf_counter()
+        self.started = datetime.datetime.now()
+        self.before = process_age()
+        self.phases = []            # [ ( name, start, seconds ), ... ]
+        self.marks = {}             # name: time
+        self.current = None
+        self.current_start = 0.0
+        self.imports = None
+
+        if env_flag( IMPORTS_ENV ):
+            self.imports = ImportTimer()
+            self.imports.install()
+
+    def now( self ):
+        return time.perf_counter() - self.t0
+
+    #   End the current phase, if any, and start the next.
+
+    def phase( self, name ):
+        now = self.now()
+        if self.current is not None:
+            self.phases.append( ( self.current, self.current_start, now - self.current_start ))
+        self.current = name
+        self.current_start = now
+
+    def mark( self, name ):
+        self.marks[ name ] = self.now()
+
+    #   End the last phase, stop timing imports.
+
+    def finish( self, mark='finished' ):
+        self.phase( None )
+        self.mark( mark )
+        if self.imports:
+            self.imports.uninstall()
+
+    # ---------------------------------------------------------------
+
+    def report( self, **extra ):
+        report = {
+            'started':          self.started.isoformat( timespec='seconds' ),
+            'python':           platform.python_version(),
+            'platform':         platform.platform(),
+            'frozen':           bool( getattr( sys, 'frozen', False )),
+            'before_profile_s': self.before,
+            'phases':           [ { 'name': name, 'start_s': round( start, 6 ), 'seconds': round( sec, 6 ) } for name, start, sec in self.phases ],
+            'marks':            { name: round( t, 6 ) for name, t in self.marks.items() },
+        }
+        if self.imports:
+            report[ 'imports' ] = [ { 'module': name, 'self_s': round( own, 6 ), 'cumulative_s': round( total, 6 ) }
+                                    for name, own, total in sorted( self.imports.times, key=lambda x: -x[2] ) ]
+        report.update( extra )
+        return report
+
+    #   Path from WHAT_STARTUP_REPORT, confdir if it's just a flag. None if not set.
+
+    def report_path( self, confdir ):
+        value = os.environ.get( REPORT_ENV, '' ).strip()
+        if not env_flag( REPORT_ENV ):
+            return None
+        if value.lower().endswith( '.json' ):
+            return value
+        return os.path.join( confdir, REPORT_FILE )
+
+    def write_report( self, confdir, **extra ):
+        path = self.report_path( confdir )
+        if path:
+            try:
+                with open( path, 'w' ) as fp:
+                    json.dump( self.report( **extra ), fp, indent=2 )
+            except OSError as e:
+                print( f"ERROR: Can't write startup report {path}: {e}", file=sys.stderr )
+        return path
+
+    # ---------------------------------------------------------------
+    #   Lines for Help->About, phases of at least min_ms, slowest imports if timed.
+
+    def summary( self, min_ms=10, imports=5 ):
+        lines = []
+        if self.before is not None:
+            lines.append( f"Process start to profiler: {self.before*1000:.0f} ms" )
+        for name, t in self.marks.items():
+            lines.append( f"To {name}: {t*1000:.0f} ms" )
+        for name, start, sec in self.phases:
+            if sec * 1000 >= min_ms:
+                lines.append( f"    {name}: {sec*1000:.0f} ms" )
+        if self.imports:
+            for name, own, total in sorted( self.imports.times, key=lambda x: -x[1] )[ :imports ]:
+                lines.append( f"    import {name}: {own*1000:.0f} ms self, {total*1000:.0f} ms cumulative" )
+        return lines
+
+# -------------------------------------------------------------------------------
+
+startup = StartupProfile()
+
+# -------------------------------------------------------------------------------
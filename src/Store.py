@@ -7,73 +7,291 @@
 #       and for help with dot notation.
 # ---------------------------------------------------------------------------
 
+#   WRW 23-July-2025 - Faster reads. Store() is called in paint and play paths and
+#       s.Const is read several times per graph point.
+
+#   Values live in ordinary attributes now, the runtime fields below in slots, the
+#   rest in the instance __dict__. Reading a name that is there is plain attribute
+#   access, __getattr__() isn't called and nothing is converted or written back.
+#   dicts are converted to DotDict once, when assigned, not on every read.
+
+#   Reading a name that isn't there still creates an empty DotDict, as before,
+#   unless strict: WHAT_STORE_STRICT=1 in the environment or set_strict(), then
+#   it raises AttributeError. For finding typos and reads before assignment.
+
+#   store_bench.py times it.
+
+#   WRW 24-July-2025 - Snapshots for worker threads. Export, warm-up and prefetch
+#       run off the GUI thread while it goes on changing the store.
+
+#   s.snapshot() returns a read-only copy of the store as it was, Const and nested
+#   DotDicts included, taken on the GUI thread and handed to the worker. A worker
+#   reads the settings of the moment it was started, all from the same moment.
+#   Setting anything on a snapshot raises TypeError and reading a name that isn't
+#   there raises AttributeError, it never creates anything.
+
+#   Writes, to the store, a DotDict in it or through Const.set(), take write_lock
+#   and drop the published snapshot. The next snapshot() copies the store again,
+#   so a copy is made at most once per change and only if someone asks for one.
+#   Until then every snapshot() returns the same object without taking the lock.
+#   Live reads, s.Const.x in the paint and play paths, don't take the lock either.
+
+import os
+import threading
+
+STRICT_ENV = 'WHAT_STORE_STRICT'
+
+strict = os.environ.get( STRICT_ENV, '' ).strip().lower() not in ( '', '0', 'no', 'false' )
+
+def set_strict( on=True ):
+    global strict
+    strict = bool( on )
+
+def missing( owner, name ):
+    return AttributeError( f"'{owner}' has no attribute '{name}'" + ( " (strict)" if strict else "" ))
+
+write_lock = threading.Lock()
+published = None                    # Latest Snapshot of the store, None after a write
+
+#   Call with write_lock held.
+
+def _changed():
+    global published
+    published = None
+
+#   For writes the store can't see, Const.set().
+
+def changed():
+    with write_lock:
+        _changed()
+
+# ---------------------------------------------------------------------------
+
 class Store:
     _instance = None  # Class-level attribute to hold the singleton instance
 
+    #   Runtime state set by what.py, typed here for reference. Everything else
+    #   assigned to the store goes in __dict__.
+
+    FIELDS = {
+        'Const':                'Const',            # Const.py
+        'app':                  'QApplication',
+        'Verbose':              'bool',
+        'conf':                 'Config',
+        'settings':             'QSettings',
+        'splash':               'SplashDialog',
+        'splash_pix':           'makeSplashPixmap',
+        'originalStyle':        'str',
+        'deferred':             'DeferredTasks',
+        'scope_dialog':         'ScopeDialog',
+        'scope_dialog_showing': 'bool',
+        'warmup_timings':       'dict',
+        'warmup_cancelled':     'bool',
+    }
+    __slots__ = ( '__dict__', *FIELDS )
+
+    #   Read before what.py assigns them, set so strict mode doesn't trip on them.
+
+    DEFAULTS = {
+        'Verbose':              False,
+        'scope_dialog':         None,
+        'scope_dialog_showing': False,
+        'warmup_timings':       {},
+        'warmup_cancelled':     False,
+    }
+
     def __new__(cls):
         if cls._instance is None:                   # Check if an instance already exists
             cls._instance = super().__new__(cls)    # Create a new instance
-            cls._instance._data = DotDict()
+            for name, value in cls.DEFAULTS.items():
+                setattr( cls._instance, name, value )
         return cls._instance                        # Return the existing instance
 
     def setVal( self, name, val ):
-        self._data[name] = self._convert_to_dotdict(val)
+        setattr( self, name, val )
 
     def getVal( self, name ):
-        if name in self._data:
-            return self._data[name]
-        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        try:
+            return object.__getattribute__( self, name )
+        except AttributeError:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'") from None
 
     def __setattr__(self, name, value):
-        if name != "_data":
-            self._data[name] = self._convert_to_dotdict(value)
-        else:
-            super().__setattr__(name, value)
+        if isinstance( value, dict ) and not isinstance( value, DotDict ):
+            value = DotDict( value )
+        with write_lock:
+            object.__setattr__( self, name, value )
+            _changed()
 
-    def __getattr__(self, name):
-        if name not in self._data:
-            self._data[name] = DotDict()
-        return self._data[name]
+    #   Only called when name isn't set. Another thread may have set it meanwhile.
 
-    def _convert_to_dotdict(self, value):
-        if isinstance(value, dict):
-            return DotDict(value)
+    def __getattr__(self, name):
+        if strict or name.startswith( '__' ):
+            raise missing( self.__class__.__name__, name )
+        with write_lock:
+            try:
+                return object.__getattribute__( self, name )
+            except AttributeError:
+                value = DotDict()
+                object.__setattr__( self, name, value )
+                _changed()
         return value
 
+    #   Lock-free when nothing has changed since the last snapshot.
+
+    def snapshot( self ):
+        global published
+        snap = published
+        if snap is not None:
+            return snap
+
+        with write_lock:
+            if published is None:
+                published = Snapshot( { name: freeze( object.__getattribute__( self, name )) for name in self._names() } )
+            return published
+
+    def _names( self ):
+        return [ name for name in self.FIELDS if self.defined( name ) ] + list( self.__dict__ )
 
     def defined( self, name ):
-        return True if name in self._data else False
+        try:
+            object.__getattribute__( self, name )
+            return True
+        except AttributeError:
+            return False
 
     def showKeys( self ):
-        return list(self._data.keys())
+        return self._names()
 
     def showItems( self ):
-         return [f"{key:>20} : {val}" for key, val in self._data.items()]
+         return [f"{key:>20} : {object.__getattribute__( self, key )}" for key in self._names()]
 
 # ---------------------------------------------------------------------------
 #   This allows accessing dictionary keys as attributes (dot notation)
+#   WRW 23-July-2025 - Nested dicts are converted as they are stored, so a read
+#       is just the dict lookup.
 
 class DotDict(dict):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         for key, value in self.items():
-            self[key] = self._convert_nested(value)
+            if isinstance( value, dict ) and not isinstance( value, DotDict ):
+                dict.__setitem__( self, key, DotDict( value ))
 
     def __getattr__(self, name):
-        if name in self:
-            value = self[name]
-            self[name] = self._convert_nested(value)
+        try:
             return self[name]
-        self[name] = DotDict()
-        return self[name]
+        except KeyError:
+            pass
+        if strict or name.startswith( '__' ):
+            raise missing( 'DotDict', name )
+        with write_lock:
+            value = dict.setdefault( self, name, DotDict() )
+            _changed()
+        return value
 
     def __setattr__(self, name, value):
-        self[name] = self._convert_nested(value)
+        self[name] = value
+
+    def __setitem__(self, key, value):
+        if isinstance( value, dict ) and not isinstance( value, DotDict ):
+            value = DotDict( value )
+        with write_lock:
+            dict.__setitem__( self, key, value )
+            _changed()
+
+    def __delitem__(self, key):
+        with write_lock:
+            dict.__delitem__( self, key )
+            _changed()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict( *args, **kwargs ).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        with write_lock:
+            _changed()
+            return dict.pop( self, *args )
+
+    def popitem(self):
+        with write_lock:
+            _changed()
+            return dict.popitem( self )
+
+    def clear(self):
+        with write_lock:
+            dict.clear( self )
+            _changed()
+
+# ---------------------------------------------------------------------------
+#   WRW 24-July-2025 - Read-only view from Store.snapshot(). Names are in the
+#       instance __dict__ so a read is plain attribute access, like the store.
+#       Item access, in, get(), keys() and items() for code written for a DotDict.
+
+class Snapshot:
+    __slots__ = ( '__dict__', )
+
+    def __init__( self, values ):
+        object.__setattr__( self, '__dict__', values )
+
+    def __getattr__( self, name ):
+        raise missing( 'Snapshot', name )
+
+    def __setattr__( self, name, value ):
+        raise TypeError( f"Snapshot is read-only, can't set '{name}'" )
+
+    def __delattr__( self, name ):
+        raise TypeError( f"Snapshot is read-only, can't delete '{name}'" )
+
+    def __getitem__( self, key ):
+        return self.__dict__[ key ]
+
+    def __contains__( self, key ):
+        return key in self.__dict__
+
+    def __iter__( self ):
+        return iter( self.__dict__ )
+
+    def __len__( self ):
+        return len( self.__dict__ )
+
+    def get( self, key, default=None ):
+        return self.__dict__.get( key, default )
+
+    def keys( self ):
+        return self.__dict__.keys()
+
+    def items( self ):
+        return self.__dict__.items()
+
+    def __repr__( self ):
+        return f"Snapshot({self.__dict__!r})"
+
+#   Copy of value for a snapshot. DotDicts and Const are copied, lists become
+#   tuples, sets frozensets. Anything else, numbers, strings, Qt objects, the
+#   dialogs, goes in as is. A worker must not touch the Qt ones anyway.
 
-    def _convert_nested(self, value):
-        if isinstance(value, dict) and not isinstance(value, DotDict):
-            return DotDict(value)
+def freeze( value ):
+    if isinstance( value, ( Snapshot, str, bytes, int, float, type( None ))):
         return value
+    if isinstance( value, dict ):
+        return Snapshot( { key: freeze( item ) for key, item in value.items() } )
+    if isinstance( value, ( list, tuple )):
+        return tuple( freeze( item ) for item in value )
+    if isinstance( value, ( set, frozenset )):
+        return frozenset( value )
+    if type( value ).__name__ == 'Const':
+        return Snapshot( { name: freeze( getattr( value, name )) for name in dir( value )
+                           if not name.startswith( '_' ) and not callable( getattr( value, name )) } )
+    return value
 
 # ---------------------------------------------------------------------------
 
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   ToneCache.py - WRW 2-July-2025
+#   Small LRU cache of rendered test-tone buffers with one background render slot.
+#   The graph asks for a (freq, gain_db) tone to be rendered while the mouse dwells
+#   over a grid cell so that a click can play immediately from the cached buffer.
+
+#   Only one background render is in flight at a time. Asking for a different key
+#   cancels the pending one. A render that has already started can't be interrupted
+#   but it is cheap and its result is still cached.
+# -------------------------------------------------------------------------------
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+# -------------------------------------------------------------------------------
+
+class ToneCache():
+    def __init__( self, render, size=8 ):
+        self.render = render                # render( freq, gain_db ) -> buffer
+        self.size = size
+        self.cache = OrderedDict()          # key -> buffer, oldest first
+        self.pending = None                 # ( key, future ) of background render, if any
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor( max_workers=1, thread_name_prefix='tone-prefetch' )
+
+    # ---------------------------------------------------------------
+    #   Start rendering key in the background unless already cached or in flight.
+
+    def prefetch( self, key ):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end( key )
+                return
+
+            if self.pending and self.pending[0] == key:
+                return
+
+            self._cancel_pending()
+            self.pending = ( key, self.executor.submit( self._render, key ) )
+
+    # ---------------------------------------------------------------
+    #   Cursor moved to another cell or left the graph.
+
+    def cancel( self ):
+        with self.lock:
+            self._cancel_pending()
+
+    # ---------------------------------------------------------------
+    #   Return buffer for key: from the cache, from a render already in flight,
+    #   or render it now on the caller's thread.
+
+    def get( self, key ):
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end( key )
+                return self.cache[ key ]
+
+            future = self.pending[1] if self.pending and self.pending[0] == key else None
+
+        if future:
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+
+        return self._render( key )
+
+    # ---------------------------------------------------------------
+
+    def clear( self ):
+        with self.lock:
+            self._cancel_pending()
+            self.cache.clear()
+
+    def shutdown( self ):
+        self.clear()
+        self.executor.shutdown( wait=False, cancel_futures=True )
+
+    # ---------------------------------------------------------------
+    #   Buffers are shared between callers so make them read-only.
+
+    def _render( self, key ):
+        buf = self.render( *key )
+        buf.flags.writeable = False
+
+        with self.lock:
+            self.cache[ key ] = buf
+            self.cache.move_to_end( key )
+            while len( self.cache ) > self.size:
+                self.cache.popitem( last=False )
+
+            if self.pending and self.pending[0] == key:
+                self.pending = None
+
+        return buf
+
+    def _cancel_pending( self ):            # Call with lock held
+        if self.pending:
+            self.pending[1].cancel()        # No effect if already running
+            self.pending = None
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Trend.py - WRW 16-July-2025
+#   Change of threshold over time at each frequency, from the results database.
+
+#   Test frequencies depend on points_per_octave and start/end frequency, and they
+#   differ between sessions. So each session is first interpolated, in log
+#   frequency, onto a common grid. The grid comes from log_grid(). The result is
+#   a ( sessions x grid ) array, NaN outside the range the session tested.
+
+#   Then fit loss = a + b * years by least squares at every grid frequency. The
+#   fit is done for one person or for thousands at once, with no Python loop
+#   over people, sessions or frequencies.
+
+#   The slope is in dB per year, positive is getting worse. There is a 95% band
+#   on the slope and on the fitted threshold at the latest session that tested
+#   that frequency, so one short session doesn't extrapolate the rest. A slope is
+#   flagged significant when its band excludes zero. At least min_sessions
+#   sessions are needed at a frequency, otherwise it is NaN.
+
+#   paint_trend() draws a Trend on the graph and in exports.
+# -------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QPen, QColor, QPolygonF
+
+# -------------------------------------------------------------------------------
+
+GRID_PER_OCTAVE = 6
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+MIN_SESSIONS = 3
+
+#   Two-sided 95% Student t for 1 to 30 degrees of freedom, Cornish-Fisher beyond.
+
+T975 = np.array( [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+     2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+     2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+] )
+Z975 = 1.959964
+
+def t_critical( df ):
+    df = np.asarray( df )
+    out = np.full( df.shape, np.nan )
+    small = ( df >= 1 ) & ( df <= len( T975 ))
+    out[ small ] = T975[ df[ small ] - 1 ]
+    big = df > len( T975 )
+    d = df[ big ].astype( float )
+    z = Z975
+    out[ big ] = z + ( z**3 + z ) / ( 4 * d ) + ( 5 * z**5 + 16 * z**3 + 3 * z ) / ( 96 * d**2 )
+    return out
+
+def log_grid( start_freq=125, end_freq=16000, per_octave=GRID_PER_OCTAVE ):
+    n = round( math.log2( end_freq / start_freq ) * per_octave )
+    return start_freq * 2 ** ( np.arange( n + 1 ) / per_octave )
+
+# -------------------------------------------------------------------------------
+#   columns is long form from ResultsDB.thresholds(). Where a session accepted more
+#   than one loss at a frequency the least is its threshold.
+#   Returns patient[ S ], session[ S ], date[ S ], Y[ S, G ] ordered by patient and date.
+
+#   All sessions are interpolated with one np.interp() call. Session k is shifted
+#   k * offset octaves along the axis so that the sessions follow one another
+#   without overlap. Grid points outside a session's own range are then set to NaN,
+#   which also drops anything interpolated across the gap to the next session.
+
+def session_matrix( columns, grid ):
+    grid = np.asarray( grid, dtype=np.float64 )
+    if not len( columns[ 'session' ] ):
+        empty = np.zeros( 0, dtype=np.int64 )
+        return empty, empty, np.zeros( 0 ), np.zeros( ( 0, len( grid )))
+
+    order = np.lexsort( ( columns[ 'loss_db' ], columns[ 'freq' ], columns[ 'session' ] ))
+    session = columns[ 'session' ][ order ]
+    freq = columns[ 'freq' ][ order ]
+    loss = columns[ 'loss_db' ][ order ]
+
+    keep = np.ones( len( session ), dtype=bool )
+    keep[ 1: ] = ( session[ 1: ] != session[ :-1 ] ) | ( freq[ 1: ] != freq[ :-1 ] )
+    session, freq, loss, order = session[ keep ], freq[ keep ], loss[ keep ], order[ keep ]
+
+    sessions, first, rank = np.unique( session, return_index=True, return_inverse=True )
+    last = np.r_[ first[ 1: ] - 1, len( session ) - 1 ]
+
+    x = np.log2( freq )
+    gx = np.log2( grid )
+    offset = max( x.max(), gx.max() ) - min( x.min(), gx.min() ) + 1
+    shift = np.arange( len( sessions )) * offset
+
+    Y = np.interp( ( gx[ None, : ] + shift[ :, None ] ).ravel(), x + shift[ rank ], loss ).reshape( len( sessions ), len( grid ))
+    outside = ( gx[ None, : ] < x[ first ][ :, None ] - 1e-9 ) | ( gx[ None, : ] > x[ last ][ :, None ] + 1e-9 )
+    Y[ outside ] = np.nan
+
+    patient = columns[ 'patient' ][ order ][ first ]
+    date = columns[ 'date' ][ order ][ first ]
+    by_date = np.lexsort( ( sessions, date, patient ))
+
+    return patient[ by_date ], sessions[ by_date ], date[ by_date ], Y[ by_date ]
+
+#   Sessions per patient into rows, NaN padded to the patient with the most.
+#   patient and date as from session_matrix(). Returns patients[ P ], T[ P, M ], Y[ P, M, G ].
+
+def stack_patients( patient, date, Y ):
+    patients, start, counts = np.unique( patient, return_index=True, return_counts=True )
+    rows = np.repeat( np.arange( len( patients )), counts )
+    slots = np.arange( len( patient )) - np.repeat( start, counts )
+    width = counts.max() if len( counts ) else 0
+
+    T = np.full( ( len( patients ), width ), np.nan )
+    T[ rows, slots ] = date
+    Y3 = np.full( ( len( patients ), width, Y.shape[ -1 ] ), np.nan )
+    Y3[ rows, slots ] = Y
+    return patients, T, Y3
+
+# -------------------------------------------------------------------------------
+#   Fit results, each array shaped ( ..., G ) with the leading axes of T. at is
+#   the time the fit is evaluated, epoch seconds.
+
+class Trend():
+    FIELDS = ( 'n', 'slope', 'slope_lo', 'slope_hi', 'significant', 'fit', 'fit_lo', 'fit_hi', 'at' )
+
+    def __init__( self, grid, **fields ):
+        self.grid = grid
+        for name in self.FIELDS:
+            setattr( self, name, fields[ name ] )
+
+    def __getitem__( self, index ):                 # One patient from a batch
+        return Trend( self.grid, **{ name: getattr( self, name )[ index ] for name in self.FIELDS } )
+
+    def worsening( self ):
+        return self.significant & ( self.slope > 0 )
+
+#   T[ ..., M ] epoch seconds, Y[ ..., M, G ] loss in dB, NaN where missing.
+#   Masked sums over the session axis, the rest is elementwise.
+
+def fit_trends( T, Y, grid, at=None, min_sessions=MIN_SESSIONS ):
+    years = ( np.asarray( T, dtype=np.float64 ) / SECONDS_PER_YEAR )[ ..., None ]
+    Y = np.asarray( Y, dtype=np.float64 )
+    mask = np.isfinite( Y ) & np.isfinite( years )
+
+    with np.errstate( invalid='ignore', divide='ignore' ):
+        n = mask.sum( axis=-2 )
+        t_bar = np.where( mask, years, 0 ).sum( axis=-2 ) / n
+        y_bar = np.where( mask, Y, 0 ).sum( axis=-2 ) / n
+        dt = np.where( mask, years - t_bar[ ..., None, : ], 0 )
+        dy = np.where( mask, Y - y_bar[ ..., None, : ], 0 )
+
+        sxx = ( dt * dt ).sum( axis=-2 )
+        slope = ( dt * dy ).sum( axis=-2 ) / sxx
+        resid = np.where( mask, dy - slope[ ..., None, : ] * dt, 0 )
+        s2 = ( resid * resid ).sum( axis=-2 ) / ( n - 2 )
+        tc = t_critical( n - 2 )
+        half = tc * np.sqrt( s2 / sxx )
+
+        if at is None:
+            at_years = np.max( np.where( mask, years, -np.inf ), axis=-2, initial=-np.inf )
+        else:
+            at_years = np.broadcast_to( np.asarray( at, dtype=np.float64 )[ ..., None ] / SECONDS_PER_YEAR, t_bar.shape )
+        fit = y_bar + slope * ( at_years - t_bar )
+        fit_half = tc * np.sqrt( s2 * ( 1 / n + ( at_years - t_bar )**2 / sxx ))
+
+    ok = ( n >= max( min_sessions, 3 )) & ( sxx > 0 )
+    nan = lambda a: np.where( ok, a, np.nan )
+
+    return Trend( grid,
+        n = n,
+        slope = nan( slope ),
+        slope_lo = nan( slope - half ),
+        slope_hi = nan( slope + half ),
+        significant = ok & ( np.abs( slope ) > half ),
+        fit = nan( fit ),
+        fit_lo = nan( fit - fit_half ),
+        fit_hi = nan( fit + fit_half ),
+        at = nan( at_years * SECONDS_PER_YEAR ),
+    )
+
+# -------------------------------------------------------------------------------
+#   From the database, see Results.py. ear is 'B', 'L' or 'R', trends are per ear.
+
+#   Trend arrays ( G, ), None if the user has no sessions for the ear.
+#   until limits it to sessions before then, to show the trend as it was.
+
+def person_trend( db, user, ear, grid=None, until=None, min_sessions=MIN_SESSIONS ):
+    grid = log_grid() if grid is None else grid
+    patient, session, date, Y = session_matrix( db.thresholds( user=user, ear=ear, until=until ), grid )
+    if not len( session ):
+        return None
+    return fit_trends( date, Y, grid, min_sessions=min_sessions )
+
+#   Everyone, or the named users, in one query and one fit. Returns
+#   ( { patient_id: name }, patient_ids[ P ], Trend ) with Trend arrays ( P, G ).
+
+def batch_trends( db, ear, users=None, grid=None, min_sessions=MIN_SESSIONS ):
+    grid = log_grid() if grid is None else grid
+    patient, session, date, Y = session_matrix( db.thresholds( user=users, ear=ear ), grid )
+    patients, T, Y3 = stack_patients( patient, date, Y )
+    return db.patients(), patients, fit_trends( T, Y3, grid, min_sessions=min_sessions )
+
+# -------------------------------------------------------------------------------
+#   Fitted threshold with its band, dashed, and a dot where the slope is
+#   significant: filled for worsening, hollow for improving. x_px and y_px map
+#   frequency and loss to device coordinates, unit is device units per point.
+
+TREND_COLOR = '#e07000'
+
+def paint_trend( painter, trend, x_px, y_px, unit=1 ):
+    color = QColor( TREND_COLOR )
+    band = QColor( color )
+    band.setAlpha( 60 )
+
+    valid = np.isfinite( trend.fit )
+    edges = np.flatnonzero( np.diff( np.r_[ 0, valid.astype( np.int8 ), 0 ] ))
+
+    painter.save()
+    for start, stop in zip( edges[ ::2 ], edges[ 1::2 ] ):
+        freqs = trend.grid[ start:stop ]
+        upper = [ QPointF( x_px( f ), y_px( v )) for f, v in zip( freqs, trend.fit_lo[ start:stop ] ) ]
+        lower = [ QPointF( x_px( f ), y_px( v )) for f, v in zip( freqs, trend.fit_hi[ start:stop ] ) ]
+        line = [ QPointF( x_px( f ), y_px( v )) for f, v in zip( freqs, trend.fit[ start:stop ] ) ]
+
+        painter.setPen( Qt.NoPen )
+        painter.setBrush( band )
+        painter.drawPolygon( QPolygonF( upper + lower[ ::-1 ] ))
+
+        pen = QPen( color, 1.5 * unit, Qt.DashLine )
+        painter.setPen( pen )
+        painter.setBrush( Qt.NoBrush )
+        painter.drawPolyline( QPolygonF( line ))
+
+    r = 3 * unit
+    painter.setPen( QPen( color, 1.2 * unit ))
+    for i in np.flatnonzero( trend.significant ):
+        painter.setBrush( color if trend.slope[ i ] > 0 else Qt.NoBrush )
+        painter.drawEllipse( QPointF( x_px( trend.grid[ i ] ), y_px( trend.fit[ i ] )), r, r )
+    painter.restore()
+
+# -------------------------------------------------------------------------------
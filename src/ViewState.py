@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   ViewState.py - WRW 25-July-2025
+#   What the main window shows of the test in progress: the three LCDs, the
+#   playing indicator, the status bar, the state label, 'All done' and the graph
+#   marker. The sm_*() functions set keys here instead of calling the widgets,
+#   often several times per transition. Each widget subscribes to its keys and
+#   is called once per flush with the latest value of each key that changed.
+
+#   sm_proc_input() runs a dispatch in batch(), flushed once at the end. A set()
+#   outside a batch is flushed on the next pass of the event loop, so several
+#   in a row still reach the widget once.
+
+#   A tone blocks the event loop while it plays. paint() flushes and repaints
+#   just the widgets that changed, once, before it starts. That replaces a
+#   repaint() or processEvents() after each change.
+# -------------------------------------------------------------------------------
+
+from contextlib import contextmanager
+
+from PySide6.QtCore import QObject, QTimer
+
+# -------------------------------------------------------------------------------
+
+class ViewState( QObject ):
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.values = {}
+        self.changed = {}               # Keys set since the last flush, a dict to keep order
+        self.subscribers = []           # [ ( keys, callback, widget ), ... ] in order subscribed
+        self.depth = 0                  # Nesting of batch()
+
+        self.timer = QTimer( self )
+        self.timer.setSingleShot( True )
+        self.timer.setInterval( 0 )
+        self.timer.timeout.connect( self.flush )
+
+    #   callback( { key: value, ... } ) gets only the keys that changed. widget is
+    #   what paint() repaints, None for one that paints itself, e.g. QStatusBar.
+
+    def subscribe( self, keys, callback, widget=None ):
+        self.subscribers.append( ( tuple( keys ), callback, widget ))
+
+    def set( self, **values ):
+        self.values.update( values )
+        self.changed.update( dict.fromkeys( values ))
+        if not self.depth and not self.timer.isActive():
+            self.timer.start()
+
+    def get( self, key, default=None ):
+        return self.values.get( key, default )
+
+    @contextmanager
+    def batch( self ):
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.depth:
+                self.flush()
+
+    # ---------------------------------------------------------------
+    #   Returns the widgets notified.
+
+    def flush( self ):
+        self.timer.stop()
+        if not self.changed:
+            return []
+
+        changed, self.changed = self.changed, {}
+        notified = []
+        for keys, callback, widget in self.subscribers:
+            values = { key: self.values[ key ] for key in keys if key in changed }
+            if values:
+                callback( values )
+                notified.append( widget )
+        return notified
+
+    def paint( self ):
+        for widget in self.flush():
+            if widget is not None:
+                widget.repaint()
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Warmup.py - WRW 12-July-2025
+#   Pay for the slow first-time work while the user is still reading the window,
+#   not at the first Save or the first Show Waveform. Started from finish_splash()
+#   on a low priority thread. Cancelled as soon as the user starts testing so it
+#   never competes with tone playback. A step already running is allowed to
+#   finish, an import can't be interrupted.
+
+#   matplotlib is warmed only when an engine setting uses it. With the native
+#   engines the first save is a QPainter render, warmed by prerender().
+
+#   WRW 24-July-2025 - Steps read Const from a Store.snapshot() taken by
+#   warmup_steps() on the GUI thread, not from the live Store.
+# -------------------------------------------------------------------------------
+
+import time
+import functools
+
+from PySide6.QtCore import QThread
+
+from Store import Store
+
+# -------------------------------------------------------------------------------
+
+def import_matplotlib():
+    import matplotlib
+    matplotlib.use( 'Agg' )
+    import matplotlib.figure
+    import matplotlib.backends.backend_agg
+
+def matplotlib_fonts():
+    from matplotlib import font_manager
+    font_manager.fontManager.findfont( 'DejaVu Sans' )     # Builds or loads the font cache
+
+def import_scope( store ):
+    import Scope
+    if store.Const.scope_engine == 'matplotlib':
+        import matplotlib.backends.backend_qtagg
+
+def prerender_export( store ):
+    import Export
+    Export.prerender( store=store )
+
+#   [ ( name, function ), ... ] in order
+
+def warmup_steps():
+    s = Store().snapshot()
+    steps = []
+    if 'matplotlib' in ( s.Const.export_engine, s.Const.scope_engine ):
+        steps.append( ( 'import matplotlib', import_matplotlib ))
+        steps.append( ( 'matplotlib fonts', matplotlib_fonts ))
+    steps.append( ( 'import scope', functools.partial( import_scope, s ) ))
+    steps.append( ( 'prerender export', functools.partial( prerender_export, s ) ))
+    return steps
+
+# -------------------------------------------------------------------------------
+#   timings is { name: seconds } for steps that ran, read it after finished is emitted.
+
+class WarmUp( QThread ):
+    def __init__( self, steps, parent=None ):
+        super().__init__( parent )
+        self.steps = steps
+        self.timings = {}
+        self.cancelled = False
+
+    def begin( self ):
+        self.start( QThread.LowestPriority )
+
+    def cancel( self ):
+        if self.isRunning():
+            self.requestInterruption()
+
+    def run( self ):
+        for name, fn in self.steps:
+            if self.isInterruptionRequested():
+                self.cancelled = True
+                break
+
+            start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                print( f"ERROR-DEV: warm-up step '{name}' failed: {e}" )
+            self.timings[ name ] = time.perf_counter() - start
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   Waveform.py - WRW 5-July-2025
+#   Native QPainter waveform view for the scope. Replaces the matplotlib canvas,
+#   which cleared and re-plotted every sample on each slider tick.
+
+#   A min/max pyramid is built once per signal. Level k holds the min and max of
+#   each block of 2**k samples. A redraw picks the level with blocks just under
+#   one pixel column wide and folds them into columns with reduceat(), so each
+#   paint touches O(pixel width) values whatever the zoom.
+
+#   Setters only call update(). Qt folds any number of those into one paint per
+#   frame so slider drags redraw at display rate.
+# -------------------------------------------------------------------------------
+
+import math
+import numpy as np
+
+from PySide6.QtCore import Qt, QPointF, QLineF
+from PySide6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PySide6.QtWidgets import QWidget, QSizePolicy
+
+# -------------------------------------------------------------------------------
+
+class MinMaxPyramid():
+    def __init__( self, signal ):
+        self.signal = np.asarray( signal, dtype=np.float32 )
+        self.mins = [ self.signal ]         # Level 0 is the signal itself
+        self.maxs = [ self.signal ]
+
+        lo = hi = self.signal
+        while len( lo ) > 1:
+            n = len( lo ) & ~1              # Odd sample at the end folds into the last pair
+            new_lo = np.minimum( lo[0:n:2], lo[1:n:2] )
+            new_hi = np.maximum( hi[0:n:2], hi[1:n:2] )
+            if len( lo ) & 1:
+                new_lo[-1] = min( new_lo[-1], lo[-1] )
+                new_hi[-1] = max( new_hi[-1], hi[-1] )
+            lo, hi = new_lo, new_hi
+            self.mins.append( lo )
+            self.maxs.append( hi )
+
+    def __len__( self ):
+        return len( self.signal )
+
+    # ---------------------------------------------------------------
+    #   Min and max of samples [start, end) in ncols columns.
+    #   Returns None when there is less than one sample per column, draw the samples then.
+
+    def columns( self, start, end, ncols ):
+        spp = ( end - start ) / ncols
+        if spp <= 1:
+            return None
+
+        level = min( int( math.log2( spp )), len( self.mins ) - 1 )
+        lo = self.mins[ level ]
+        hi = self.maxs[ level ]
+
+        first = start >> level
+        last = min( -( -end >> level ), len( lo ))          # Ceiling division
+        edges = np.linspace( first, last, ncols + 1 ).astype( np.intp )
+        edges = np.minimum( edges[:-1], last - 1 ) - first
+
+        return ( np.minimum.reduceat( lo[ first:last ], edges ),
+                 np.maximum.reduceat( hi[ first:last ], edges ))
+
+# -------------------------------------------------------------------------------
+#   Round tick spacing, 1, 2 or 5 times a power of ten.
+
+def nice_ticks( lo, hi, count=6 ):
+    span = hi - lo
+    if span <= 0:
+        return []
+    raw = span / count
+    mag = 10 ** math.floor( math.log10( raw ))
+    step = next( m * mag for m in ( 1, 2, 5, 10 ) if m * mag >= raw )
+    first = math.ceil( lo / step ) * step
+    return list( np.arange( first, hi + step * 1e-6, step ))
+
+# -------------------------------------------------------------------------------
+
+class WaveformView( QWidget ):
+    def __init__( self, parent=None ):
+        super().__init__( parent )
+        self.setSizePolicy( QSizePolicy.Expanding, QSizePolicy.Preferred )
+        self.setMinimumHeight( 150 )
+
+        self.pyramid = MinMaxPyramid( np.zeros( 44100 ))
+        self.sample_rate = 44100
+        self.start = 0
+        self.end = len( self.pyramid )
+        self.ylim = 1.2
+        self.offset = 0.0               # WRW 7-July-2025 - Seconds added to the time axis, live scope
+        self.playhead = None            #   and sample index of the playhead line, if any
+
+        self.margin_left = 60
+        self.margin_right = 10
+        self.margin_top = 10
+        self.margin_bottom = 40
+
+    # ---------------------------------------------------------------
+
+    def set_signal( self, signal, sample_rate, offset=0.0, playhead=None ):
+        self.pyramid = MinMaxPyramid( signal )
+        self.sample_rate = sample_rate
+        self.offset = offset
+        self.playhead = playhead
+        self.update()
+
+    def set_view( self, start, end, ylim ):
+        self.start = max( 0, start )
+        self.end = min( max( end, self.start + 1 ), len( self.pyramid ))
+        self.ylim = ylim
+        self.update()
+
+    # ---------------------------------------------------------------
+
+    def paintEvent( self, event ):
+        painter = QPainter( self )
+        painter.fillRect( self.rect(), Qt.white )
+
+        left = self.margin_left
+        top = self.margin_top
+        width = self.width() - self.margin_left - self.margin_right
+        height = self.height() - self.margin_top - self.margin_bottom
+        if width < 2 or height < 2 or self.end <= self.start:
+            return
+
+        t0 = self.offset + self.start / self.sample_rate
+        t1 = self.offset + max( self.end - 1, self.start + 1 ) / self.sample_rate        # Last sample at right edge, as matplotlib
+
+        def x_px( t ):
+            return left + ( t - t0 ) / ( t1 - t0 ) * width
+
+        def y_px( v ):
+            return top + ( self.ylim - v ) / ( 2 * self.ylim ) * height
+
+        # -----------------------------------------------
+        #   Grid and tick labels
+
+        metrics = painter.fontMetrics()
+        painter.setPen( QPen( QColor( '#d0d0d0' ), 1 ))
+
+        xticks = nice_ticks( t0, t1, max( 2, width // 100 ))
+        yticks = nice_ticks( -self.ylim, self.ylim, max( 2, height // 40 ))
+
+        for t in xticks:
+            painter.drawLine( QPointF( x_px( t ), top ), QPointF( x_px( t ), top + height ))
+        for v in yticks:
+            painter.drawLine( QPointF( left, y_px( v )), QPointF( left + width, y_px( v )))
+
+        painter.setPen( Qt.black )
+        for t in xticks:
+            txt = f"{t:.4g}"
+            painter.drawText( QPointF( x_px( t ) - metrics.horizontalAdvance( txt ) / 2, top + height + metrics.height() ), txt )
+        for v in yticks:
+            txt = f"{v:.3g}"
+            painter.drawText( QPointF( left - 6 - metrics.horizontalAdvance( txt ), y_px( v ) + metrics.ascent() / 2 - 1 ), txt )
+
+        txt = "Time (sec)"
+        painter.drawText( QPointF( left + ( width - metrics.horizontalAdvance( txt )) / 2, top + height + 2 * metrics.height() + 2 ), txt )
+
+        txt = "Amplitude"
+        painter.save()
+        painter.translate( metrics.height(), top + ( height + metrics.horizontalAdvance( txt )) / 2 )
+        painter.rotate( -90 )
+        painter.drawText( 0, 0, txt )
+        painter.restore()
+
+        painter.drawRect( left, top, width, height )
+
+        # -----------------------------------------------
+        #   Signal, clipped to the plot area
+
+        painter.setClipRect( left, top, width + 1, height + 1 )
+        painter.setRenderHint( QPainter.Antialiasing )
+        painter.setPen( QPen( QColor( '#1f77b4' ), 1 ))         # matplotlib's default blue
+
+        cols = self.pyramid.columns( self.start, self.end, width )
+
+        if cols is None:
+            samples = self.pyramid.signal[ self.start:self.end ]
+            xs = x_px( self.offset + ( self.start + np.arange( len( samples ))) / self.sample_rate )
+            ys = y_px( samples )
+            painter.drawPolyline( QPolygonF( [ QPointF( x, y ) for x, y in zip( xs, ys ) ] ))
+
+        else:
+            lo, hi = cols
+            prev_lo = lo[:-1].copy()
+            prev_hi = hi[:-1].copy()
+            lo[1:] = np.minimum( lo[1:], prev_hi )          # Overlap each column with its neighbor
+            hi[1:] = np.maximum( hi[1:], prev_lo )          #   so the trace has no gaps
+            ys_lo = y_px( lo )
+            ys_hi = y_px( hi )
+            painter.drawLines( [ QLineF( left + i + .5, a, left + i + .5, b ) for i, ( a, b ) in enumerate( zip( ys_hi, ys_lo )) ] )
+
+        if self.playhead is not None and self.start <= self.playhead < self.end:
+            x = x_px( self.offset + self.playhead / self.sample_rate )
+            painter.setPen( QPen( QColor( '#d00000' ), 2 ))
+            painter.drawLine( QPointF( x, top ), QPointF( x, top + height ))
+
+# -------------------------------------------------------------------------------
@@ -5,6 +5,7 @@
 
 import os
 import sys
+import hashlib
 from pathlib import Path
 import datetime
 from Store import Store
@@ -44,6 +45,15 @@ X-KDE-Username=
 """
 
 # ------------------------------------------------------------------------------------
+#   WRW 20-July-2025 - Hash of the content without the Generated: line so a file
+#       that differs only in its date isn't rewritten on every launch.
+
+def content_hash( text ):
+    lines = [ line for line in text.splitlines() if not line.startswith( '#   Generated:' ) ]
+    return hashlib.sha256( '\n'.join( lines ).encode( 'utf-8' )).hexdigest()
+
+# ------------------------------------------------------------------------------------
+#   Returns True if the file was written, False if it was already up to date.
 
 def make_desktop():
 
@@ -113,7 +123,14 @@ def make_desktop():
     # if opath.is_file():
     #     print( f"NOTE: {opath} exists, overwriting", file=sys.stderr )
 
+    try:
+        if content_hash( opath.read_text() ) == content_hash( d ):
+            return False
+    except ( OSError, UnicodeDecodeError ):
+        pass                                    # Missing or unreadable, write it
+
     opath.write_text( d )
+    return True
 
 # ------------------------------------------------------------------------------------
 
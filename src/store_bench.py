@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   store_bench.py - WRW 23-July-2025
+#   Micro-benchmark of Store reads, the patterns the paint and play paths use.
+#   Nanoseconds per operation, best of several timeit repeats. No Qt needed,
+#   Const is stood in for by a plain class with the same kind of attributes.
+
+#       store_bench.py [-n NUMBER] [-r REPEAT]
+# -------------------------------------------------------------------------------
+
+import sys
+import timeit
+import argparse
+
+from Store import Store, DotDict
+
+# -------------------------------------------------------------------------------
+
+class BenchConst():
+    loss_db_min = 0
+    loss_db_max = 80
+    pointDiameter = 4
+
+CASES = [
+    ( 'Store()',                        'Store()' ),
+    ( 's.Const.attr',                   's.Const.loss_db_max' ),
+    ( 'Store().Const.attr',             'Store().Const.loss_db_max' ),
+    ( 's.field, slot',                  's.scope_dialog_showing' ),
+    ( 's.other, instance dict',         's.bench_value' ),
+    ( 's.dotdict.a.b, nested',          's.bench_nested.a.b' ),
+    ( 'DotDict .key',                   'd.key' ),
+    ( 'DotDict ["key"]',                "d['key']" ),
+    ( 's.Const x3, per graph point',    's.Const.pointDiameter; s.Const.loss_db_min; s.Const.loss_db_max' ),
+    ( 's.snapshot(), unchanged',        's.snapshot()' ),
+    ( 'snap.Const.attr',                'snap.Const.loss_db_max' ),
+    ( 'write, then s.snapshot()',       's.bench_value = 1; s.snapshot()' ),
+]
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( prog='store_bench', description="Time Store attribute reads." )
+    parser.add_argument( '-n', '--number', type=int, default=200000, help="Operations per repeat, default 200000" )
+    parser.add_argument( '-r', '--repeat', type=int, default=7, help="Repeats, best is reported, default 7" )
+    args = parser.parse_args( argv )
+
+    s = Store()
+    s.Const = BenchConst()
+    s.scope_dialog_showing = False
+    s.bench_value = 1
+    s.bench_nested = { 'a': { 'b': 2 }}
+    d = DotDict( key=3 )
+    snap = s.snapshot()
+    names = { 's': s, 'd': d, 'snap': snap, 'Store': Store }
+
+    overhead = min( timeit.repeat( 'pass', number=args.number, repeat=args.repeat )) / args.number
+
+    print( f"Python {sys.version.split()[0]}, {args.number} operations x {args.repeat} repeats, loop overhead removed" )
+    for label, stmt in CASES:
+        best = min( timeit.repeat( stmt, globals=names, number=args.number, repeat=args.repeat )) / args.number
+        print( f"    {label:30} {( best - overhead ) * 1e9:7.1f} ns" )
+
+# -------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+# -------------------------------------------------------------------------------
@@ -54,6 +54,7 @@
 # -------------------------------------------------------------------------------------
 #   Generate resource file:
 #       pyside6-rcc what_resources.qrc -o what_resources_rc.py
+#       pyside6-rcc --binary what_resources.qrc -o what_resources.rcc
 
 # =======================================================================================
 #   The imports here up to do_splash_screen() are the minimum required for splash screen.
@@ -64,6 +65,30 @@
 import os
 import sys
 
+#   WRW 17-July-2025 - Startup timing, see Startup.py. First so the clock starts early.
+
+from Startup import startup
+
+#   WRW 21-July-2025 - Quit as soon as the window has painted, nothing saved.
+#       For what_bench.py, with WHAT_STARTUP_REPORT set to get the timing.
+
+Exit_After_Show = '--exit-after-show' in sys.argv
+
+#   WRW 22-July-2025 - A second launch hands its arguments to the running instance
+#       and exits here, before the rest of Qt, the splash screen or PortAudio.
+#       See Instance.py. --new-instance starts another one regardless.
+
+New_Instance = '--new-instance' in sys.argv
+
+if not ( New_Instance or Exit_After_Show ):
+    startup.phase( "Check running instance" )
+    from Const import Const
+    from Instance import forward_to_running
+    if forward_to_running( Const.What_Program_Name, sys.argv[1:] ):
+        sys.exit( 0 )
+
+startup.phase( "Import Qt" )
+
 #   Trying to eliminate error message:
 #       qt.core.qobject.connect: QObject::connect: No such signal Solid::Backends::Fstab::FstabStorageAccess::checkRequested(QString)
 #       qt.core.qobject.connect: QObject::connect: No such signal Solid::Backends::Fstab::FstabStorageAccess::checkDone(Solid::ErrorType, QVariant, QString)
@@ -72,92 +97,46 @@ import sys
 # os.environ["QT_QPA_PLATFORMTHEME"] = 'gtk3'    # "gtk3"  # or unset completely
 
 from PySide6 import QtCore
-from PySide6.QtCore import Qt, QStandardPaths, QCoreApplication
+from PySide6.QtCore import Qt, QStandardPaths, QCoreApplication, QResource
 from PySide6.QtGui import QFont, QPixmap, QPainter, QFontMetrics, QColor
 from PySide6.QtWidgets import QApplication, QSplashScreen, QDialog, QLabel, QVBoxLayout
 
 from Store import Store
 
-#   Need this even though not directly referenced. DON'T Comment Out!
+# -----------------------------------------------------------
+#   WRW 18-July-2025 - Resources from the binary what_resources.rcc, built with
+#       pyside6-rcc --binary, when it is there. Qt memory-maps it, nothing to parse
+#       or unmarshal. Otherwise from what_resources_rc.py, about 41,000 lines of byte
+#       literals, as before. The build scripts bundle both, so a frozen build uses the
+#       .rcc and falls back to the module only if the .rcc is missing.
+#   WRW 27-July-2025 - The .rcc is a build output, not in git. Running from source
+#       a local one older than what_resources.qrc is stale, use the module instead.
+
+#   what_resources_rc: Need this even though not directly referenced. DON'T Comment Out!
 #   Must be imported at least once. Has side effects when imported,
 #   calls qRegisterResourceData().
 
-import what_resources_rc
-import what_version
+def register_resources():
+    base = getattr( sys, '_MEIPASS', None ) or os.path.dirname( os.path.abspath( __file__ ))
+    rcc = os.path.join( base, 'what_resources.rcc' )
+    qrc = os.path.join( base, 'what_resources.qrc' )            # Not in a frozen build
+    stale = os.path.isfile( qrc ) and os.path.isfile( rcc ) and os.path.getmtime( rcc ) < os.path.getmtime( qrc )
+    if os.path.isfile( rcc ) and not stale and QResource.registerResource( rcc ):
+        return rcc
 
-# -----------------------------------------------------------
-#   Consolidate most constants here in one spot. This has to
-#   be above instantiation in do_dialog_splash()
+    import what_resources_rc
+    return what_resources_rc.__file__
 
-class Const():
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        Frozen = True
-        Package_Type = 'PyInstaller'                                                    
+startup.phase( "Register resources" )
+Resource_Source = register_resources()
 
-    else:
-        Frozen = False
-        Package_Type = 'Development'
-
-    # ---------------------------------------------
-
-    if sys.platform.startswith("win"):
-        Platform = 'Windows'
-    elif sys.platform.startswith("darwin"):
-        Platform = 'macOS'                          # This is an internal designation used only within birdland.
-    elif sys.platform.startswith("linux"):
-        Platform = 'Linux'
-    else:
-        Platform = 'Unknown'
-
-    # ---------------------------------------------
-
-    What_Program_Name = "What"      # desktop filename comes from this
-    What_Short_Title = 'What?'
-    What_Full_Title = "What? (Bill's Hearing Test)"
-    What_Desktop =      f"{What_Program_Name}.desktop"
-
-    QCoreApplication.setApplicationName( What_Program_Name )      # Must do this early as used in QStandardPaths below
-    stdApplication = QStandardPaths.writableLocation(QStandardPaths.ApplicationsLocation)
-    stdConfig = QStandardPaths.standardLocations(QStandardPaths.AppConfigLocation)[0]
-    Confdir = stdConfig
-
-    Quick_Start = ":quick-start.html"
-    What_Splash_Image = ':Images/ear-horn-640.png'
-    License = ':License.txt'
-
-    What_Icon_ICO = ":/Images/ear-64.ico"
-    What_Icon_PNG = ":/Images/ear-64.png"
-
-    Icon_File_ICO = 'ear-64.ico'
-    Icon_File_PNG = 'ear-64.png'
-
-    pointDiameter = 4
-    markerDiameter = 30
-    markerPen = 2
-    graphBG = '#e0e0ff'             # for dark: graphBG = '#26313d'
-
-    Settings_Config_File = 'what.settings.conf'
-    Copyright = f"Copyright \xa9 2025 Bill Wetzel"
-    plot_width_in = 10
-    plot_height_in = 7.5
-    Version = f"{what_version.__version__} Build {what_version.__build__}"
-
-    test_gain_points_per_db = 1
-    test_points_per_octave = 4
-    start_freq = 125
-    end_freq = 16000
-
-    graphPointsPerOctave = 5
-    graphPointsPer10dB  = 5
+import what_version
 
-    loss_db_min = 0
-    loss_db_max = 80
-    gain_db_min = -80
-    gain_db_max = 0
-    reference_level = -80      # For hearing-loss conversion
+# -----------------------------------------------------------
+#   WRW 13-July-2025 - Const moved to Const.py so what_render.py can use it
+#       without the splash screen and the rest of what.py.
 
-    def set( self, name, value ):
-        setattr( self, name, value )
+from Const import Const
 
 # -----------------------------------------------------------
 
@@ -267,6 +246,7 @@ def do_dialog_splash( ):
 
     QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)    
     s.app = QApplication(sys.argv)
+    start_instance_server()             # WRW 22-July-2025 - As soon as there is an application
     s.originalStyle = s.app.style().objectName()
 
     s.splash_pix = makeSplashPixmap( QPixmap(s.Const.What_Splash_Image), s.Const.What_Short_Title, s.Const.Version )
@@ -281,13 +261,34 @@ def do_dialog_splash( ):
     s.splash.show()
     s.app.processEvents()       # Force paint before continuing
 
+# ------------------------------------------------------------------------------------
+#   WRW 22-July-2025 - Listen for later launches, they are answered from now on
+#       and handed to MainWindow.other_launch() once it exists. Called from
+#       do_dialog_splash() right after the QApplication is made, so the time
+#       between the check above and listening is short. A launch that started
+#       in that time is found by listen() and this one exits instead.
+
+Instance_Server = None
+
+def start_instance_server():
+    global Instance_Server
+    if New_Instance or Exit_After_Show:
+        return
+    from Instance import InstanceServer
+    Instance_Server = InstanceServer( Const.What_Program_Name )
+    if not Instance_Server.listen( sys.argv[1:] ):
+        sys.exit( 0 )
+
 # ------------------------------------------------------------------------------------
 #   Show the splash screen before any further includes and initialization.
 
+startup.phase( "Splash screen" )
 do_dialog_splash( )
+startup.mark( "splash shown" )
 
 def do_splash_progress( txt ):      # So don't have to have s as a global.
     s = Store()
+    startup.phase( txt )            # WRW 17-July-2025 - Each message starts a timed phase
     s.splash_pix.progress( txt )
 
 # =======================================================================================
@@ -295,15 +296,15 @@ def do_splash_progress( txt ):      # So don't have to have s as a global.
 #   delay on macOS, might as well keep. Delay was from importing matplotlib, now deferred
 #   until needed for plotting.
 
-do_splash_progress( "Importing numpy" )
-import numpy as np
+#   WRW 19-July-2025 - numpy and sounddevice are no longer imported here, they load
+#       in the background once the window shows, see AudioStack.py.
 
 do_splash_progress( "Importing remaining system modules" )
 import random
 import re
 import math
 import datetime
-import sounddevice as sd
+import sqlite3
 from collections import defaultdict
 from collections import OrderedDict
 from enum import IntEnum
@@ -311,10 +312,11 @@ from pathlib import Path
 import traceback
 import platform
 import ctypes
+import functools
 
 do_splash_progress( "Importing QtCore" )
 from PySide6.QtCore import QSize, Signal, Slot, QRect, QFile, QTextStream, QSettings
-from PySide6.QtCore import QStandardPaths, QTimer
+from PySide6.QtCore import QStandardPaths, QTimer, QEventLoop
 
 do_splash_progress( "Importing QtGui" )
 from PySide6.QtGui import QPen, QFontDatabase, QKeyEvent, QAction, QCursor, QIcon, QGuiApplication
@@ -326,8 +328,16 @@ from PySide6.QtWidgets import QFileDialog, QMessageBox
 from PySide6.QtWidgets import QMenuBar, QMenu, QFormLayout, QDialogButtonBox
 from PySide6.QtWidgets import QTextBrowser, QTextEdit 
 
-from Player import Player
-from Scope import ScopeDialog
+from ToneCache import ToneCache
+from AudioStack import AudioStack
+from Graph import make_graph_widget
+from Export import ExportQueue
+from Warmup import WarmUp, warmup_steps
+from Deferred import DeferredTasks
+from ViewState import ViewState
+from Session import audiogram_title, audiogram_filename, make_session, save_session, SESSION_SUFFIX, EAR_NAMES
+from Session import PresentationLog, RESPONSE_NONE, RESPONSE_REJECT, RESPONSE_ACCEPT
+from Results import ResultsDB
 from make_desktop import make_desktop
 
 do_splash_progress( "Imports done" )
@@ -356,7 +366,9 @@ class IM( IntEnum ):
 
 # -------------------------------------------------------------------------------------
 #   WRW 22-June-2025 - from chat
+#   WRW 20-July-2025 - Cached, each LCDLabel asked and families() lists every installed font.
 
+@functools.cache
 def get_monospace_font():
     preferred = ["Menlo", "Consolas", "Courier New", "Courier", "Monospace"]
     available = QFontDatabase.families()  # Static call now
@@ -423,7 +435,7 @@ class Config():
             QMessageBox.critical( None, "Critical error", txt )
             sys.exit(1)
 
-        path.mkdir()
+        path.mkdir( parents=True )         # WRW 20-July-2025 - Parent may not exist yet on a fresh account
         self.initialize_config_directory_content( )
 
     # --------------------------------------------------------------------------
@@ -493,12 +505,16 @@ class ColorIndicator( QLabel ):
     def __init__(self, size=27, parent=None):       # Size to match height of lcd
         super().__init__(parent)
         self._size = size
+        self.color = None
         self.setFixedSize(QSize(size, size))
         # self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         # self.setAlignment(Qt.AlignCenter)
         self.setColor( '#c0c0c0' )
 
     def setColor(self, color):
+        if color == self.color:             # WRW 25-July-2025 - A style sheet change repolishes the widget
+            return
+        self.color = color
         self.setStyleSheet(f"background-color: {color}; border: 1px solid black;")
 
 # -------------------------------------------------------------------------------------
@@ -532,239 +548,6 @@ class LCDLabel( QLabel ):
     def display(self, value):
         self.setText(str(value).rjust(self.digit_count))
 
-# -------------------------------------------------------------------------------------
-#   GraphWidget - The graph showing the audiogram
-#   Coordinates: 0, 0 is upper left.
-
-class GraphWidget( QWidget ):
-    pointClicked = Signal(float, float)  # freq, gain_db
-
-    def __init__(self, loss_db_min, loss_db_max, parent=None ):
-        super().__init__(parent)
-        self.points = []
-        self.margin_x = 40              # Margin in the X-direction on the Y-axis
-        self.margin_y = 30              # Margin in the Y-direction on the X-axis
-        self.loss_db_min = loss_db_min
-        self.loss_db_max = loss_db_max
-        self.marker = None              # WRW 16-June-2025 - Show marker where tone is being played.
-
-    def set_parameters( self, start_freq, end_freq ):   # WRW 19-June-2025 - separate from __init__()
-        self.start_freq = start_freq    
-        self.end_freq = end_freq
-
-    def add_point( self, x, y, accept ):
-        self.points.append((x, y, accept ))
-        self.update()
-
-    def remove_point( self, xr, yr ):
-        self.points = [ (x, y, z ) for x, y, z in self.points if x != xr or y != yr ]
-        self.update()
-
-    def get_accepted_points( self ):
-        return [ (x, y) for x, y, z in self.points if z ]
-
-    def clear_points( self ):
-        self.points = []
-        self.update()
-
-    def set_marker( self, x, y, color ):
-        self.marker = (x, y, color )
-        self.update()
-
-    def clear_marker( self ):
-        self.marker = None
-        self.update()
-
-    def octave_grid_lines( self, start=125, stop=16000, divisions_per_octave=5 ):
-        n_start = np.log2(start)
-        n_stop = np.log2(stop)
-        steps = np.arange(n_start, n_stop + 1e-6, 1 / divisions_per_octave)
-        return 2 ** steps
-
-    def loss_grid_lines( self, start=0, stop=80, divisions_per_10dB = 1):
-        steps = np.arange(start, stop + 1e-6, 10 /  divisions_per_10dB )
-        return steps.astype( int )
-
-    def paintEvent(self, event):
-        s = Store()
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        width = self.width()
-        height = self.height()
-
-        self.graph_width = width - 2 * self.margin_x
-        graph_height = height - 2 * self.margin_y
-
-        # --------------------------------------------------
-        # Draw background
-
-        painter.fillRect(self.rect(), QColor(s.Const.graphBG))
-
-        # --------------------------------------------------
-        # Set pen for grid lines
-
-        sub_grid_pen = QPen(QColor( '#909090' ), 1, Qt.DotLine)
-        grid_pen = QPen(QColor( '#707070' ), 1, Qt.DashLine)
-
-        # --------------------------------------------------
-        # Horizontal grid lines and labels for Y axis
-
-        self.major_losses = self.loss_grid_lines( s.Const.loss_db_min, s.Const.loss_db_max, 1 )
-        self.minor_losses = self.loss_grid_lines( s.Const.loss_db_min, s.Const.loss_db_max, 5 )
-        self.minor_losses = np.setdiff1d( self.minor_losses, self.major_losses) # Remove major from minor
-
-        for loss in self.major_losses:
-            y_px = self.margin_y + ( loss - s.Const.loss_db_min) / (s.Const.loss_db_max - s.Const.loss_db_min) * graph_height
-            painter.setPen(grid_pen)
-            painter.drawLine(self.margin_x, y_px, width - self.margin_x, y_px)
-
-            painter.setPen(Qt.black)
-            painter.drawText( 15, y_px +2 , f"{loss:.0f}")      # +2 to center text relative to line
-
-        # ---------------------------------------------------------------
-        #   WRW 24-June-2025 - Add lighter intermediate grid lines
-
-        painter.setPen(sub_grid_pen)
-
-        for loss in self.minor_losses:
-            y_px = self.margin_y + ( loss - s.Const.loss_db_min) / (s.Const.loss_db_max - s.Const.loss_db_min) * graph_height
-            painter.drawLine(self.margin_x, y_px, width - self.margin_x, y_px)
-
-        # ---------------------------------------------------------------
-        #   Generate the frequencies for the graph, not the test frequencies.
-
-        self.major_freqs = self.octave_grid_lines( self.start_freq, self.end_freq, 1 )
-        self.minor_freqs = self.octave_grid_lines( self.start_freq, self.end_freq, s.Const.graphPointsPerOctave )
-        self.minor_freqs = np.setdiff1d( self.minor_freqs, self.major_freqs)    # Remove major from minor
-
-        # ---------------------------------------------------------------
-        #   WRW 24-June-2025 - Draw lighter intermediate grid lines first
-        #       Major lines will overlay.
-
-        painter.setPen(sub_grid_pen)
-
-        for freq in self.minor_freqs:
-            x_pixel = self.map_freq(freq, self.graph_width)
-            painter.drawLine(x_pixel, self.margin_y, x_pixel, height - self.margin_y)
-
-        # --------------------------------------------------
-        #   Draw vertical grid lines and label the X axis
-
-        for freq in self.major_freqs:
-            painter.setPen(grid_pen)
-
-            x_pixel = self.map_freq(freq, self.graph_width)
-            painter.drawLine(x_pixel, self.margin_y, x_pixel, height - self.margin_y)
-
-            painter.setPen(Qt.black)
-
-            txt = f"{int(freq):,}"
-            metrics = painter.fontMetrics()
-            text_width = metrics.horizontalAdvance(txt)
-
-            painter.drawText( x_pixel - text_width//2, height-self.margin_y+20, txt )   # // integer div to avoid blurry text on some platforms
-
-        # --------------------------------------------------
-        # Draw axes - The solid boundary lines on X and Y axex.
-
-        axis_pen = QPen(Qt.black, 2)
-        painter.setPen(axis_pen)
-        painter.drawLine(self.margin_x, self.margin_y, self.margin_x, height - self.margin_y)  # Y axis
-        painter.drawLine(self.margin_x, height - self.margin_y, width - self.margin_x, height - self.margin_y)  # X axis
-
-        # --------------------------------------------------
-        # Draw points
-
-        for x_val, y_val, accept in self.points:
-            dia = s.Const.pointDiameter
-            if accept:
-                color = '#0000ff'
-            else:
-                color = '#ff0000'
-
-            painter.setPen(QPen(QColor(color), dia ))
-            x_px = self.map_freq(x_val, self.graph_width)
-            y_px = self.margin_y + (y_val - self.loss_db_min) / (self.loss_db_max - self.loss_db_min) * graph_height
-            # painter.drawPoint( x_px - dia/2, y_px - dia/2)
-            rect = QRect( x_px-dia/2, y_px-dia/2, dia, dia)
-            painter.drawEllipse(rect)
-
-        # --------------------------------------------------
-        #   Draw marker, if any.
-
-        if self.marker:
-            x_val = self.marker[0]
-            y_val = self.marker[1]
-            color = self.marker[2]
-            dia = s.Const.markerDiameter
-            pen = QPen( QColor(color), s.Const.markerPen )
-            painter.setPen( pen )
-            painter.setBrush(Qt.transparent )
-            x_px = self.map_freq(x_val, self.graph_width)
-            y_px = self.margin_y + (y_val - self.loss_db_min) / (self.loss_db_max - self.loss_db_min) * graph_height
-            rect = QRect( x_px-dia/2, y_px-dia/2, dia, dia)
-            painter.drawEllipse(rect)
-
-        # if hasattr(self, "last_click"):             # Keep for debugging int() roundoff problems
-        #     x, y = self.last_click
-        #     painter.setPen(QPen(Qt.red, 1))
-        #     painter.drawLine(x - 5, y, x + 5, y)
-        #     painter.drawLine(x, y - 5, x, y + 5)
-
-    # --------------------------------------------------
-    #   Convert linear frequency to point on graph in log scale.
-
-    def map_freq(self, freq, graph_width ):
-        log_min = math.log10(self.start_freq)
-        log_max = math.log10(self.end_freq)
-        log_freq = math.log10(freq)
-        return (log_freq - log_min) / (log_max - log_min) * graph_width + self.margin_x
-
-    # --------------------------------------------------------
-
-    def mousePressEvent(self, event):
-        self.setFocus()
-        if event.button() == Qt.LeftButton:
-            x = round( event.position().x())
-            y = round( event.position().y())
-            self.handle_click(x, y)
-
-    def handle_click(self, x_px, y_px):
-        s = Store()
-        # self.last_click = (x_px, y_px)        # Keep for debugging int() roundoff problems
-        # self.update()
-
-        width = self.width() - 2 * self.margin_x
-        height = self.height() - 2 * self.margin_y
-    
-        # Ensure click is inside plot area
-        if not (self.margin_x <= x_px <= self.width() - self.margin_x and
-                self.margin_y <= y_px <= self.height() - self.margin_y):
-            return
-    
-        # Convert X (log scale)
-        x_ratio = (x_px - self.margin_x) / width    # Per-unit position of click in graph, 0 -> 1
-        freq = self.start_freq * (self.end_freq / self.start_freq) ** x_ratio
-
-        # ---------------------------------------------------------------------
-        #   WRW 24-June-2025 - Quantize clicks for reproducibility
-        #   Quantizing points not related to generated points or genrated points options.
-        #   Quantize to graph grid
-
-        f0 = self.start_freq
-        n = round( np.log2( freq / f0 ) * s.Const.graphPointsPerOctave )
-        freq = f0 * 2 ** ( n/s.Const.graphPointsPerOctave )
-
-        # Convert Y (audiogram: 0 dB at top)
-        y_ratio = (y_px - self.margin_y) / height
-        hearing_loss = self.loss_db_min + (self.loss_db_max - self.loss_db_min) * y_ratio
-        loss_db = -hearing_loss
-    
-        qpp10db = s.Const.graphPointsPer10dB  # Quantize to qpp10db points per 10 dB
-        loss_db = round( loss_db * (qpp10db/10) ) / ( qpp10db/10 )
-
-        self.pointClicked.emit( freq, loss_db )
-
 # -------------------------------------------------------------------------------------
 
 class MainWindow( QMainWindow ):
@@ -781,26 +564,37 @@ class MainWindow( QMainWindow ):
         self.setup_menus( )
 
         # ------------------------------------------------------------------
-        #   Set up the player and test tones. Reused Player developed several years ago.
+        #   WRW 19-July-2025 - Player, tone cache and output stream are made by audio_ready()
+        #       at the first tone. numpy and sounddevice load in the background after
+        #       the window shows, started by finish_splash(), see AudioStack.py.
 
-        self.p = Player()
-        self.p.set_waveshape( 'sin' )       # 'sin' (default), 'sawtooth', 'square', 'triangle'.
+        self.audio_stack = AudioStack()
+        self.p = None
+        self.tone_cache = None
+        self.player = None
 
         self.dur = .20                      # Test tone total duration: attack + release + sustain. Repeated 3 times.
-        trans = .01                         # Attack and release time to prevent sharp edge
-        geom_flg = False                    # False for linear attack and release, True for geometric
-        self.p.set_envelope( adsr = [[0, 1, trans, geom_flg],           # Attack. Initial gain, final gain, duration, geometric
-                                    [1, 1, 0, geom_flg ],               # Decay
-                                    [1, 1, self.dur, geom_flg],         # Sustain
-                                    [1, 0, trans, geom_flg]] )          # Release
+
+        #   WRW 11-July-2025 - Save writes the audiogram on a worker thread, see do_save().
+
+        self.exporter = ExportQueue( self )
+        self.exporter.started.connect( self.export_started )
+        self.exporter.finished.connect( self.export_finished )
+        self.exporter.failed.connect( self.export_failed )
+
+        self.warmup = None              # WRW 12-July-2025 - Started by start_warmup() after splash closes
+        self.results_db = None          # WRW 15-July-2025 - Opened at first save by get_results_db()
 
         # ------------------------------------------------------------------
         #   Setup eye candy.
         #   Race condition between closeEvent() and scope_closed()
         #       that was previously caused by s.scope_dialog.rejected.connect( self.scope_closed )
+        #   WRW 4-July-2025 - Scope now created on first use by get_scope_dialog(), it
+        #       brings in matplotlib. scope_geometry is set from settings at startup.
 
-        s.scope_dialog = ScopeDialog( on_closed=self.scopeClosedCallback )
+        s.scope_dialog = None
         s.scope_dialog_showing = False
+        self.scope_geometry = None
 
         # ------------------------------------------------------------------
 
@@ -822,8 +616,10 @@ class MainWindow( QMainWindow ):
 
         self.setWindowTitle( self.windowTitle )
 
-        self.graph = GraphWidget( self.loss_db_min, self.loss_db_max, self )
+        self.graph = make_graph_widget( self.loss_db_min, self.loss_db_max, self )
         self.graph.pointClicked.connect( self.pointClick )
+        self.graph.pointHovered.connect( self.pointHover )
+        self.graph.hoverCancelled.connect( self.hoverCancel )
 
         self.playing = ColorIndicator( )
 
@@ -885,6 +681,12 @@ class MainWindow( QMainWindow ):
         radio_group.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         radio_group.setFocusPolicy(Qt.NoFocus)
 
+        #   WRW 16-July-2025 - History trend follows the ear and user name.
+
+        for radio in ( self.radio1, self.radio2, self.radio3 ):
+            radio.toggled.connect( lambda checked: checked and self.update_trend() )
+        self.user_text_box.editingFinished.connect( self.update_trend )
+
         # -----------------------------------------------
         control_layout = QHBoxLayout()
         control_layout.setSpacing(6)
@@ -930,6 +732,20 @@ class MainWindow( QMainWindow ):
         self.setLayout(outer_layout)
         self.setCentralWidget( container )
 
+        # -----------------------------------------
+        #   WRW 25-July-2025 - The state machine sets what to show in self.view, the
+        #       widgets get it once per dispatch. See ViewState.py.
+
+        self.view = ViewState( self )
+        self.view.subscribe( [ 'freq' ], lambda v: self.freq_lcd.display( v[ 'freq' ] ), self.freq_lcd )
+        self.view.subscribe( [ 'gain' ], lambda v: self.gain_lcd.display( v[ 'gain' ] ), self.gain_lcd )
+        self.view.subscribe( [ 'step' ], lambda v: self.completed_lcd.display( v[ 'step' ] ), self.completed_lcd )
+        self.view.subscribe( [ 'indicator' ], lambda v: self.playing.setColor( v[ 'indicator' ] ), self.playing )
+        self.view.subscribe( [ 'done' ], lambda v: self.done_label.setVisible( v[ 'done' ] ), self.done_label )
+        self.view.subscribe( [ 'state' ], lambda v: self.stateLabel.setText( v[ 'state' ] ), self.stateLabel )
+        self.view.subscribe( [ 'marker' ], self.show_marker, self.graph )
+        self.view.subscribe( [ 'status' ], self.show_status )        # showMessage() repaints itself
+
         # -----------------------------------------
 
         self.init_state_machine()
@@ -937,7 +753,7 @@ class MainWindow( QMainWindow ):
         # -----------------------------------------
         #   Restore saved parameters         
 
-        settings = QSettings( str( Path( s.Const.stdConfig, s.Const.Settings_Config_File )), QSettings.IniFormat )
+        settings = s.settings
         gain_points_per_10dB = settings.value("gain_points_per_10dB" )
         points_per_octave = settings.value("points_per_octave" )
         start_freq = settings.value("start_freq" )
@@ -986,8 +802,12 @@ class MainWindow( QMainWindow ):
         # self.test_freqs = np.logspace( np.log10(self.start_freq), np.log10(self.end_freq), num=self.points_total+1 )
         # print( "base 10", self.test_freqs )
 
-        self.test_freqs = np.logspace( np.log2(self.start_freq), np.log2(self.end_freq), num=self.points_total+1, base=2 )
-        self.test_freqs = np.round( self.test_freqs )
+        #   WRW 19-July-2025 - Was np.logspace() and np.round(), same values without numpy,
+        #       this runs before the window shows. Kept as float as np.round() gave.
+
+        log_start = math.log2( self.start_freq )
+        log_step = ( math.log2( self.end_freq ) - log_start ) / max( 1, self.points_total )
+        self.test_freqs = [ float( round( 2 ** ( log_start + i * log_step ))) for i in range( self.points_total + 1 ) ]
         random.shuffle( self.test_freqs )
 
         # -----------------------------------------
@@ -1030,6 +850,7 @@ class MainWindow( QMainWindow ):
     @Slot()
     def reset( self ):
         self.saved_flag = False
+        self.saves_pending = set()          # Exports of these results not yet finished
         self.sm_state = SM.S_Start
         self.sm_state = SM.S_Wait       # /// TESTING
         self.findex = 0
@@ -1041,18 +862,16 @@ class MainWindow( QMainWindow ):
         self.current_ck_gain_db = None              # Bug catcher
 
         self.graph.clear_points()
-        self.graph.clear_marker()
-        self.done_label.hide()
-        self.freq_lcd.display( 'Pitch' )
-        self.gain_lcd.display( 'Gain' )
-        self.completed_lcd.display( 'Step' )
-        self.status.showMessage( "Play next tone or click in graph.")
         self.stateStack = None
         self.processed = OrderedDict()
         self.processed_ck = OrderedDict()
+        self.presentations = PresentationLog()          # WRW 14-July-2025 - Every tone played, saved with the results
 
         initialStatus = "Current-State, Input --> fsm-function() --> Next-State" 
-        self.stateLabel.setText( initialStatus )
+
+        with self.view.batch():
+            self.view.set( marker=None, done=False, freq='Pitch', gain='Gain', step='Step', state=initialStatus )
+            self.set_status( "Play next tone or click in graph.")
 
     # ==============================================================================
     #   WRW 16-June-2025 - The user interactions were getting a bit awkward and the
@@ -1106,8 +925,29 @@ class MainWindow( QMainWindow ):
 
     @Slot( float, float )
     def pointClick( self, freq, hearing_loss ):
+        freq, gain_db = self.point_to_tone( freq, hearing_loss )
+        self.sm_proc_input( IM.I_Click, freq=freq, gain_db=gain_db )
+
+    # --------------------------------------------------------
+    #   WRW 2-July-2025 - Mouse dwelled over a point on the graph. Render the tone
+    #       a click there would play so it is ready when the click arrives.
+
+    #   WRW 19-July-2025 - Nothing to render with until the audio stack has loaded,
+    #       don't wait for it here. A failed load is reported at Play, not on hover.
+
+    @Slot( float, float )
+    def pointHover( self, freq, hearing_loss ):
+        if self.audio_stack.loaded() and self.audio_ready():
+            self.tone_cache.prefetch( self.point_to_tone( freq, hearing_loss ) )
+
+    @Slot()
+    def hoverCancel( self ):
+        if self.tone_cache:
+            self.tone_cache.cancel()
+
+    def point_to_tone( self, freq, hearing_loss ):
         gain_db = self.reference_level - round(hearing_loss, 1)
-        self.sm_proc_input( IM.I_Click, freq=int(freq), gain_db=gain_db )
+        return int(freq), gain_db
 
     # --------------------------------------------------------
     #   User pressed a key
@@ -1139,17 +979,21 @@ class MainWindow( QMainWindow ):
     #   Update current state with function return if not None.
 
     def sm_proc_input( self, input, **kwargs ):
+        if self.warmup:
+            self.warmup.cancel()        # WRW 12-July-2025 - User is testing, leave the CPU alone
+
         currentState = self.sm_state
         kwargs[ 'currentState' ] = currentState
 
         fcn = self.state_matrix[ input ][ self.sm_state ]
         if fcn:
-            nextState = fcn( kwargs )
-            if nextState is not None:
-                self.sm_state = nextState
-                self.stateLabel.setText( f"{currentState.name}, {input.name} --> {fcn.__name__}() --> {nextState.name}" )
-            else:
-                self.stateLabel.setText( f"{currentState.name}, {input.name} --> {fcn.__name__}() --> {currentState.name}" )
+            with self.view.batch():         # WRW 25-July-2025 - Widgets updated once, at the end
+                nextState = fcn( kwargs )
+                if nextState is not None:
+                    self.sm_state = nextState
+                    self.view.set( state=f"{currentState.name}, {input.name} --> {fcn.__name__}() --> {nextState.name}" )
+                else:
+                    self.view.set( state=f"{currentState.name}, {input.name} --> {fcn.__name__}() --> {currentState.name}" )
 
     # =========================================================================
     #   State machine functions. Returns next state or None to stay in current state.
@@ -1159,10 +1003,10 @@ class MainWindow( QMainWindow ):
     def sm_play( self, kwargs ):
         freq = self.current_freq
         gain_db = self.current_gain_db
-        self.completed_lcd.display( f"{self.findex+1}/{len(self.test_freqs)}" )
-        self.status.showMessage("Playing tone.")
+        self.view.set( step=f"{self.findex+1}/{len(self.test_freqs)}" )
+        self.set_status( "Playing tone." )
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage("Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
 
         if self.stateStack is not None:             # Returning from one of the SM_Click* states.
             t = self.stateStack
@@ -1186,10 +1030,10 @@ class MainWindow( QMainWindow ):
             freq = self.current_ck_freq
             gain_db = self.current_ck_gain_db
 
-        self.completed_lcd.display( "User" )
-        self.status.showMessage("Playing tone.")
+        self.view.set( step="User" )
+        self.set_status( "Playing tone." )
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage("Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
         return SM.S_ClickWait
 
     # ---------------------------------------------------------------------
@@ -1198,9 +1042,9 @@ class MainWindow( QMainWindow ):
     def sm_repeat( self, kwargs ):
         freq = self.current_freq
         gain_db = self.current_gain_db
-        self.status.showMessage("Playing tone.")
+        self.set_status( "Playing tone." )
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage("Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
         return None
 
     # ------------------------------------------------
@@ -1209,9 +1053,9 @@ class MainWindow( QMainWindow ):
     def sm_ckrepeat( self, kwargs ):
         freq = self.current_ck_freq
         gain_db = self.current_ck_gain_db
-        self.status.showMessage("Playing tone.")
+        self.set_status( "Playing tone." )
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage("Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
         return None
 
     # ---------------------------------------------------------------------
@@ -1222,20 +1066,20 @@ class MainWindow( QMainWindow ):
         self.findex += 1
 
         if self.findex == len( self.test_freqs ):
-            self.done_label.show()
-            self.status.showMessage("Test Complete.")
+            self.view.set( done=True )
+            self.set_status( "Test Complete." )
             return SM.S_Complete
 
         self.gindex = 0
 
-        self.completed_lcd.display( f"{self.findex+1}/{len(self.test_freqs)}" )
+        self.view.set( step=f"{self.findex+1}/{len(self.test_freqs)}" )
         freq = self.test_freqs[ self.findex ]
         gain_db = self.test_gains_db[ self.gindex ]
-        self.status.showMessage("Playing tone.")
+        self.set_status( "Playing tone." )
         self.current_freq = freq
         self.current_gain_db = gain_db
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage("Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
         return SM.S_Wait
 
     # ---------------------------------------------------------------------
@@ -1249,19 +1093,19 @@ class MainWindow( QMainWindow ):
             self.findex += 1
 
             if self.findex == len( self.test_freqs ):
-                self.done_label.show()
-                self.status.showMessage("Test Complete.")
+                self.view.set( done=True )
+                self.set_status( "Test Complete." )
                 return SM.S_Complete
 
         freq = self.test_freqs[ self.findex ]
         gain_db = self.test_gains_db[ self.gindex ]
 
-        self.completed_lcd.display( f"{self.findex+1}/{len(self.test_freqs)}" )
-        self.status.showMessage("Playing tone.")
+        self.view.set( step=f"{self.findex+1}/{len(self.test_freqs)}" )
+        self.set_status( "Playing tone." )
         self.current_freq = freq
         self.current_gain_db = gain_db
         self.play_test_tones( freq, gain_db )
-        self.status.showMessage( "Waiting for Accept / Reject.")
+        self.set_status( "Waiting for Accept / Reject." )
         return SM.S_Wait
 
     # ---------------------------------------------------------------------
@@ -1270,8 +1114,9 @@ class MainWindow( QMainWindow ):
     def sm_accept( self, kwargs ):
         hearing_loss = self.current_gain_db - self.reference_level
         self.graph.add_point( self.current_freq, hearing_loss, True )
-        self.status.showMessage("Accepted. Play next tone or click in graph.")
+        self.set_status( "Accepted. Play next tone or click in graph." )
         self.processed[ (self.current_freq, hearing_loss )] = True
+        self.presentations.respond( self.current_freq, self.current_gain_db, RESPONSE_ACCEPT )
         return SM.S_Accepted
 
     # ------------------------------------------------
@@ -1280,8 +1125,9 @@ class MainWindow( QMainWindow ):
     def sm_ckaccept( self, kwargs ):
         hearing_loss = self.current_ck_gain_db - self.reference_level
         self.graph.add_point( self.current_ck_freq, hearing_loss, True )
-        self.status.showMessage("Accepted. Play next tone or click in graph.")
+        self.set_status( "Accepted. Play next tone or click in graph." )
         self.processed_ck[ (self.current_ck_freq, hearing_loss )] = True
+        self.presentations.respond( self.current_ck_freq, self.current_ck_gain_db, RESPONSE_ACCEPT )
         return SM.S_ClickAccepted
 
     # ---------------------------------------------------------------------
@@ -1290,8 +1136,9 @@ class MainWindow( QMainWindow ):
     def sm_reject( self, kwargs  ):
         hearing_loss = self.current_gain_db - self.reference_level
         self.graph.add_point( self.current_freq, hearing_loss, False )
-        self.status.showMessage("Rejected. Play next tone or click in graph.")
+        self.set_status( "Rejected. Play next tone or click in graph." )
         self.processed[ (self.current_freq, hearing_loss )] = False
+        self.presentations.respond( self.current_freq, self.current_gain_db, RESPONSE_REJECT )
         return SM.S_Rejected
 
     # ------------------------------------------------
@@ -1300,8 +1147,9 @@ class MainWindow( QMainWindow ):
     def sm_ckreject( self, kwargs  ):
         hearing_loss = self.current_ck_gain_db - self.reference_level
         self.graph.add_point( self.current_ck_freq, hearing_loss, False )
-        self.status.showMessage("Rejected. Play next tone or click in graph.")
+        self.set_status( "Rejected. Play next tone or click in graph." )
         self.processed_ck[ (self.current_ck_freq, hearing_loss )] = False
+        self.presentations.respond( self.current_ck_freq, self.current_ck_gain_db, RESPONSE_REJECT )
         return SM.S_ClickRejected
 
     # ------------------------------------------------
@@ -1316,7 +1164,8 @@ class MainWindow( QMainWindow ):
             gain_db = loss + self.reference_level
 
             self.graph.remove_point( freq, loss )                       # Remove it from graph
-            self.graph.set_marker( freq, loss, '#00c000' )              # Mark where removed from
+            self.view.set( marker=( freq, loss, '#00c000' ))           # Mark where removed from
+            self.presentations.respond( freq, gain_db, RESPONSE_NONE )  # Answer withdrawn
 
             point = (freq, gain_db) 
             if point in self.reverse_map:
@@ -1327,18 +1176,17 @@ class MainWindow( QMainWindow ):
 
             self.findex = findex                                        # Restore self.findex/self.gindex to removed point
             self.gindex = gindex
-            self.completed_lcd.display( f"{self.findex+1}/{len(self.test_freqs)}" )
+            self.view.set( step=f"{self.findex+1}/{len(self.test_freqs)}" )
 
             self.current_freq = self.test_freqs[ self.findex ]
             self.current_gain_db = self.test_gains_db[ self.gindex ]
 
-            self.freq_lcd.display( f"{int(freq )} Hz")
-            self.gain_lcd.display( f"{int(gain_db )} dB")
+            self.view.set( freq=f"{int(freq )} Hz", gain=f"{int(gain_db )} dB" )
 
             return SM.S_Wait
 
         else:
-            self.status.showMessage( "No more test points.")
+            self.set_status( "No more test points." )
             return SM.S_Start
 
     # ------------------------------------------------
@@ -1350,51 +1198,118 @@ class MainWindow( QMainWindow ):
             gain_db = loss + self.reference_level
 
             self.graph.remove_point( freq, loss )                       # Remove it from graph      
-            self.graph.set_marker( freq, loss, '#00c000' )              # Mark where removed from
+            self.view.set( marker=( freq, loss, '#00c000' ))           # Mark where removed from
+            self.presentations.respond( freq, gain_db, RESPONSE_NONE )  # Answer withdrawn
 
-            self.completed_lcd.display( f"User" )
+            self.view.set( step="User" )
 
             self.current_ck_freq = freq
             self.current_ck_gain_db = gain_db
 
-            self.freq_lcd.display( f"{int(freq )} Hz")
-            self.gain_lcd.display( f"{int(gain_db )} dB")
+            self.view.set( freq=f"{int(freq )} Hz", gain=f"{int(gain_db )} dB" )
 
         else:
-            self.status.showMessage( "No more click points.")
+            self.set_status( "No more click points." )
 
         return SM.S_ClickWait
 
     # =========================================================================
 
+    #   WRW 19-July-2025 - Called before any tone. Waits for the background load if
+    #       it hasn't finished, with a busy cursor, then sets up the player once.
+    #       Returns False if audio can't be used, the tone is then skipped.
+
+    def audio_ready( self ):
+        s = Store()
+        if self.player is not None:
+            return True
+
+        try:
+            if self.audio_stack.done():
+                self.audio_stack.wait()
+            else:
+                self.set_status( "Starting audio ..." )
+                self.view.paint()
+                QApplication.setOverrideCursor( Qt.WaitCursor )
+                try:
+                    self.audio_stack.wait()
+                finally:
+                    QApplication.restoreOverrideCursor()
+                    self.clear_status()
+
+        except Exception as e:
+            QMessageBox.warning( self, "Audio", f"Audio output could not be started:\n{e}" )
+            return False
+
+        s.Verbose and print( f"/// audio_ready() loaded in {self.audio_stack.seconds*1000:.0f} ms, waited {self.audio_stack.waited*1000:.0f} ms" )
+
+        from Player import Player
+        from Audio import TonePlayer
+
+        #   Set up the player and test tones. Reused Player developed several years ago.
+
+        self.p = Player()
+        self.p.set_waveshape( 'sin' )       # 'sin' (default), 'sawtooth', 'square', 'triangle'.
+
+        trans = .01                         # Attack and release time to prevent sharp edge
+        geom_flg = False                    # False for linear attack and release, True for geometric
+        self.p.set_envelope( adsr = [[0, 1, trans, geom_flg],           # Attack. Initial gain, final gain, duration, geometric
+                                    [1, 1, 0, geom_flg ],               # Decay
+                                    [1, 1, self.dur, geom_flg],         # Sustain
+                                    [1, 0, trans, geom_flg]] )          # Release
+
+        #   WRW 2-July-2025 - Rendered tone sequences, filled ahead of time while the
+        #       mouse dwells over the graph and reused for Repeat.
+
+        self.tone_cache = ToneCache( self.make_test_tones, s.Const.tone_cache_size )
+        self.player = TonePlayer()      # WRW 7-July-2025 - Replaces sd.play()/sd.wait(), feeds live scope
+        return True
+
+    # --------------------------------------------------------
+
     def play_test_tone( self ):
+        if not self.audio_ready():
+            return
+
         test_freq = 1000
         test_gain_db = 0
         test_gain = 10 ** (test_gain_db/20)
 
-        self.playing.setColor( '#00ff00' )
-        self.freq_lcd.display( f"{int(test_freq )} Hz")
-        self.gain_lcd.display( f"{int(test_gain_db )} dB")
-        QApplication.processEvents()
+        self.view.set( indicator='#00ff00', freq=f"{int(test_freq )} Hz", gain=f"{int(test_gain_db )} dB" )
+        self.view.paint()
         tone = self.gen_tone( test_freq, .75, test_gain )     # play tone for .75 seconds
         self.play_tone( tone )
-        self.playing.setColor( '#c0c0c0' )
+        self.view.set( indicator='#c0c0c0' )
 
     # ------------------------------------------------------------------------------
     #   Alt functions generate the entire three tone/silence sequence before starting
     #   playback. When switched to sounddevice got buffer underruns when doing each separately.
 
     def play_test_tones( self, freq, gain_db ):
-        self.freq_lcd.display( f"{int(freq)} Hz")
-        # self.gain_lcd.display( f"{int(gain_db )} dB")
-        self.gain_lcd.display( f"{round(gain_db,1)} dB")
+        if not self.audio_ready():
+            return
 
-        self.playing.setColor( '#00ff00' )
         loss = gain_db - self.reference_level
-        self.graph.set_marker( freq, loss, '#00c000' )
-        self.playing.repaint()              # 23-June-2025, problem on macOS - color not showing, this resolved
-        QApplication.processEvents()        # To give lcd and label a chance to change.
+        self.view.set( freq=f"{int(freq)} Hz", gain=f"{round(gain_db,1)} dB", indicator='#00ff00', marker=( freq, loss, '#00c000' ))
+
+        #   23-June-2025, problem on macOS - color not showing, repaint() resolved it.
+        #   WRW 25-July-2025 - paint() repaints the widgets that changed, once, replaces
+        #       repaint() of the indicator and processEvents() for the lcds and label.
+
+        self.view.paint()
+
+        tones = self.tone_cache.get( (freq, gain_db) )
+        self.presentations.add( freq, gain_db, self.get_smode() )
+        self.play_tone( tones, meta=( freq, gain_db ))
+
+        self.view.set( indicator='#808080' )
+
+    # ------------------------------------------------------------------------------
+    #   WRW 2-July-2025 - Split out of play_test_tones() so the tone sequence can be
+    #       rendered ahead of time on the ToneCache thread. Touches only self.p and self.dur.
 
+    def make_test_tones( self, freq, gain_db ):
+        import numpy as np                  # WRW 19-July-2025 - Loaded by now, see audio_ready()
         gain = 10 ** (gain_db/20)
 
         tones = []
@@ -1412,9 +1327,7 @@ class MainWindow( QMainWindow ):
                 else:
                     tones = np.concatenate( [tones, tone] )    # combine in one buffer
 
-        self.play_tone( tones )
-
-        self.playing.setColor( '#808080' )
+        return tones
 
     # --------------------------------------------------------
     #   simpleaudio.play_buffer(audio_data, num_channels, bytes_per_sample, sample_rate)
@@ -1425,30 +1338,46 @@ class MainWindow( QMainWindow ):
         return audio
 
     # --------------------------------------------------------
-    def play_tone( self, audio ):
+    def play_tone( self, audio, meta=None ):
+        import numpy as np
         s = Store()
         self.fs = 44100
 
+        #   WRW 7-July-2025 - Live scope gets the output block by block from the player,
+        #       otherwise the whole buffer is shown before playing as before.
+
+        #   WRW 9-July-2025 - meta ( freq, gain_db ) gets the ear added and the stimulus
+        #       goes into the scope history.
+
+        ring = None
         if s.scope_dialog_showing:
-            s.scope_dialog.update_signal( audio )
-            QApplication.processEvents()        # To give scope a chance to show graph.
+            if meta is not None:
+                ear = 'Left' if self.radio2.isChecked() else 'Right' if self.radio3.isChecked() else 'Binaural'
+                meta = ( *meta, ear )
+            s.scope_dialog.update_signal( audio, meta )
+            ring = s.scope_dialog.live_ring()
+            if ring is None:
+                QApplication.processEvents()        # To give scope a chance to show graph.
 
-        if self.radio1.isChecked():         # Binaural
-            sd.play( audio, self.fs )
+        #   Binaural (radio1) plays audio as is.
 
         #   Left-only: [L, R, L, R, ...] = [tone, 0, tone, 0, ...]
-        elif self.radio2.isChecked():               
+        if self.radio2.isChecked():               
             right = np.zeros_like(audio)
             audio = np.column_stack((audio, right)).astype(np.float32)
-            sd.play( audio, self.fs )
 
         #   Right-only: [L, R, L, R, ...] = [0, tone, 0, tone, ...]
         elif self.radio3.isChecked():                
             left = np.zeros_like(audio)
             audio = np.column_stack((left, audio)).astype(np.float32)
-            sd.play( audio, self.fs )
 
-        sd.wait()
+        self.player.ring = ring
+        self.player.play( audio, self.fs, pump=self.pump_scope if ring else None )
+
+    #   Let the live scope's timer run while a tone plays, user input stays blocked as with sd.wait().
+
+    def pump_scope( self ):
+        QApplication.processEvents( QEventLoop.ExcludeUserInputEvents )
 
     # -----------------------------------------------------------------
     #   WRW 28-June-2025 - User clicked Exit button or Quit from menu. 
@@ -1459,11 +1388,18 @@ class MainWindow( QMainWindow ):
         s = Store()
         s.Verbose and print( "/// do_quit()", s.scope_dialog_showing )
 
+        self.finish_saves()
         if not self.do_exit_test():
             return                  #   User doesn't really want to exit.
 
         self.do_save_state()        #   Otherwise save state and quit. Do before scope_dialog.close() as that changes state.
-        s.scope_dialog.close()      #   Close the dialog window whether it is open or not, no issue if not.
+        if s.scope_dialog:
+            s.scope_dialog.close()  #   Close the dialog window whether it is open or not, no issue if not.
+        if self.tone_cache:
+            self.tone_cache.shutdown()
+        self.exporter.shutdown()        #   Finish any queued saves
+        self.stop_warmup()
+        self.close_results_db()
         self.exitPrepFlag = True
         QApplication.quit()         #   End things gracefully. Will trigger closeEvent()
 
@@ -1497,14 +1433,16 @@ class MainWindow( QMainWindow ):
 
     def do_save_state( self ):
         s = Store()
-        settings = QSettings( str( Path( s.Const.stdConfig, s.Const.Settings_Config_File )), QSettings.IniFormat )
+        settings = s.settings
         settings.setValue( "gain_points_per_10dB", self.gain_points_per_10dB )
         settings.setValue( "points_per_octave", self.points_per_octave )
         settings.setValue( "start_freq", self.start_freq )
         settings.setValue( "end_freq", self.end_freq )
         settings.setValue( "geometry", self.saveGeometry())
-        settings.setValue( "scope_geometry", s.scope_dialog.saveGeometry())
+        if s.scope_dialog:                  #   Otherwise leave geometry from an earlier session alone.
+            settings.setValue( "scope_geometry", s.scope_dialog.saveGeometry())
         settings.setValue( "scope_showing", s.scope_dialog_showing )
+        settings.sync()                     # Shared object lives on, write now
         self.state_saved = True
         s.Verbose and print( "/// do_save_state()", s.scope_dialog_showing )
 
@@ -1524,6 +1462,7 @@ class MainWindow( QMainWindow ):
         s.Verbose and print( "/// What? closeEvent" )
 
         if not self.exitPrepFlag:           # May have already asked user in do_exit()
+            self.finish_saves()
             if not self.do_exit_test():     # Give user a second chance on 'X', too.
                 event.ignore()
                 return
@@ -1531,7 +1470,15 @@ class MainWindow( QMainWindow ):
         if not self.state_saved:
             self.do_save_state()        #   Do before close dialog.
 
-        s.scope_dialog.close()          #   Close the dialog window whether it is open or not, no issue if not.
+        if s.scope_dialog:
+            s.scope_dialog.close()      #   Close the dialog window whether it is open or not, no issue if not.
+        if self.tone_cache:
+            self.tone_cache.shutdown()
+        self.exporter.shutdown()        #   Finish any queued saves
+        self.stop_warmup()
+        self.close_results_db()
+        if Instance_Server:
+            Instance_Server.close()     #   Next launch starts a new instance
         event.accept()
         super().closeEvent(event)       #   And finally get out of her.
 
@@ -1564,22 +1511,13 @@ class MainWindow( QMainWindow ):
         if not user:
             user = 'User'
 
-        if self.radio1.isChecked():
-            mode = "Both ears"
-            smode = "B"
-        elif self.radio2.isChecked():
-            mode = "Left ear"
-            smode = "L"
-        elif self.radio3.isChecked():                
-            mode = "Right ear"
-            smode = "R"
+        smode = self.get_smode()
 
-        now = datetime.datetime.now()
-        title_timestamp = now.strftime('%a, %d-%b-%Y, %H:%M:%S')
-        title = f"Audiogram for: {user}, {mode}, {title_timestamp}"
+        #   WRW 13-July-2025 - Title and file name from Session.py, shared with what_render.py.
 
-        file_timestamp = now.strftime('%d-%b-%Y_%H-%M-%S')
-        ofile = f"Audiogram-{user}-{smode}-{file_timestamp}.png"
+        now = datetime.datetime.now()
+        title = audiogram_title( user, smode, now )
+        ofile = audiogram_filename( user, smode, now, s.Const.export_format )
 
         # Show folder picker dialog
         path = QFileDialog.getExistingDirectory( self,
@@ -1594,147 +1532,194 @@ class MainWindow( QMainWindow ):
 
         #   WRW 23-June-2025 - do_plot() now with 'import matplotlib' takes enough time
         #       that we need a busy cursor.
+        #   WRW 11-July-2025 - do_plot() replaced by Export.py. Now queued to the export
+        #       thread with a snapshot of the points, no busy cursor. Progress and result
+        #       reported in the status bar, failure in a message box. saved_flag is set
+        #       by export_finished(), only for saves of the current results.
+
+        self.exporter.submit( audiogram, title, fpath, smode, self.start_freq, self.end_freq, trend=self.graph.trend )
+        self.set_status( f"Queued save of {ofile}" )
+        self.saves_pending.add( fpath )
+
+        #   WRW 14-July-2025 - Structured results beside the image, see Session.py. Small enough
+        #       to write here, the image is still being rendered on the export thread.
+
+        session = make_session( user, smode, now, s.Const.Version, self.get_parameters(), audiogram, self.presentations )
+        spath = os.path.join( path, audiogram_filename( user, smode, now, SESSION_SUFFIX[1:] ))
+        try:
+            save_session( spath, session, npz=s.Const.results_npz )
+        except OSError as e:
+            self.saves_pending.discard( fpath )         # Image alone isn't the results saved
+            self.saved_flag = False
+            QMessageBox.warning( self, "Save failed", f"Test results could not be saved in:\n{spath}\n\n{e}" )
+            return
 
-        s.app.setOverrideCursor( QCursor(Qt.WaitCursor) )
-        self.do_plot( audiogram, title, fpath, smode )
-        s.app.restoreOverrideCursor()
+        else:
+            #   WRW 15-July-2025 - And into the results database for history, see Results.py.
+            #       Only once spath exists, the row points at it.
+
+            try:
+                self.get_results_db().add_session( session, spath )
+            except sqlite3.Error as e:
+                QMessageBox.warning( self, "Save failed", f"Test results could not be added to the results database:\n{e}" )
 
-        msg = f"Test results saved in:\n{fpath}"
-        QMessageBox.information( self, self.windowTitle, msg )
-        self.saved_flag = True
+        self.update_trend()
 
     # --------------------------------------------------------
-    #   WRW 23-June-2025 - Defer import of matplotlib until needed
-    #   lock in 'Agg' backend so matplotlib doesn't look further. Did not resolve long import
-    #   time but chat recommends keeping it. Add WaitCursor around this above.
-    #   Standard audiogram:
-    #       Frequencies tested: 125 Hz, 250 Hz, 500 Hz, 1000 Hz, 2000 Hz, 3000Hz, 4000 Hz, and 8000 Hz.
-    #       Loss -10 to 120
-    #       Right ear - Red 'o'
-    #       Left ear - Blue 'x'
-    #   This uses the symbols but not the loss range nor frequencies.
+    #   WRW 16-July-2025 - Change over the user's saved sessions for the selected ear,
+    #       see Trend.py. Follows the user name and ear while View->Show History Trend is on.
 
-    # -------------------------------------------------------------------------------------
+    def update_trend( self, *_ ):
+        if not self.trend_action.isChecked():
+            self.graph.clear_trend()
+            return
 
-    def do_plot( self, data: list[tuple[int, int]], title, ofile, smode ):
+        import numpy as np
+        from Trend import person_trend      # WRW 19-July-2025 - numpy, not needed at startup
 
-        s = Store()
-        import matplotlib
-        matplotlib.use('Agg')           
-        import matplotlib.pyplot as plt
-        from matplotlib.ticker import FixedLocator, FuncFormatter       # WRW 25-June-2025
-        from matplotlib.offsetbox import AnchoredText
-
-        # -----------------------------
-        #   Unzip data into two arrays.
-        freqs, gains = zip(*data)   # with '*' unzips (( f1, g1 ), ( f2, g2 ), ... ) into (f1, f2, ...), (g1, g2, ...)
-    
-        # -----------------------------
-        #   Create figure and set title
-
-        dpi = 100
-        fig = plt.figure(figsize=( s.Const.plot_width_in, s.Const.plot_height_in ), dpi=dpi)
-        ax = fig.add_subplot(1, 1, 1)
-        ax.set_title( title )
-
-        # -----------------------------
-        #   Plot - Define marker characteristics
-
-        if smode == 'B':
-            marker = 'o'
-            # color = '#000000'
-            facecolor = '#000000'
-            edgecolor='#000000'
-
-        elif smode == 'L':
-            marker = 'x'
-            # color = '#0000ff'
-            facecolor = 'none'
-            edgecolor='#0000ff'
-
-        elif smode == 'R':
-            marker = 'o'
-            # color = '#ff0000'
-            facecolor = 'none'
-            edgecolor='#ff0000'
-
-        ax.plot(freqs, gains, 
-            marker=marker,
-            markersize=7,
-            markeredgewidth=1.4,
-            linestyle='-',
-            color='#000000',
-            linewidth=.75,
-            markerfacecolor=facecolor,
-            markeredgecolor=edgecolor 
-        )
-    
-        # -----------------------------
-        #   Axes labels and tick params
+        user = self.user_text_box.text() or 'User'
+        smode = self.get_smode()
+        try:
+            trend = person_trend( self.get_results_db(), user, smode )
+        except sqlite3.Error as e:
+            QMessageBox.warning( self, "History Trend", f"Results database could not be read:\n{e}" )
+            trend = None
 
-        ax.set_xlabel("Frequency (Hz)")
-        ax.set_ylabel("Hearing Loss (dB) (Required gain for normal hearing)")
-        ax.tick_params(axis='both', which='major', length=4, width=1, labelsize=8)
+        self.graph.set_trend( trend )
 
-        # -----------------------------
-        #   Y-axis: 0 at top
+        if trend is None or not np.isfinite( trend.fit ).any():
+            self.set_status( f"Not enough saved sessions for a trend for {user}, {EAR_NAMES[ smode ]}", 10000 )
+        else:
+            worse = np.count_nonzero( trend.worsening() )
+            detail = f", significantly worse at {worse} of {len( trend.grid )} frequencies" if worse else ", no significant worsening"
+            self.set_status( f"Trend for {user}, {EAR_NAMES[ smode ]} from {int(trend.n.max())} sessions{detail}", 10000 )
 
-        ax.set_ylim(self.loss_db_max, self.loss_db_min )
-        ax.set_yticks( self.graph.major_losses )
-        ax.set_yticks( self.graph.minor_losses, minor=True )
+    # --------------------------------------------------------
 
-        ax.yaxis.set_major_formatter( FuncFormatter(lambda x, _: f"{int(x)}"))
-    
-        # -----------------------------
-        #   X-axis:
+    def get_results_db( self ):
+        s = Store()
+        if self.results_db is None:
+            self.results_db = ResultsDB( Path( s.Const.Confdir, s.Const.Results_DB_File ))
+        return self.results_db
 
-        #   Set tick positions (major & minor)
-        ax.set_xlim(self.start_freq, self.end_freq)
-        ax.set_xscale("log")
+    def close_results_db( self ):
+        if self.results_db:
+            self.results_db.close()
+            self.results_db = None
 
-        ax.xaxis.set_major_locator( FixedLocator( self.graph.major_freqs ))
-        ax.xaxis.set_minor_locator( FixedLocator( self.graph.minor_freqs ))
+    # --------------------------------------------------------
+    #   WRW 14-July-2025 - Ear selection as 'B', 'L' or 'R' and the ParameterDialog
+    #       settings, for the saved results.
+
+    def get_smode( self ):
+        if self.radio2.isChecked():
+            return "L"
+        elif self.radio3.isChecked():
+            return "R"
+        return "B"
+
+    def get_parameters( self ):
+        return {
+            'gain_points_per_10dB': self.gain_points_per_10dB,
+            'points_per_octave':    self.points_per_octave,
+            'start_freq':           self.start_freq,
+            'end_freq':             self.end_freq,
+            'reference_level':      self.reference_level,
+            'tone_duration':        self.dur,
+        }
 
-        #   Set tick labels (major only)
-        def format_tick(x, _):
-            return f"{int(x):,}" if x in self.graph.major_freqs else ""
+    # --------------------------------------------------------
+    #   WRW 22-July-2025 - What? launched again while running, see Instance.py.
+    #       Bring this window forward instead. Nothing takes arguments yet.
 
-        ax.xaxis.set_major_formatter(FuncFormatter(format_tick))
-        ax.xaxis.set_minor_formatter(FuncFormatter(lambda x, _: ""))  # Hide minor labels
+    def other_launch( self, args, cwd ):
+        s = Store()
+        s.Verbose and print( "/// other_launch()", args, cwd )
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        self.set_status( "What? is already running, here it is.", 5000 )
 
-        # -----------------------------
-        #   Grid
-        #   ax.grid(True, which='both', linestyle='--', alpha=0.4)
+    # --------------------------------------------------------
+    #   WRW 12-July-2025 - Idle-time warm-up, see Warmup.py. Timings left in s.warmup_timings.
 
-        #   linestyle: '-', '--', '-.', ':', 'None', ' ', '', 'solid', 'dashed', 'dashdot', 'dotted''
+    def start_warmup( self ):
+        if self.warmup is None:
+            self.warmup = WarmUp( warmup_steps(), self )
+            self.warmup.finished.connect( self.warmup_done )
+            self.warmup.begin()
 
-        ax.grid(True, which='major', linewidth=1, color='#808080', linestyle='dashed')
-        ax.grid(True, which='minor', linewidth=1, color='#a0a0a0', linestyle='dotted')
-    
-        # -----------------------------
-        #   Add a little advertisement
+    def stop_warmup( self ):
+        if self.warmup:
+            self.warmup.cancel()
+            self.warmup.wait()          # Step in progress finishes, can't destroy a running QThread
 
-        txt = f"""{s.Const.What_Full_Title}\nhttps://what.wrwetzel.com"""
-        info_box = AnchoredText( txt, loc='lower center')
-        ax.add_artist(info_box)
+    def warmup_done( self ):
+        s = Store()
+        s.warmup_timings = dict( self.warmup.timings )
+        s.warmup_cancelled = self.warmup.cancelled
+        write_startup_report()
+        s.Verbose and print( "/// warmup_done()", s.warmup_cancelled, { k: f"{v*1000:.0f} ms" for k, v in s.warmup_timings.items() } )
 
-        # -----------------------------
-        #   Write graph to file
+    # --------------------------------------------------------
 
-        fig.tight_layout()
-        fig.savefig(ofile)
-        plt.close(fig)
+    def export_started( self, ofile ):
+        waiting = f", {self.exporter.queued} more queued" if self.exporter.queued else ""
+        self.set_status( f"Saving {os.path.basename( ofile )}{waiting} ..." )
+
+    def export_finished( self, ofile ):
+        if ofile in self.saves_pending:
+            self.saves_pending.discard( ofile )
+            self.saved_flag = True
+        if not self.exporter.busy():
+            self.set_status( f"Test results saved in: {ofile}", 10000 )
+
+    def export_failed( self, ofile, error ):
+        if ofile in self.saves_pending:
+            self.saves_pending.discard( ofile )
+            self.saved_flag = False
+        self.clear_status()
+        QMessageBox.warning( self, "Save failed", f"Test results could not be saved in:\n{ofile}\n\n{error}" )
+
+    #   Before asking about unsaved results at exit. A save still queued is finished
+    #   and its outcome reported here, a failed one then counts as unsaved.
+
+    def finish_saves( self ):
+        if self.exporter.busy():
+            self.set_status( "Finishing saves ..." )
+            self.view.paint()
+            QApplication.setOverrideCursor( Qt.WaitCursor )
+            try:
+                self.exporter.wait()
+            finally:
+                QApplication.restoreOverrideCursor()
 
     # --------------------------------------------------------------
     #   WRW 17-June-2025 - Need a little feedback for user to indicate expected input
 
     #   Show a message in the status bar. Timeout in milliseconds. 0 = stay until cleared.
+    #   WRW 25-July-2025 - Through self.view, shown at the end of the dispatch or
+    #       on the next pass of the event loop. Call self.view.paint() to show it now.
+
     def set_status( self, msg: str, timeout: int = 0):
-        self.status.showMessage(msg, timeout)
+        self.view.set( status=( msg, timeout ))
     
     #   Clear the status bar
     def clear_status( self ):
-        self.status.clearMessage( )
+        self.view.set( status=None )
+
+    def show_status( self, values ):
+        if values[ 'status' ] is None:
+            self.status.clearMessage( )
+        else:
+            self.status.showMessage( *values[ 'status' ] )
+
+    def show_marker( self, values ):
+        if values[ 'marker' ] is None:
+            self.graph.clear_marker()
+        else:
+            self.graph.set_marker( *values[ 'marker' ] )
 
     # --------------------------------------------------------------
 
@@ -1752,6 +1737,11 @@ class MainWindow( QMainWindow ):
         scope_action = QAction("Show Waveform", self)
         scope_action.triggered.connect( self.show_scope )
         view_menu.addAction(scope_action)
+
+        self.trend_action = QAction("Show History Trend", self)        # WRW 16-July-2025
+        self.trend_action.setCheckable( True )
+        self.trend_action.toggled.connect( self.update_trend )
+        view_menu.addAction(self.trend_action)
     
         # Parameters menu
         param_menu = menu_bar.addMenu("Parameters")
@@ -1818,9 +1808,27 @@ class MainWindow( QMainWindow ):
 
     def show_scope( self ):
         s = Store()
+        self.get_scope_dialog()
         s.scope_dialog_showing = True        # Tell play_tone to send data to scope.
         s.scope_dialog.show()
 
+    # -----------------------------------------------------------------
+    #   WRW 4-July-2025 - Import and build the scope the first time it is needed,
+    #       keeps matplotlib off the startup path.
+
+    def get_scope_dialog( self ):
+        s = Store()
+        if s.scope_dialog is None:
+            from Scope import ScopeDialog
+            s.scope_dialog = ScopeDialog( on_closed=self.scopeClosedCallback, engine=s.Const.scope_engine )
+
+            if self.scope_geometry is not None:
+                s.scope_dialog.restoreGeometry( self.scope_geometry )
+            else:
+                s.scope_dialog.resize(1000, 300)
+
+        return s.scope_dialog
+
     def scopeClosedCallback( self ):
         s = Store()
         s = Store()
@@ -1973,6 +1981,13 @@ class MainWindow( QMainWindow ):
         except Exception:
             timestamp = f"Not available for {app_path}"
 
+        #   WRW 17-July-2025 - Startup timing, see Startup.py.
+
+        startup_lines = startup.summary()
+        startup_lines += [ f"After first paint {name}: {sec*1000:.0f} ms" for name, sec in s.deferred.timings.items() ]
+        startup_lines += [ f"Warm-up {name}: {sec*1000:.0f} ms" for name, sec in s.warmup_timings.items() ]
+        startup_txt = '\n    '.join( startup_lines )
+
         # ----------------------------------
     
         txt = f"""                                                                                 
@@ -2022,6 +2037,11 @@ class MainWindow( QMainWindow ):
     Settings Directory: {s.conf.confdir}
     Executable: {s.Const.Me}
     Executable Timestamp: {timestamp}
+    Resources: {Resource_Source}
+</p>
+<p>
+<b>Startup:</b>
+    {startup_txt}
 </p>
 </div>
             <p>
@@ -2095,6 +2115,7 @@ def exception_hook(extype, value, tb):
 
 def do_main( ):
     s = Store()                                 # Global store, short var name since used a lot.
+    startup.phase( "Start event loop" )
     QTimer.singleShot(100, lambda: do_main_continue_a())
 
     sys.excepthook = exception_hook         # WRW 16-May-2025 - catch exceptions in event loop.
@@ -2138,14 +2159,13 @@ def do_main_continue_b():
     s.Verbose = False               # Only for debugging, no need for option.
     s.conf = Config()
 
-    s.splash_pix.progress( "Startup" )
+    do_splash_progress( "Startup" )
 
-    # ------------------------------------------------------------------
-    #   Do this every time to be sure it gets done once and again after
-    #   updates.
+    #   WRW 20-July-2025 - Work the window doesn't need is queued here and run after
+    #       first paint by finish_splash(), see Deferred.py. Slow on a network home.
 
-    if s.Const.Platform == 'Linux':
-        make_desktop()
+    s.deferred = DeferredTasks()
+    s.deferred.finished.connect( write_startup_report )
 
     # ------------------------------------------------------------------
     #   Do this only on first launch.
@@ -2153,6 +2173,20 @@ def do_main_continue_b():
     if not s.conf.check_config_directory():
         s.conf.initialize_config_directory()
 
+    # ------------------------------------------------------------------
+    #   Do this every time to be sure it gets done once and again after
+    #   updates. Only written when the content changes. After the config
+    #   directory as it points to the icon there.
+
+    if s.Const.Platform == 'Linux':
+        s.deferred.add( 'desktop file', make_desktop )
+
+    # ------------------------------------------------------------------
+    #   WRW 20-July-2025 - One settings object for the run, read here and by
+    #       MainWindow, written by do_save_state().
+
+    s.settings = QSettings( str( Path( s.Const.stdConfig, s.Const.Settings_Config_File )), QSettings.IniFormat )
+
     # ------------------------------------------------------------------
     #   Set the icon in the window decoration
 
@@ -2165,15 +2199,20 @@ def do_main_continue_b():
     # ------------------------------------------------------------------
     #   Build the user interface.
 
-    s.splash_pix.progress( "Build User Interface" )
+    do_splash_progress( "Build User Interface" )
 
     window = MainWindow( )
     window.setStyleSheet( StyleSheet )
 
+    if Instance_Server:
+        Instance_Server.set_handler( window.other_launch )      # WRW 22-July-2025
+
+    startup.phase( "Restore settings" )
+
     # ------------------------------------------------------------------------------------------
     #   Restore geometry settings if saved
 
-    settings = QSettings( str( Path( s.Const.stdConfig, s.Const.Settings_Config_File )), QSettings.IniFormat )
+    settings = s.settings
     geometry = settings.value( "geometry")
     scope_geometry = settings.value( "scope_geometry" )
     scope_showing = settings.value( "scope_showing" )
@@ -2188,23 +2227,22 @@ def do_main_continue_b():
         height = width/1.61                     # Golden rectangle ratio
         window.resize( width*.8, height*.8 )
 
-    if scope_geometry is not None:
-        s.scope_dialog.restoreGeometry(scope_geometry)
-    else:
-        s.scope_dialog.resize(1000, 300)
+    window.scope_geometry = scope_geometry         # Applied when the scope is first created
+    s.scope_dialog_showing = False                 # WRW 19-July-2025 - Scope restored after first paint
 
-    if scope_showing is not None:
-        if scope_showing == 'true':
-            s.scope_dialog_showing = True
-            s.scope_dialog.show()
-        else:
-            s.scope_dialog_showing = False
-    else:
-        s.scope_dialog_showing = False
+    #   WRW 19-July-2025 - Load numpy and sounddevice once the window is up.
+    #       The scope needs numpy too, restore it after that has started.
+
+    s.deferred.add( 'start audio', window.audio_stack.start )
+    if scope_showing == 'true':
+        s.deferred.add( 'restore scope', window.show_scope )
 
     # ------------------------------------------------------------------------------------------
 
+    startup.phase( "Show window" )
     window.show()
+    startup.mark( "window shown" )
+    startup.phase( "Wait for first paint" )
 
     # ------------------------------------------------------------------------------------------
     #   Finally close the splash screen. Application already exec()'ed
@@ -2218,10 +2256,36 @@ def do_main_continue_b():
 
             s.splash = None  # only after it's safely closed
 
+        startup.finish( "splash closed" )
+        write_startup_report()
+
+        if Exit_After_Show:
+            s.app.exit( 0 )             # Not quit(), that closes the window and saves its state
+            return
+
+        s.deferred.start()                # WRW 20-July-2025
+
+        QTimer.singleShot( s.Const.warmup_delay_ms, window.start_warmup )       # WRW 12-July-2025
+
         # -----------------------------------------------------------
 
     QTimer.singleShot(50, finish_splash )
 
+# ------------------------------------------------------------------------------
+#   WRW 17-July-2025 - Startup timing report, if asked for with WHAT_STARTUP_REPORT,
+#       see Startup.py. Written when the splash closes and again after warm-up.
+#       WRW 20-July-2025 - And after the deferred startup tasks.
+
+def write_startup_report():
+    s = Store()
+    startup.write_report( s.Const.Confdir,
+        version = s.Const.Version,
+        package_type = s.Const.Package_Type,
+        warmup = dict( s.warmup_timings ),
+        warmup_cancelled = bool( s.warmup_cancelled ),
+        deferred = dict( s.deferred.timings ),
+    )
+
 # ------------------------------------------------------------------------------
 
 if __name__ == "__main__":
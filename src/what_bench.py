@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   what_bench.py - WRW 21-July-2025
+#   Startup benchmark, to catch a regression in the startup work before it ships.
+#   Launches what.py N times on the 'offscreen' platform with --exit-after-show,
+#   no display needed, and reports median and p95 of:
+
+#       splash_s        Process start to splash shown
+#       window_s        Process start to main window shown
+#       painted_s       Process start to splash closed, the window has painted
+#       wall_s          Spawn to exit, as seen from here
+#       peak_rss_mb     Peak resident memory of the run
+#       import_s        Sum of self time of every import, from -X importtime
+
+#   The first three come from the startup report what.py writes when
+#   WHAT_STARTUP_REPORT is set, see Startup.py. Process start is only known
+#   on Linux, elsewhere they start at the import of Startup.py.
+
+#       what_bench.py [-n RUNS] [--cold-runs N] [-o OUT.json] [--compare BASE.json] [--what what.py]
+
+#   Cold runs get an empty bytecode cache, PYTHONPYCACHEPREFIX, so everything is
+#   compiled again, as on a first launch after install. The OS file cache isn't
+#   dropped, that needs root. Warm runs share a cache filled by an unmeasured
+#   first run. All runs use a scratch config directory on Linux, XDG_CONFIG_HOME
+#   and XDG_DATA_HOME, so the user's settings and .desktop file are left alone.
+
+#   -X importtime adds a little to every import. All runs use it, so compare
+#   results from this script only with other results from this script.
+
+#   Output is JSON, keep one per commit and --compare against it. --fail-over PCT
+#   exits 1 when a warm median is that much slower than the base, for scripts.
+# -------------------------------------------------------------------------------
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import platform
+import tempfile
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+
+# -------------------------------------------------------------------------------
+
+BENCH_FORMAT = 'what-startup-bench'
+BENCH_VERSION = 1
+METRICS = ( 'splash_s', 'window_s', 'painted_s', 'wall_s', 'peak_rss_mb', 'import_s' )
+TOP_IMPORTS = 15
+
+#   import time: self [us] | cumulative | imported package
+
+IMPORTTIME_RE = re.compile( r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S.*)$' )
+
+def parse_importtime( text ):
+    imports = {}
+    for line in text.splitlines():
+        m = IMPORTTIME_RE.match( line )
+        if m:
+            own, total, name = m.groups()
+            imports[ name.strip() ] = ( int( own ) / 1e6, int( total ) / 1e6 )
+    return imports
+
+# -------------------------------------------------------------------------------
+#   Median and p95 of each metric over the runs that have it.
+
+def percentile( values, pct ):
+    values = sorted( values )
+    if len( values ) == 1:
+        return values[0]
+    k = ( len( values ) - 1 ) * pct / 100
+    lo = int( k )
+    hi = min( lo + 1, len( values ) - 1 )
+    return values[ lo ] + ( values[ hi ] - values[ lo ] ) * ( k - lo )
+
+def summarize( runs ):
+    summary = {}
+    for name in METRICS:
+        values = [ run[ name ] for run in runs if run.get( name ) is not None ]
+        if values:
+            summary[ name ] = {
+                'median':   statistics.median( values ),
+                'p95':      percentile( values, 95 ),
+                'min':      min( values ),
+                'max':      max( values ),
+            }
+    return summary
+
+#   Slowest imports by median cumulative time, top-level entries and below.
+
+def top_imports( runs, count=TOP_IMPORTS ):
+    cumulative = {}
+    for run in runs:
+        for name, ( own, total ) in run.get( 'imports', {} ).items():
+            cumulative.setdefault( name, [] ).append( total )
+    ranked = sorted( ( ( statistics.median( v ), name ) for name, v in cumulative.items() ), reverse=True )
+    return [ { 'module': name, 'cumulative_s': round( t, 6 ) } for t, name in ranked[ :count ] ]
+
+# -------------------------------------------------------------------------------
+#   One launch. Returns a dict of metrics, 'error' set if it failed.
+
+def peak_rss_mb( rusage ):
+    scale = 1 if sys.platform == 'darwin' else 1024         # ru_maxrss is bytes on macOS, KB on Linux
+    return rusage.ru_maxrss * scale / ( 1024 * 1024 )
+
+def run_once( python, what, env, timeout ):
+    with tempfile.TemporaryDirectory( prefix='what-bench-' ) as tmp:
+        report_path = os.path.join( tmp, 'startup.json' )
+        env = dict( env, WHAT_STARTUP_REPORT=report_path )
+        cmd = [ python, '-X', 'importtime', what, '--exit-after-show' ]
+
+        start = time.perf_counter()
+        proc = subprocess.Popen( cmd, env=env, cwd=os.path.dirname( what ),
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True )
+
+        killed = threading.Event()
+        def kill():
+            killed.set()
+            proc.kill()
+        timer = threading.Timer( timeout, kill )
+        timer.start()
+
+        #   wait4() where there is one for the child's own peak RSS, a plain wait() reaps
+        #   it without. stderr is read to the end first, the child blocks if the pipe fills.
+
+        rusage = None
+        try:
+            stderr = proc.stderr.read()
+            if hasattr( os, 'wait4' ):
+                _, status, rusage = os.wait4( proc.pid, 0 )
+                proc.returncode = os.waitstatus_to_exitcode( status )
+            else:
+                proc.wait()
+        finally:
+            timer.cancel()
+            proc.stderr.close()
+
+        if killed.is_set():
+            return { 'error': f"timed out after {timeout} s" }
+        wall = time.perf_counter() - start
+
+        if proc.returncode != 0:
+            tail = '\n'.join( line for line in stderr.splitlines() if not line.startswith( 'import time:' ))[ -500: ]
+            return { 'error': f"exit status {proc.returncode}: {tail}" }
+
+        try:
+            with open( report_path ) as fp:
+                report = json.load( fp )
+        except ( OSError, ValueError ) as e:
+            return { 'error': f"no startup report: {e}" }
+
+    before = report.get( 'before_profile_s' ) or 0.0
+    marks = report.get( 'marks', {} )
+    imports = parse_importtime( stderr )
+
+    def at( mark ):
+        return before + marks[ mark ] if mark in marks else None
+
+    return {
+        'splash_s':     at( 'splash shown' ),
+        'window_s':     at( 'window shown' ),
+        'painted_s':    at( 'splash closed' ),
+        'wall_s':       wall,
+        'peak_rss_mb':  peak_rss_mb( rusage ) if rusage else None,
+        'import_s':     sum( own for own, total in imports.values() ),
+        'imports':      imports,
+    }
+
+# -------------------------------------------------------------------------------
+
+def run_series( label, count, python, what, env, timeout, fresh_cache ):
+    runs = []
+    for i in range( count ):
+        run_env = env
+        cache = None
+        if fresh_cache:
+            cache = tempfile.mkdtemp( prefix='what-bench-pyc-' )
+            run_env = dict( env, PYTHONPYCACHEPREFIX=cache )
+        try:
+            result = run_once( python, what, run_env, timeout )
+        finally:
+            if cache:
+                shutil.rmtree( cache, ignore_errors=True )
+
+        if 'error' in result:
+            print( f"{label} {i+1}/{count}: ERROR {result[ 'error' ]}", file=sys.stderr )
+        else:
+            ms = lambda v: f"{v*1000:.0f} ms" if v is not None else "-"
+            print( f"{label} {i+1}/{count}: window {ms( result[ 'window_s' ] )}, painted {ms( result[ 'painted_s' ] )}, "
+                   f"imports {ms( result[ 'import_s' ] )}" + ( f", {result[ 'peak_rss_mb' ]:.0f} MB" if result[ 'peak_rss_mb' ] else "" ))
+        runs.append( result )
+    return runs
+
+def git_commit( path ):
+    try:
+        out = subprocess.run( [ 'git', 'rev-parse', '--short', 'HEAD' ], cwd=path, capture_output=True, text=True, timeout=10 )
+        return out.stdout.strip() or None
+    except ( OSError, subprocess.SubprocessError ):
+        return None
+
+# -------------------------------------------------------------------------------
+
+def print_summary( results ):
+    for label, series in results.items():
+        print( f"\n{label}: {series[ 'ok' ]} of {series[ 'count' ]} runs" )
+        for name, stats in series[ 'summary' ].items():
+            unit, scale = ( 'MB', 1 ) if name.endswith( '_mb' ) else ( 'ms', 1000 )
+            print( f"    {name:12} median {stats[ 'median' ]*scale:8.1f} {unit}   p95 {stats[ 'p95' ]*scale:8.1f} {unit}" )
+
+#   Returns the worst percentage change of a warm median over the base.
+
+def print_compare( results, base ):
+    worst = 0.0
+    print( f"\nCompared with {base.get( 'commit' ) or 'base'} of {base.get( 'date', '?' )}:" )
+    for label, series in results.items():
+        old = base.get( 'results', {} ).get( label, {} ).get( 'summary', {} )
+        for name, stats in series[ 'summary' ].items():
+            if name not in old or not old[ name ][ 'median' ]:
+                continue
+            change = ( stats[ 'median' ] - old[ name ][ 'median' ] ) / old[ name ][ 'median' ] * 100
+            print( f"    {label:5} {name:12} {change:+6.1f}%" )
+            if label == 'warm' and name != 'peak_rss_mb':
+                worst = max( worst, change )
+    return worst
+
+# -------------------------------------------------------------------------------
+
+def main( argv=None ):
+    here = Path( __file__ ).resolve().parent
+    parser = argparse.ArgumentParser( prog='what_bench', description="Benchmark What? startup, offscreen, no display needed." )
+    parser.add_argument( '-n', '--runs', type=int, default=10, help="Warm runs, default 10" )
+    parser.add_argument( '--cold-runs', type=int, default=3, help="Cold runs with an empty bytecode cache, default 3" )
+    parser.add_argument( '-o', '--output', help="Write results to this JSON file" )
+    parser.add_argument( '--compare', help="Earlier results to compare against" )
+    parser.add_argument( '--fail-over', type=float, help="Exit 1 if a warm median is this many percent slower than --compare" )
+    parser.add_argument( '--what', default=str( here / 'what.py' ), help="Program to launch, default what.py beside this" )
+    parser.add_argument( '--python', default=sys.executable, help="Interpreter, default this one" )
+    parser.add_argument( '--timeout', type=float, default=60, help="Seconds before a run is killed, default 60" )
+    args = parser.parse_args( argv )
+
+    what = str( Path( args.what ).resolve() )
+    scratch = tempfile.mkdtemp( prefix='what-bench-home-' )
+    env = dict( os.environ,
+        QT_QPA_PLATFORM = 'offscreen',
+        XDG_CONFIG_HOME = os.path.join( scratch, 'config' ),
+        XDG_DATA_HOME = os.path.join( scratch, 'data' ),
+    )
+    env.pop( 'WHAT_STARTUP_IMPORTS', None )         # Its own import hook would skew the timing
+    env.pop( 'PYTHONDONTWRITEBYTECODE', None )      # Otherwise warm is as cold as cold
+    os.makedirs( os.path.join( env[ 'XDG_DATA_HOME' ], 'applications' ), exist_ok=True )
+
+    results = {}
+    warm_cache = tempfile.mkdtemp( prefix='what-bench-pyc-' )
+    warm_env = dict( env, PYTHONPYCACHEPREFIX=warm_cache )
+    try:
+
+        if args.cold_runs:
+            results[ 'cold' ] = run_series( 'cold', args.cold_runs, args.python, what, env, args.timeout, fresh_cache=True )
+
+        first = run_once( args.python, what, warm_env, args.timeout )      # Fills the cache and config, not counted
+        if 'error' in first:
+            print( f"ERROR: first run failed: {first[ 'error' ]}", file=sys.stderr )
+            return 1
+        results[ 'warm' ] = run_series( 'warm', args.runs, args.python, what, warm_env, args.timeout, fresh_cache=False )
+
+    finally:
+        shutil.rmtree( scratch, ignore_errors=True )
+        shutil.rmtree( warm_cache, ignore_errors=True )
+
+    # -----------------------------------------------
+
+    out = {
+        'format':       BENCH_FORMAT,
+        'version':      BENCH_VERSION,
+        'commit':       git_commit( os.path.dirname( what )),
+        'date':         datetime.datetime.now().isoformat( timespec='seconds' ),
+        'python':       platform.python_version(),
+        'platform':     platform.platform(),
+        'results':      {},
+    }
+    for label, runs in results.items():
+        good = [ run for run in runs if 'error' not in run ]
+        out[ 'results' ][ label ] = {
+            'count':        len( runs ),
+            'ok':           len( good ),
+            'summary':      summarize( good ),
+            'top_imports':  top_imports( good ),
+            'runs':         [ { k: v for k, v in run.items() if k != 'imports' } for run in runs ],
+        }
+
+    print_summary( out[ 'results' ] )
+
+    if args.output:
+        with open( args.output, 'w' ) as fp:
+            json.dump( out, fp, indent=2 )
+        print( f"\nResults written to {args.output}" )
+
+    status = 0 if all( r[ 'ok' ] == r[ 'count' ] for r in out[ 'results' ].values() ) else 1
+
+    if args.compare:
+        try:
+            with open( args.compare ) as fp:
+                base = json.load( fp )
+        except ( OSError, ValueError ) as e:
+            print( f"ERROR: can't read {args.compare}: {e}", file=sys.stderr )
+            return 1
+        if base.get( 'format' ) != BENCH_FORMAT:
+            print( f"ERROR: {args.compare} is not a what_bench result", file=sys.stderr )
+            return 1
+        worst = print_compare( out[ 'results' ], base )
+        if args.fail_over is not None and worst > args.fail_over:
+            print( f"FAIL: warm startup {worst:.1f}% slower, limit {args.fail_over}%" )
+            status = 1
+
+    return status
+
+# -------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+# -------------------------------------------------------------------------------
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   what_calibrate.py - WRW 26-July-2025
+#   Measure the output's level at each test frequency and its round-trip
+#   latency through a loopback, see Calibrate.py, and keep the result in the
+#   per-device correction table in the What? config folder.
+
+#       what_calibrate.py [-d DEVICE] [--ear B|L|R] [--input-channel N] [--level DB]
+#                         [--fs FS] [--points-per-octave N] [--table FILE] [--no-save]
+#       what_calibrate.py --loopback [...]
+#       what_calibrate.py --list
+
+#   Connect the output to an input first, a cable from the headphone jack to
+#   line in, or a microphone held in the ear cup, and set the input level so
+#   the 1 kHz tone doesn't clip.
+
+#   --loopback uses Calibrate.SoftwareLoopback in place of the sound card, for
+#   trying it without one. Its result is saved only to a --table given.
+# -------------------------------------------------------------------------------
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# -------------------------------------------------------------------------------
+
+def print_result( device, result ):
+    print( f"{device}, ear {result['ear']}, {result['fs']} Hz, stimulus {result['level_db']} dBFS" )
+    print( f"    latency {result['latency_s']*1000:.2f} ms ({result['latency_samples']} samples), "
+           f"correlation {result['correlation']:.2f}, noise {result['noise_db']:.1f} dBFS" )
+    print( f"    {'Hz':>7} {'response':>9} {'correction':>11} {'snr':>6}" )
+    for freq, response, correction, snr in zip( result[ 'freqs' ], result[ 'response_db' ], result[ 'correction_db' ], result[ 'snr_db' ] ):
+        print( f"    {freq:7g} {response:8.2f}  {correction:+10.2f}  {snr:6.1f}" )
+
+def parse_device( text ):
+    if text is None:
+        return None
+    parts = [ int( part ) if part.isdigit() else part for part in text.split( ',' ) ]
+    return parts[0] if len( parts ) == 1 else tuple( parts )
+
+# -------------------------------------------------------------------------------
+
+def main( argv=None ):
+    from Const import Const
+    import Calibrate
+
+    parser = argparse.ArgumentParser( prog='what_calibrate', description="Loopback level and latency calibration for What?" )
+    parser.add_argument( '-d', '--device', help="Device number or name, OUT,IN for two, default the system default" )
+    parser.add_argument( '--ear', choices=( 'B', 'L', 'R' ), default='B', help="Output channel to calibrate, default B, both" )
+    parser.add_argument( '--input-channel', type=int, default=1, help="Input channel to record, from 1, default 1" )
+    parser.add_argument( '--level', type=float, default=Calibrate.LEVEL_DB, help=f"Stimulus level in dBFS, default {Calibrate.LEVEL_DB}" )
+    parser.add_argument( '--fs', type=int, default=Calibrate.FS, help=f"Sample rate, default {Calibrate.FS}" )
+    parser.add_argument( '--points-per-octave', type=int, default=Const.test_points_per_octave,
+                         help=f"Frequencies per octave, default {Const.test_points_per_octave} as the test" )
+    parser.add_argument( '--table', help="Correction table, default the one in the What? config folder" )
+    parser.add_argument( '--no-save', action='store_true', help="Show the result only" )
+    parser.add_argument( '--loopback', action='store_true', help="Software loopback in place of the sound card" )
+    parser.add_argument( '--list', action='store_true', help="List audio devices and exit" )
+    args = parser.parse_args( argv )
+
+    if args.list:
+        import sounddevice as sd
+        print( sd.query_devices() )
+        return 0
+
+    freqs = Calibrate.grid_freqs( Const.start_freq, Const.end_freq, args.points_per_octave )
+
+    if args.loopback:
+        playrec = Calibrate.SoftwareLoopback()
+        device = playrec.name
+    else:
+        playrec = None
+        try:
+            device = Calibrate.device_name( parse_device( args.device ))
+        except Exception as e:
+            print( f"ERROR: audio device '{args.device or 'default'}': {e}", file=sys.stderr )
+            return 1
+
+    start = time.perf_counter()
+    try:
+        result = Calibrate.calibrate( freqs, playrec, parse_device( args.device ), args.ear, args.input_channel, args.fs, args.level )
+    except Exception as e:
+        print( f"ERROR: calibration failed: {e}", file=sys.stderr )
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print_result( device, result )
+    print( f"{len( freqs )} frequencies in {elapsed:.1f} s" )
+
+    problems = Calibrate.check( result )
+    for problem in problems:
+        print( f"WARNING: {problem}", file=sys.stderr )
+
+    save = not args.no_save and ( args.table or not args.loopback )
+    if save and problems:
+        print( "Not saved, fix the problems above or give --no-save to just look.", file=sys.stderr )
+        return 1
+
+    if save:
+        path = Path( args.table ) if args.table else Path( Const.Confdir, Const.Calibration_File )
+        path.parent.mkdir( parents=True, exist_ok=True )
+        try:
+            Calibrate.save_result( path, device, result )
+        except ( OSError, ValueError ) as e:
+            print( f"ERROR: {e}", file=sys.stderr )
+            return 1
+        print( f"Saved in {path}" )
+
+    return 0
+
+# -------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+# -------------------------------------------------------------------------------
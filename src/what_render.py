@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   what_render.py - WRW 13-July-2025
+#   Render audiograms in bulk from saved session files, *.what.json, with the
+#   same styling as Save in What?. For reports, or to redo old sessions after a
+#   styling change.
+
+#       what_render.py [-o OUTDIR] [-f png|pdf|svg ...] [-j JOBS] [--engine native|matplotlib] [--force]
+#                      [--trend [--db DB]] INPUT ...
+
+#   INPUT is a session file or a folder searched recursively. Output goes next
+#   to each session file unless -o is given. Outputs newer than their session
+#   file are skipped unless --force.
+
+#   Work is spread over a process pool, one Qt instance per worker. Qt runs on
+#   the 'offscreen' platform with a QGuiApplication only, no window is ever
+#   created. The matplotlib engine uses Agg.
+
+#   WRW 16-July-2025 - --trend draws the history trend from the results database,
+#   see Trend.py, as it stood when each session was saved. It is computed here and
+#   passed to the workers with the job.
+# -------------------------------------------------------------------------------
+
+import os
+import sys
+import time
+import argparse
+import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Session import SESSION_SUFFIX, load_session, audiogram_title, audiogram_filename
+
+# -------------------------------------------------------------------------------
+
+FORMATS = ( 'png', 'pdf', 'svg' )
+
+def find_sessions( inputs ):
+    found = []
+    for name in inputs:
+        path = Path( name )
+        if path.is_dir():
+            found.extend( sorted( path.rglob( f"*{SESSION_SUFFIX}" )))
+        else:
+            found.append( path )
+    return list( dict.fromkeys( found ))            # Drop duplicates, keep order
+
+def up_to_date( src, out ):
+    return out.exists() and out.stat().st_mtime >= src.stat().st_mtime
+
+# -------------------------------------------------------------------------------
+#   Worker side. Also run in this process for -j 1.
+
+app = None
+
+def init_worker( engine ):
+    global app
+    os.environ[ 'QT_QPA_PLATFORM' ] = 'offscreen'           # Never a window, no display needed
+
+    from PySide6.QtGui import QGuiApplication
+    from Store import Store
+    from Const import Const
+
+    app = QGuiApplication.instance() or QGuiApplication( [ sys.argv[0] ] )     # Fonts for QPainter
+
+    s = Store()
+    s.Const = Const()
+    if engine:
+        s.Const.set( 'export_engine', engine )
+
+#   Written under a temporary name and renamed so an interrupted run never
+#   leaves a partial file that looks up to date.
+
+def render_one( session, out, trend=None ):
+    from Export import export_audiogram
+
+    start = time.perf_counter()
+    out = Path( out )
+    tmp = out.with_suffix( '.part' + out.suffix )
+    title = audiogram_title( session[ 'user' ], session[ 'ear' ], session[ 'timestamp' ] )
+
+    try:
+        export_audiogram( session[ 'thresholds' ], title, str( tmp ), session[ 'ear' ], session[ 'start_freq' ], session[ 'end_freq' ], trend=trend )
+        os.replace( tmp, out )
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+    return time.perf_counter() - start
+
+# -------------------------------------------------------------------------------
+
+def main( argv=None ):
+    parser = argparse.ArgumentParser( prog='what_render',
+                description=f"Render audiograms from saved What? session files ({SESSION_SUFFIX})." )
+    parser.add_argument( 'inputs', nargs='+', metavar='INPUT', help="Session file or folder to search" )
+    parser.add_argument( '-o', '--outdir', help="Output folder, default is next to each session file" )
+    parser.add_argument( '-f', '--format', action='append', choices=FORMATS, help="Output format, may be repeated, default png" )
+    parser.add_argument( '-j', '--jobs', type=int, default=os.cpu_count() or 1, help="Worker processes, default one per CPU" )
+    parser.add_argument( '--engine', choices=( 'native', 'matplotlib' ), help="Export engine, default from Const.export_engine" )
+    parser.add_argument( '--force', action='store_true', help="Render even if output is up to date" )
+    parser.add_argument( '--trend', action='store_true', help="Draw the history trend as of each session" )
+    parser.add_argument( '--db', help="Results database for --trend, default the one What? saves to" )
+    args = parser.parse_args( argv )
+
+    formats = args.format or [ 'png' ]
+    outdir = Path( args.outdir ) if args.outdir else None
+    if outdir:
+        outdir.mkdir( parents=True, exist_ok=True )
+
+    db = None
+    if args.trend:
+        from Const import Const
+        from Results import ResultsDB
+        from Trend import person_trend
+
+        path = Path( args.db ) if args.db else Path( Const.Confdir, Const.Results_DB_File )
+        if not path.is_file():
+            print( f"ERROR: results database {path} not found", file=sys.stderr )
+            return 1
+        db = ResultsDB( path )
+
+    # -----------------------------------------------
+    #   Decide what to do here, sessions are small and quick to read.
+
+    jobs = []
+    skipped = 0
+    failed = 0
+
+    for src in find_sessions( args.inputs ):
+        try:
+            session = load_session( src )
+        except ( OSError, ValueError ) as e:
+            print( f"ERROR: {e}", file=sys.stderr )
+            failed += 1
+            continue
+
+        trend = None
+        for fmt in formats:
+            out = ( outdir or src.parent ) / audiogram_filename( session[ 'user' ], session[ 'ear' ], session[ 'timestamp' ], fmt )
+            if not args.force and up_to_date( src, out ):
+                skipped += 1
+                continue
+
+            if db and trend is None:
+                until = session[ 'timestamp' ] + datetime.timedelta( seconds=1 )
+                trend = person_trend( db, session[ 'user' ], session[ 'ear' ], until=until )
+            jobs.append( ( session, str( out ), trend ))
+
+    # -----------------------------------------------
+
+    start = time.perf_counter()
+    rendered = 0
+    workers = max( 1, min( args.jobs, len( jobs )))
+
+    def report( out, error=None ):
+        nonlocal rendered, failed
+        if error:
+            print( f"ERROR: {out}: {error}", file=sys.stderr )
+            failed += 1
+        else:
+            print( out )
+            rendered += 1
+
+    if workers == 1:
+        if jobs:
+            init_worker( args.engine )
+        for session, out, trend in jobs:
+            try:
+                render_one( session, out, trend )
+                report( out )
+            except Exception as e:
+                report( out, e )
+
+    else:
+        with ProcessPoolExecutor( max_workers=workers, initializer=init_worker, initargs=( args.engine, )) as pool:
+            futures = { pool.submit( render_one, session, out, trend ): out for session, out, trend in jobs }
+            for future in as_completed( futures ):
+                try:
+                    future.result()
+                    report( futures[ future ] )
+                except Exception as e:
+                    report( futures[ future ], e )
+
+    elapsed = time.perf_counter() - start
+    print( f"Rendered {rendered}, skipped {skipped} up to date, failed {failed} in {elapsed:.1f} s with {workers} worker{'s' if workers > 1 else ''}" )
+    return 1 if failed else 0
+
+# -------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+# -------------------------------------------------------------------------------
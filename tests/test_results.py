@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -------------------------------------------------------------------------------
+#   test_results.py - WRW 27-July-2025
+#   Results.py, two saves in one second go to the same session file.
+# -------------------------------------------------------------------------------
+
+import sys
+import datetime
+from pathlib import Path
+
+sys.path.insert( 0, str( Path( __file__ ).resolve().parent.parent / 'src' ))
+
+from Results import ResultsDB
+
+# -------------------------------------------------------------------------------
+
+def session( when, thresholds ):
+    return {
+        'user':         'User',
+        'ear':          'L',
+        'timestamp':    when,
+        'software':     'test',
+        'start_freq':   250,
+        'end_freq':     8000,
+        'parameters':   {},
+        'thresholds':   thresholds,
+    }
+
+def test_same_file_replaces_session( tmp_path ):
+    db = ResultsDB( tmp_path / 'results.db' )
+    file = str( tmp_path / 'User-L-2025-07-27-10-00-00.what.json' )
+    when = datetime.datetime( 2025, 7, 27, 10, 0, 0 )
+
+    db.add_session( session( when, [ [ 1000, 20 ], [ 2000, 25 ] ] ), file )
+    second = db.add_session( session( when + datetime.timedelta( milliseconds=400 ), [ [ 1000, 30 ] ] ), file )
+
+    assert list( db.sessions()[ 'session' ] ) == [ second ]
+
+    thresholds = db.thresholds()
+    assert list( thresholds[ 'session' ] ) == [ second ]
+    assert list( thresholds[ 'loss_db' ] ) == [ 30 ]
+
+    count = db.conn.execute( "SELECT COUNT(*) FROM thresholds" ).fetchone()[0]
+    assert count == 1                       # First session's thresholds gone with it
+    db.close()
+
+def test_different_files_both_kept( tmp_path ):
+    db = ResultsDB( tmp_path / 'results.db' )
+    when = datetime.datetime( 2025, 7, 27, 10, 0, 0 )
+
+    db.add_session( session( when, [ [ 1000, 20 ] ] ), str( tmp_path / 'a.what.json' ))
+    db.add_session( session( when, [ [ 1000, 30 ] ] ), str( tmp_path / 'b.what.json' ))
+
+    assert len( db.sessions()[ 'session' ] ) == 2
+    db.close()
+
+# -------------------------------------------------------------------------------